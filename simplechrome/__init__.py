@@ -1,9 +1,17 @@
 """The simple chrome package"""
+from .body_capture import (
+    BodyCapture,
+    BodyCapturePolicy,
+    BodyFetchResult,
+    CapturedBody,
+)
 from .browser_fetcher import BrowserFetcher, RevisionInfo
 from .chrome import BrowserContext, Chrome
 from .connection import CDPSession, ClientType, Connection
 from .console_message import ConsoleMessage
 from .cookie import Cookie
+from .cookie_jar import CookieJar
+from .crawler import CrawlResult, Crawler
 from .device_descriptors import Devices
 from .dialog import Dialog
 from .emulation_manager import EmulationManager
@@ -24,34 +32,68 @@ from .events import Events
 from .execution_context import ExecutionContext
 from .frame_manager import Frame, FrameManager
 from .frame_resource_tree import FrameResource, FrameResourceTree
+from .handle_scope import HandleScope
+from .har import HARRecorder
 from .input import Keyboard, Mouse, Touchscreen
+from .interception import (
+    AbortRequest,
+    ContinueRequest,
+    FulfillRequest,
+    InterceptionAction,
+    InterceptionRule,
+    InterceptionRuleSet,
+)
+from .interception_dispatcher import InterceptionDispatcher
 from .jsHandle import ElementHandle, JSHandle
 from .launcher import Launcher, connect, launch
 from .lifecycle_watcher import LifecycleWatcher
 from .log import Log, LogEntry
+from .navigation_timing import NavigationTiming
 from .network_idle_monitor import NetworkIdleMonitor
 from .network_manager import NetworkManager
+from .network_records import (
+    CompactRecord,
+    RequestEventRecord,
+    RequestRecord,
+    ResponseEventRecord,
+    ResponseRecord,
+)
+from .network_stats import LatencyHistogram, NetworkStats
 from .page import Page
-from .request_response import Request, Response
+from .replay_cache import ReplayCache, ReplayRecorder, ReplayRequest
+from .request_response import BodyStream, Request, Response
 from .security_details import SecurityDetails
+from .settle import SettleCondition, SettleWatcher
 from .target import Target
 from .us_keyboard_layout import keyDefinitions
+from .warc import WARCRecorder, WARCWriter
 from .workers import ServiceWorker, Worker
 
 __version__ = "1.5.0"
 
 __all__ = [
+    "AbortRequest",
+    "BodyCapture",
+    "BodyCapturePolicy",
+    "BodyFetchResult",
+    "BodyStream",
     "BrowserContext",
     "BrowserError",
     "BrowserFetcher",
     "BrowserFetcherError",
+    "CapturedBody",
     "CDPSession",
     "Chrome",
     "ClientType",
+    "CompactRecord",
     "connect",
     "Connection",
     "ConsoleMessage",
+    "ContinueRequest",
     "Cookie",
+    "CookieJar",
+    "Crawler",
+    "CrawlResult",
     "Devices",
     "Dialog",
     "ElementHandle",
@@ -64,10 +106,18 @@ __all__ = [
     "FrameManager",
     "FrameResource",
     "FrameResourceTree",
+    "FulfillRequest",
+    "HARRecorder",
+    "HandleScope",
     "InputError",
+    "InterceptionAction",
+    "InterceptionDispatcher",
+    "InterceptionRule",
+    "InterceptionRuleSet",
     "JSHandle",
     "Keyboard",
     "keyDefinitions",
+    "LatencyHistogram",
     "launch",
     "Launcher",
     "LauncherError",
@@ -76,19 +126,32 @@ __all__ = [
     "LogEntry",
     "Mouse",
     "NavigationError",
+    "NavigationTiming",
     "NetworkError",
     "NetworkIdleMonitor",
     "NetworkManager",
+    "NetworkStats",
     "Page",
     "PageError",
+    "ReplayCache",
+    "ReplayRecorder",
+    "ReplayRequest",
     "Request",
+    "RequestEventRecord",
+    "RequestRecord",
     "Response",
+    "ResponseEventRecord",
+    "ResponseRecord",
     "RevisionInfo",
     "SecurityDetails",
     "ServiceWorker",
+    "SettleCondition",
+    "SettleWatcher",
     "Target",
     "Touchscreen",
     "WaitSetupError",
     "WaitTimeoutError",
+    "WARCRecorder",
+    "WARCWriter",
     "Worker",
 ]
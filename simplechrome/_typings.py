@@ -1,10 +1,21 @@
 from asyncio import AbstractEventLoop, Future, Task
-from typing import Any, Awaitable, ClassVar, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Awaitable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 __all__ = [
     "AsyncAny",
     "CDPEvent",
     "Device",
+    "EvaluationCall",
     "EventType",
     "FutureOrTask",
     "HTTPHeaders",
@@ -43,3 +54,5 @@ CDPEvent = Dict[str, Any]
 Viewport = Dict[str, int]
 OptionalViewport = Optional[Viewport]
 TargetInfo = Dict[str, str]
+#: A page function, or a page function and the arguments it is called with
+EvaluationCall = Union[str, Tuple[str, Iterable[Any]]]
@@ -0,0 +1,114 @@
+"""Bounded queue of items written in batches off the event loop"""
+from asyncio import Queue, Task
+from typing import Any, Callable, List, Optional
+
+from ._typings import Loop, SlotsT
+
+__all__ = ["BatchWriter"]
+
+
+class BatchWriter:
+    """Writes the items put to it in batches by calling a blocking write
+    function in the default executor.
+
+    At most ``max_pending`` items wait to be written, :meth:`put` waits for
+    room once that many are queued. Everything already queued when the
+    writer becomes free is written in one executor call.
+
+    When opening or writing fails the error is recorded and the writer stops
+    writing: later items are dropped, queued items are discarded so that no
+    :meth:`put` waits forever and :meth:`close` raises the error.
+    """
+
+    __slots__: SlotsT = ["_error", "_loop", "_open", "_queue", "_task", "_write"]
+
+    def __init__(
+        self,
+        write: Callable[[List[Any]], None],
+        max_pending: int,
+        loop: Loop,
+        open: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initialize a new BatchWriter
+
+        :param write: Blocking function writing a batch of items
+        :param max_pending: The maximum number of items waiting to be written
+        :param loop: The asyncio event loop to use
+        :param open: Optional blocking function called before the first write
+        """
+        self._write: Callable[[List[Any]], None] = write
+        self._open: Optional[Callable[[], None]] = open
+        self._loop: Loop = loop
+        self._queue: Queue = Queue(maxsize=max_pending, loop=loop)
+        self._task: Optional[Task] = None
+        self._error: Optional[Exception] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The error opening or writing failed with, if any"""
+        return self._error
+
+    def start(self) -> None:
+        """Start writing the items put"""
+        if self._task is None:
+            self._error = None
+            self._task = self._loop.create_task(self._run())
+
+    async def put(self, item: Any) -> None:
+        """Queues the item to be written, waiting while max_pending items are
+        already queued. The item is dropped if writing failed
+
+        :param item: The item to be written
+        """
+        if self._error is None:
+            await self._queue.put(item)
+
+    async def close(self) -> None:
+        """Writes the items still queued and stops the writer, raising the
+        error opening or writing failed with"""
+        task = self._task
+        if task is None:
+            return
+        self._task = None
+        await self._queue.put(None)
+        await task
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        queue = self._queue
+        closed = False
+        try:
+            if self._open is not None:
+                await self._loop.run_in_executor(None, self._open)
+            while not closed:
+                item = await queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                # write everything that is already waiting in one executor call
+                while not queue.empty():
+                    item = queue.get_nowait()
+                    if item is None:
+                        closed = True
+                        break
+                    batch.append(item)
+                await self._loop.run_in_executor(None, self._write, batch)
+        except Exception as e:
+            self._error = e
+        # discard everything queued until closed so that no put waits forever
+        while not closed:
+            closed = await queue.get() is None
+
+    def __str__(self) -> str:
+        return (
+            f"BatchWriter(running={self.running}, pending={self._queue.qsize()}, "
+            f"error={self._error!r})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
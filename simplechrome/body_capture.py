@@ -0,0 +1,445 @@
+"""Policy driven prefetching of response bodies"""
+import os
+from asyncio import Future, Semaphore, gather
+from inspect import isawaitable
+from tempfile import mkdtemp
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
+from weakref import finalize
+
+from ._typings import Loop, OptionalLoop, SlotsT
+from .errors import ProtocolError
+from .helper import Helper
+
+if TYPE_CHECKING:
+    from .request_response import Response  # noqa: F401
+
+__all__ = [
+    "BodyCapture",
+    "BodyCapturePolicy",
+    "BodyFetchResult",
+    "CapturedBody",
+    "fetch_bodies",
+]
+
+BodyFilter = Union["BodyCapturePolicy", Callable[["Response"], bool]]
+BodySink = Callable[["Response", bytes], Any]
+
+#: The messages of the errors Network.getResponseBody fails with once
+#: Chrome evicted the body from its buffer
+EVICTED_BODY_MESSAGES: Tuple[str, ...] = (
+    "No resource with given identifier found",
+    "No data found for resource with given identifier",
+)
+
+
+class BodyCapturePolicy:
+    """Declares which response bodies a NetworkManager prefetches and
+    how the prefetched bodies are stored.
+
+    Bodies are retrieved as soon as the loading of the response finishes,
+    before Chrome can evict them. Bodies of at least ``spill_threshold`` bytes,
+    or that would put the bodies held in memory over ``memory_budget`` bytes,
+    are written to files in ``spill_directory`` instead of being kept in memory.
+    """
+
+    __slots__: SlotsT = [
+        "_concurrency",
+        "_max_size",
+        "_memory_budget",
+        "_mime_prefixes",
+        "_mime_types",
+        "_min_size",
+        "_resource_types",
+        "_spill_directory",
+        "_spill_threshold",
+    ]
+
+    def __init__(
+        self,
+        mime_types: Optional[Iterable[str]] = None,
+        resource_types: Optional[Iterable[str]] = None,
+        min_size: int = 0,
+        max_size: Optional[int] = None,
+        concurrency: int = 4,
+        memory_budget: int = 64 << 20,
+        spill_threshold: Optional[int] = 1 << 20,
+        spill_directory: Optional[str] = None,
+    ) -> None:
+        """Initialize a new BodyCapturePolicy
+
+        :param mime_types: The mime types to capture, ``type/*`` matches every
+         subtype. Defaults to every mime type
+        :param resource_types: The resource types to capture (e.g. Document,
+         Script). Defaults to every resource type
+        :param min_size: The minimum number of bytes received for the response
+        :param max_size: The maximum number of bytes received for the response
+        :param concurrency: The maximum number of bodies retrieved at once
+        :param memory_budget: The maximum number of bytes of captured bodies
+         held in memory
+        :param spill_threshold: Bodies of at least this many bytes are always
+         written to disk, None to only spill when over the memory budget
+        :param spill_directory: The directory spilled bodies are written to,
+         defaults to a new temporary directory
+        """
+        self._mime_types: Optional[Set[str]] = None
+        self._mime_prefixes: List[str] = []
+        if mime_types is not None:
+            self._mime_types = set()
+            for mime in mime_types:
+                if mime.endswith("/*"):
+                    self._mime_prefixes.append(mime[:-1])
+                else:
+                    self._mime_types.add(mime)
+        self._resource_types: Optional[Set[str]] = set(
+            resource_types
+        ) if resource_types is not None else None
+        self._min_size: int = min_size
+        self._max_size: Optional[int] = max_size
+        self._concurrency: int = concurrency
+        self._memory_budget: int = memory_budget
+        self._spill_threshold: Optional[int] = spill_threshold
+        self._spill_directory: Optional[str] = spill_directory
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def memory_budget(self) -> int:
+        return self._memory_budget
+
+    @property
+    def spill_threshold(self) -> Optional[int]:
+        return self._spill_threshold
+
+    @property
+    def spill_directory(self) -> Optional[str]:
+        return self._spill_directory
+
+    def matches(self, response: "Response") -> bool:
+        """Returns T/F indicating if the body of the response should be captured
+
+        :param response: The response whose loading finished
+        """
+        if self._resource_types is not None:
+            resourceType = response.request.resourceType
+            if resourceType not in self._resource_types:
+                return False
+        if self._mime_types is not None:
+            mime = response.mimeType or ""
+            if mime not in self._mime_types and not any(
+                mime.startswith(prefix) for prefix in self._mime_prefixes
+            ):
+                return False
+        size = response.encodedDataLength
+        if size < self._min_size:
+            return False
+        if self._max_size is not None and size > self._max_size:
+            return False
+        return True
+
+    def __str__(self) -> str:
+        return (
+            f"BodyCapturePolicy(mime_types={self._mime_types}, "
+            f"resource_types={self._resource_types}, concurrency={self._concurrency}, "
+            f"memory_budget={self._memory_budget}, "
+            f"spill_threshold={self._spill_threshold})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _releaseBody(capture: "BodyCapture", inMemory: int, path: Optional[str]) -> None:
+    capture._memoryUsed -= inMemory
+    if path is not None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class CapturedBody:
+    """A response body captured by a BodyCapture, held in memory
+    or spilled to disk. The memory or file is released once the body
+    is garbage collected or :meth:`release` is called."""
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_capture",
+        "_data",
+        "_finalizer",
+        "_path",
+        "_ready",
+        "_size",
+    ]
+
+    def __init__(self, capture: "BodyCapture") -> None:
+        self._capture: BodyCapture = capture
+        self._ready: Future = capture._loop.create_future()
+        self._data: Optional[bytes] = None
+        self._path: Optional[str] = None
+        self._size: int = 0
+        self._finalizer: Optional[finalize] = None
+
+    @property
+    def size(self) -> int:
+        """The size of the body in bytes"""
+        return self._size
+
+    @property
+    def spilled(self) -> bool:
+        """Was the body written to disk"""
+        return self._path is not None
+
+    @property
+    def path(self) -> Optional[str]:
+        """The path of the file the body was spilled to"""
+        return self._path
+
+    @property
+    def captured(self) -> bool:
+        """Has the body been captured"""
+        return self._ready.done() and self._ready.result()
+
+    async def read(self) -> Optional[bytes]:
+        """Returns the captured body or None if it could not be captured"""
+        if not await self._ready:
+            return None
+        if self._data is not None:
+            return self._data
+        if self._path is None:
+            return None
+        return await self._capture._loop.run_in_executor(
+            None, self._capture._readFile, self._path
+        )
+
+    def release(self) -> None:
+        """Releases the memory or file holding the body"""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._data = None
+        self._path = None
+
+    def _store(self, data: Optional[bytes], path: Optional[str], size: int) -> None:
+        self._data = data
+        self._path = path
+        self._size = size
+        self._finalizer = finalize(
+            self, _releaseBody, self._capture, len(data) if data else 0, path
+        )
+        self._ready.set_result(True)
+
+    def _failed(self) -> None:
+        if not self._ready.done():
+            self._ready.set_result(False)
+
+    def __str__(self) -> str:
+        return f"CapturedBody(size={self._size}, spilled={self.spilled})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class BodyCapture:
+    """Prefetches the bodies of responses matching a BodyCapturePolicy"""
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_loop",
+        "_memoryUsed",
+        "_policy",
+        "_semaphore",
+        "_spillDirectory",
+    ]
+
+    def __init__(self, policy: BodyCapturePolicy, loop: OptionalLoop = None) -> None:
+        self._policy: BodyCapturePolicy = policy
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._semaphore: Semaphore = Semaphore(policy.concurrency, loop=self._loop)
+        self._memoryUsed: int = 0
+        self._spillDirectory: Optional[str] = policy.spill_directory
+
+    @property
+    def policy(self) -> BodyCapturePolicy:
+        return self._policy
+
+    @property
+    def memory_used(self) -> int:
+        """The number of bytes of captured bodies currently held in memory"""
+        return self._memoryUsed
+
+    def capture(self, response: "Response") -> Optional[CapturedBody]:
+        """Starts capturing the body of the response if the policy matches it
+
+        :param response: The response whose loading finished
+        """
+        if response._capturedBody is not None or not self._policy.matches(response):
+            return None
+        body = CapturedBody(self)
+        response._capturedBody = body
+        self._loop.create_task(self._capture(response, body))
+        return body
+
+    async def _capture(self, response: "Response", body: CapturedBody) -> None:
+        try:
+            async with self._semaphore:
+                data = await response._fetchBody()
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            size = len(data)
+            if self._shouldSpill(size):
+                path = await self._loop.run_in_executor(None, self._writeFile, data)
+                body._store(None, path, size)
+            else:
+                self._memoryUsed += size
+                body._store(data, None, size)
+        except Exception:
+            body._failed()
+
+    def _shouldSpill(self, size: int) -> bool:
+        threshold = self._policy.spill_threshold
+        if threshold is not None and size >= threshold:
+            return True
+        return self._memoryUsed + size > self._policy.memory_budget
+
+    def _writeFile(self, data: bytes) -> str:
+        if self._spillDirectory is None:
+            self._spillDirectory = mkdtemp(prefix="simplechrome-bodies-")
+        else:
+            os.makedirs(self._spillDirectory, exist_ok=True)
+        path = os.path.join(self._spillDirectory, uuid4().hex)
+        with open(path, "wb") as out:
+            out.write(data)
+        return path
+
+    @staticmethod
+    def _readFile(path: str) -> bytes:
+        with open(path, "rb") as body_in:
+            return body_in.read()
+
+    def __str__(self) -> str:
+        return f"BodyCapture(policy={self._policy}, memory_used={self._memoryUsed})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class BodyFetchResult:
+    """The outcome of :func:`fetch_bodies`.
+
+    ``evicted`` holds the responses whose body Chrome no longer had and
+    ``failed`` the responses whose body could not be retrieved for another
+    reason, or whose sink raised, along with the error. When no sink was
+    given ``bodies`` holds the retrieved bodies in the order they were
+    retrieved.
+    """
+
+    __slots__: SlotsT = ["bodies", "bytes", "evicted", "failed", "fetched"]
+
+    def __init__(self) -> None:
+        self.fetched: int = 0
+        self.bytes: int = 0
+        self.bodies: List[Tuple["Response", bytes]] = []
+        self.evicted: List["Response"] = []
+        self.failed: List[Tuple["Response", Exception]] = []
+
+    def __str__(self) -> str:
+        return (
+            f"BodyFetchResult(fetched={self.fetched}, bytes={self.bytes}, "
+            f"evicted={len(self.evicted)}, failed={len(self.failed)})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+async def fetch_bodies(
+    responses: Iterable["Response"],
+    filter: Optional[BodyFilter] = None,
+    concurrency: int = 8,
+    sink: Optional[BodySink] = None,
+    loop: OptionalLoop = None,
+) -> BodyFetchResult:
+    """Retrieves the bodies of the responses matching filter, at most
+    concurrency at once. Bodies already captured by a BodyCapture are not
+    retrieved again.
+
+    Each body is passed to sink(response, body) as soon as it is retrieved,
+    sink may be a coroutine function. Without a sink the bodies are kept in
+    :attr:`BodyFetchResult.bodies`.
+
+    :param responses: The responses whose loading finished
+    :param filter: A BodyCapturePolicy or a function returning T/F indicating
+     if the body of the response should be retrieved. Defaults to every body
+    :param concurrency: The maximum number of bodies retrieved at once
+    :param sink: Optional function receiving the response and its body
+    :param loop: Optional asyncio event loop to use
+    """
+    if isinstance(filter, BodyCapturePolicy):
+        filter = filter.matches
+    if filter is not None:
+        responses = (response for response in responses if filter(response))
+    result = BodyFetchResult()
+    # the workers share the iterator so at most concurrency bodies are
+    # retrieved (and held in memory) at once
+    pending = iter(responses)
+    loop = Helper.ensure_loop(loop)
+    workers = [
+        loop.create_task(_fetchWorker(pending, sink, result))
+        for _ in range(max(concurrency, 1))
+    ]
+    try:
+        await gather(*workers, loop=loop)
+    finally:
+        # an error raised by the filter or cancellation of the fetch must not
+        # leave the other workers running in the background
+        for worker in workers:
+            if not worker.done():
+                worker.cancel()
+    return result
+
+
+async def _fetchWorker(
+    pending: Iterator["Response"], sink: Optional[BodySink], result: BodyFetchResult
+) -> None:
+    for response in pending:
+        try:
+            body = await response._bufread()
+        except ProtocolError as e:
+            message = e.args[0] if e.args else ""
+            if any(evicted in message for evicted in EVICTED_BODY_MESSAGES):
+                result.evicted.append(response)
+            else:
+                result.failed.append((response, e))
+            continue
+        except Exception as e:
+            result.failed.append((response, e))
+            continue
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        result.fetched += 1
+        result.bytes += len(body)
+        if sink is None:
+            result.bodies.append((response, body))
+            continue
+        try:
+            value = sink(response, body)
+            if isawaitable(value):
+                await value
+        except Exception as e:
+            # a failing sink must not end the worker while its siblings keep
+            # pulling from the shared iterator
+            result.failed.append((response, e))
@@ -1,12 +1,23 @@
 from asyncio import Future
 from inspect import isawaitable
 from subprocess import Popen
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 from pyee2 import EventEmitterS
 
 from ._typings import CDPEvent, Number, OptionalLoop, SlotsT
 from .connection import ClientType
+from .crawler import Crawler, CrawlResult, OnPageCallback
 from .errors import BrowserError
 from .events import Events
 from .helper import Helper
@@ -25,6 +36,7 @@ class Chrome(EventEmitterS):
         "_defaultContext",
         "_defaultViewport",
         "_ignoreHTTPSErrors",
+        "_networkOptions",
         "_process",
         "_screenshotTaskQueue",
         "_targetInfo",
@@ -41,6 +53,7 @@ class Chrome(EventEmitterS):
         closeCallback: Optional[Callable[[], Any]] = None,
         targetInfo: Optional[Dict] = None,
         loop: OptionalLoop = None,
+        networkOptions: Optional[Dict[str, Any]] = None,
     ) -> "Chrome":
         browser = Chrome(
             connection,
@@ -51,6 +64,7 @@ class Chrome(EventEmitterS):
             closeCallback,
             targetInfo,
             loop,
+            networkOptions,
         )
         await connection.send("Target.setDiscoverTargets", {"discover": True})
         return browser
@@ -65,9 +79,11 @@ class Chrome(EventEmitterS):
         closeCallback: Optional[Callable[[], Any]] = None,
         targetInfo: Optional[Dict] = None,
         loop: OptionalLoop = None,
+        networkOptions: Optional[Dict[str, Any]] = None,
     ) -> None:
         super().__init__(loop=Helper.ensure_loop(loop))
         self._ignoreHTTPSErrors: bool = ignoreHTTPSErrors
+        self._networkOptions: Dict[str, Any] = networkOptions or {}
         self._process: Optional[Popen] = process
         self._defaultViewport: Optional[Dict[str, int]] = defaultViewport
         self._screenshotTaskQueue: List = []
@@ -102,6 +118,21 @@ class Chrome(EventEmitterS):
     def process(self) -> Optional[Popen]:
         return self._process
 
+    @property
+    def hostResolverRules(self) -> Optional[Dict[str, Optional[str]]]:
+        """The mapping of host pattern to target Chrome was launched with"""
+        return self._networkOptions.get("hostResolverRules")
+
+    @property
+    def proxyServer(self) -> Optional[Union[str, Dict[str, str]]]:
+        """The proxy, or mapping of URL scheme to proxy, Chrome was launched with"""
+        return self._networkOptions.get("proxyServer")
+
+    @property
+    def proxyBypassList(self) -> Optional[List[str]]:
+        """The hosts fetched without the proxy Chrome was launched with"""
+        return self._networkOptions.get("proxyBypassList")
+
     @property
     def wsEndpoint(self) -> str:
         """Return websocket end point url."""
@@ -321,6 +352,33 @@ class BrowserContext(EventEmitterS):
                     pages.append(page)
         return pages
 
+    def crawl(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 4,
+        on_page: Optional[OnPageCallback] = None,
+        retries: int = 1,
+        options: Optional[Dict] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CrawlResult]:
+        """Visit each of the urls using at most concurrency pages of this context,
+        yielding a CrawlResult for each URL as soon as it finishes.
+
+        Pages are reused between URLs and closed once the crawl completes.
+        Navigations that time out are retried up to retries times.
+
+        :param urls: The URLs to visit
+        :param concurrency: The number of pages navigating at the same time
+        :param on_page: Optional function (may be async) called with the page
+         and main resource response after each successful navigation,
+         its return value is available as CrawlResult.value
+        :param retries: How many times a timed out navigation is retried
+        :param options: Navigation options passed to Frame.goto
+         (e.g. timeout, waitUntil)
+        """
+        navOptions = Helper.merge_dict(options, kwargs)
+        return Crawler(self, urls, concurrency, navOptions, on_page, retries).results()
+
     async def clearPermissionOverrides(self) -> None:
         opts = {}
         if self._id is not None:
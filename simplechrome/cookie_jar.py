@@ -0,0 +1,259 @@
+"""Persistent on-disk store of cookies shared between browsers"""
+import os
+import time
+from asyncio import Lock as AsyncLock
+from threading import Lock
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple, Union
+from uuid import uuid4
+
+from ujson import dumps, loads
+
+from ._typings import Loop, OptionalLoop, SlotsT
+from .helper import Helper
+
+if TYPE_CHECKING:
+    from .network_manager import NetworkManager  # noqa: F401
+    from .page import Page  # noqa: F401
+
+__all__ = ["CookieJar"]
+
+#: The fields of a Network.Cookie kept by the jar, all accepted by
+#: Network.CookieParam
+COOKIE_FIELDS: Tuple[str, ...] = (
+    "name",
+    "value",
+    "domain",
+    "path",
+    "expires",
+    "httpOnly",
+    "secure",
+    "sameSite",
+    "priority",
+)
+
+CookieKey = Tuple[str, str, str]
+CookieTarget = Union["Page", "NetworkManager"]
+
+
+def cookie_key(cookie: Dict) -> CookieKey:
+    """Returns the name, domain, path triple identifying the cookie"""
+    return cookie.get("name", ""), cookie.get("domain", ""), cookie.get("path", "/")
+
+
+def normalize_cookie(cookie: Dict) -> Dict[str, Any]:
+    """Returns the Network.CookieParam of the Network.Cookie, session cookies
+    have no expires
+
+    :param cookie: The Network.Cookie
+    """
+    params = {}
+    for field in COOKIE_FIELDS:
+        value = cookie.get(field)
+        if value is not None:
+            params[field] = value
+    if cookie.get("session") or params.get("expires", -1) < 0:
+        params.pop("expires", None)
+    return params
+
+
+class CookieJar:
+    """Cookies persisted to an append-only JSON lines file.
+
+    Each line records a set or a delete of a cookie and the latest line for a
+    cookie wins, so saving the changes made by a browser only appends the
+    changed cookies. The file is rewritten without superseded lines once they
+    outnumber the cookies. Updates are written one at a time in the order they
+    were made and the file is only read when loading it.
+
+    A jar is loaded into a browser with a single ``Network.setCookies`` call
+    and updated from the browser with a single ``Network.getAllCookies``
+    call, which makes it possible to share a logged-in session between the
+    browsers of a pool.
+
+    Usage::
+
+        jar = CookieJar("cookies.jsonl")
+        await jar.load_into(page)
+        await page.goto(url)
+        await jar.update_from(page)
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_cookies",
+        "_lines",
+        "_lock",
+        "_loop",
+        "_partial",
+        "_path",
+        "_updating",
+    ]
+
+    def __init__(self, path: str, loop: OptionalLoop = None) -> None:
+        """Initialize a new CookieJar, loading the cookies stored at path
+
+        :param path: The path of the file the cookies are stored in
+        :param loop: Optional asyncio event loop to use
+        """
+        self._path: str = path
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._cookies: Dict[CookieKey, Dict[str, Any]] = {}
+        # number of lines in the file, including superseded ones
+        self._lines: int = 0
+        # does the file end with a partially written line
+        self._partial: bool = False
+        self._lock: Lock = Lock()
+        # serializes the updates so they are written in the order they were made
+        self._updating: AsyncLock = AsyncLock(loop=self._loop)
+        self._load()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._cookies)
+
+    def cookies(self, include_expired: bool = False) -> List[Dict[str, Any]]:
+        """Returns the Network.CookieParam of every cookie in the jar
+
+        :param include_expired: Should expired cookies be included
+        """
+        if include_expired:
+            return list(self._cookies.values())
+        now = time.time()
+        return [
+            cookie
+            for cookie in self._cookies.values()
+            if cookie.get("expires", now) >= now
+        ]
+
+    async def load_into(self, target: CookieTarget) -> int:
+        """Sets the unexpired cookies of the jar in the browser with one
+        Network.setCookies call, returns the number of cookies set
+
+        :param target: The page or network manager of the browser
+        """
+        cookies = self.cookies()
+        if cookies:
+            networkManager = getattr(target, "network_manager", target)
+            await networkManager.setCookies(cookies)
+        return len(cookies)
+
+    async def update_from(
+        self, target: CookieTarget, delete_missing: bool = True
+    ) -> int:
+        """Updates the jar with the cookies of the browser, retrieved with one
+        Network.getAllCookies call, and appends the changed cookies to the file.
+        Returns the number of cookies changed
+
+        :param target: The page or network manager of the browser
+        :param delete_missing: Should cookies of the jar the browser no longer
+         has (e.g. removed by logging out) be deleted from the jar
+        """
+        networkManager = getattr(target, "network_manager", target)
+        result = await networkManager._client.send("Network.getAllCookies", {})
+        return await self.update(result.get("cookies", []), delete_missing)
+
+    async def update(self, cookies: List[Dict], delete_missing: bool = False) -> int:
+        """Updates the jar with the cookies, appending the changed cookies
+        to the file. Returns the number of cookies changed
+
+        :param cookies: The Network.Cookies or Network.CookieParams
+        :param delete_missing: Should cookies of the jar that are not in
+         cookies be deleted from the jar
+        """
+        async with self._updating:
+            changes = self._diff(cookies, delete_missing)
+            if changes:
+                snapshot = None
+                if (
+                    self._partial
+                    or self._lines + len(changes) > 2 * len(self._cookies) + 64
+                ):
+                    # superseded lines outnumber the cookies or the last line
+                    # is partial, rewrite the file
+                    snapshot = list(self._cookies.values())
+                await self._loop.run_in_executor(None, self._write, changes, snapshot)
+            return len(changes)
+
+    def clear(self) -> None:
+        """Removes every cookie from the jar and the file. Performs blocking IO"""
+        with self._lock:
+            self._cookies.clear()
+            self._rewrite([])
+
+    def _diff(
+        self, cookies: List[Dict], delete_missing: bool
+    ) -> List[Dict[str, Any]]:
+        changes: List[Dict[str, Any]] = []
+        seen = set()
+        for cookie in cookies:
+            params = normalize_cookie(cookie)
+            key = cookie_key(params)
+            seen.add(key)
+            if self._cookies.get(key) != params:
+                self._cookies[key] = params
+                changes.append({"set": params})
+        if delete_missing:
+            for key in [key for key in self._cookies if key not in seen]:
+                del self._cookies[key]
+                changes.append({"delete": list(key)})
+        return changes
+
+    def _load(self) -> None:
+        if not os.path.exists(self._path):
+            return
+        # the file is only read, a partially written final line is dropped
+        # by the next write which rewrites the file
+        with open(self._path, "rb") as jar_in:
+            for line in jar_in:
+                if not line.endswith(b"\n"):
+                    self._partial = True
+                try:
+                    change = loads(line)
+                except ValueError:
+                    continue
+                self._apply(change)
+                self._lines += 1
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        params = change.get("set")
+        if params is not None:
+            self._cookies[cookie_key(params)] = params
+        else:
+            self._cookies.pop(tuple(change.get("delete", ())), None)
+
+    def _write(
+        self, changes: List[Dict[str, Any]], snapshot: Optional[List[Dict]]
+    ) -> None:
+        with self._lock:
+            if snapshot is not None:
+                self._rewrite(snapshot)
+                return
+            data = "".join(
+                dumps(change, escape_forward_slashes=False) + "\n"
+                for change in changes
+            )
+            with open(self._path, "a", encoding="utf-8") as jar_out:
+                jar_out.write(data)
+            self._lines += len(changes)
+
+    def _rewrite(self, cookies: List[Dict[str, Any]]) -> None:
+        directory = os.path.dirname(self._path) or "."
+        os.makedirs(directory, exist_ok=True)
+        partial = os.path.join(directory, f".{uuid4().hex}.partial")
+        with open(partial, "w", encoding="utf-8") as jar_out:
+            for params in cookies:
+                jar_out.write(
+                    dumps({"set": params}, escape_forward_slashes=False) + "\n"
+                )
+        os.replace(partial, self._path)
+        self._lines = len(cookies)
+        self._partial = False
+
+    def __str__(self) -> str:
+        return f"CookieJar(path={self._path}, cookies={len(self._cookies)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,201 @@
+from asyncio import CancelledError, Queue, Task, gather
+from inspect import isawaitable
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+)
+
+from ._typings import Loop, SlotsT
+from .errors import NavigationError
+from .page import Page
+from .request_response import Response
+
+if TYPE_CHECKING:
+    from .chrome import BrowserContext  # noqa: F401
+
+__all__ = ["Crawler", "CrawlResult"]
+
+OnPageCallback = Callable[[Page, Optional[Response]], Any]
+
+
+class CrawlResult:
+    """The outcome of visiting a single URL during a crawl"""
+
+    __slots__: SlotsT = ["_attempts", "_error", "_response", "_url", "_value"]
+
+    def __init__(
+        self,
+        url: str,
+        response: Optional[Response] = None,
+        error: Optional[Exception] = None,
+        attempts: int = 1,
+        value: Any = None,
+    ) -> None:
+        self._url: str = url
+        self._response: Optional[Response] = response
+        self._error: Optional[Exception] = error
+        self._attempts: int = attempts
+        self._value: Any = value
+
+    @property
+    def url(self) -> str:
+        """The URL that was visited"""
+        return self._url
+
+    @property
+    def response(self) -> Optional[Response]:
+        """The main resource response, if one was received"""
+        return self._response
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """The exception that ended the visit, if any"""
+        return self._error
+
+    @property
+    def attempts(self) -> int:
+        """How many navigations were made to the URL"""
+        return self._attempts
+
+    @property
+    def value(self) -> Any:
+        """The value returned by the on_page callback"""
+        return self._value
+
+    @property
+    def ok(self) -> bool:
+        """Was the URL visited without error"""
+        return self._error is None
+
+    def __str__(self) -> str:
+        return f"CrawlResult(url={self._url}, ok={self.ok}, attempts={self._attempts})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class Crawler:
+    """Visits URLs using a fixed number of pages from a single browser context.
+
+    Each worker owns one page which is reused for every URL it visits and
+    closed once the URLs are exhausted or the crawl is abandoned.
+    """
+
+    __slots__: SlotsT = [
+        "_concurrency",
+        "_context",
+        "_loop",
+        "_navOptions",
+        "_on_page",
+        "_retries",
+        "_urls",
+    ]
+
+    def __init__(
+        self,
+        context: "BrowserContext",
+        urls: Iterable[str],
+        concurrency: int = 4,
+        navOptions: Optional[Dict] = None,
+        on_page: Optional[OnPageCallback] = None,
+        retries: int = 1,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self._context: "BrowserContext" = context
+        self._loop: Loop = context._loop
+        self._urls: Iterator[str] = iter(urls)
+        self._concurrency: int = concurrency
+        self._navOptions: Dict = navOptions or {}
+        self._on_page: Optional[OnPageCallback] = on_page
+        self._retries: int = max(retries, 0)
+
+    async def results(self) -> AsyncIterator[CrawlResult]:
+        """Run the crawl yielding a CrawlResult for each URL as it finishes"""
+        queue: Queue = Queue(loop=self._loop)
+        workers: List[Task] = [
+            self._loop.create_task(self._worker(queue))
+            for _ in range(self._concurrency)
+        ]
+        active = len(workers)
+        finished = False
+        try:
+            while active:
+                result = await queue.get()
+                if result is None:
+                    active -= 1
+                    continue
+                yield result
+            finished = True
+        finally:
+            if finished:
+                # every worker has closed its page, let them return
+                await gather(*workers, loop=self._loop, return_exceptions=True)
+            else:
+                # the crawl was abandoned, wait for the workers to close
+                # their pages once cancelled
+                for worker in workers:
+                    if not worker.done():
+                        worker.cancel()
+                await gather(*workers, loop=self._loop, return_exceptions=True)
+
+    async def _worker(self, queue: Queue) -> None:
+        page: Optional[Page] = None
+        try:
+            for url in self._urls:
+                if page is not None and page._closed:
+                    page = None
+                if page is None:
+                    try:
+                        page = await self._context.newPage()
+                    except CancelledError:
+                        raise
+                    except Exception as e:
+                        # the URL is reported as failed and the next one tries
+                        # again, so no URL is dropped without a result
+                        queue.put_nowait(CrawlResult(url, error=e, attempts=0))
+                        continue
+                queue.put_nowait(await self._visit(page, url))
+        finally:
+            if page is not None and not page._closed:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            # signalled only once the page is closed so that a finished crawl
+            # does not cancel the closing of its pages
+            queue.put_nowait(None)
+
+    async def _visit(self, page: Page, url: str) -> CrawlResult:
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                response = await page.goto(url, self._navOptions)
+            except NavigationError as e:
+                if e.timeout and attempts <= self._retries:
+                    continue
+                return CrawlResult(url, e.response, e, attempts)
+            except CancelledError:
+                raise
+            except Exception as e:
+                return CrawlResult(url, None, e, attempts)
+            break
+        value = None
+        if self._on_page is not None:
+            try:
+                value = self._on_page(page, response)
+                if isawaitable(value):
+                    value = await value
+            except CancelledError:
+                raise
+            except Exception as e:
+                return CrawlResult(url, response, e, attempts)
+        return CrawlResult(url, response, None, attempts, value)
@@ -1,9 +1,9 @@
 from asyncio import AbstractEventLoop, Event, Future
-from typing import Any, Awaitable, Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
 
 import aiofiles
 
-from ._typings import Number, SlotsT
+from ._typings import EvaluationCall, Number, SlotsT
 from .helper import Helper
 from .jsHandle import ElementHandle, JSHandle
 from .lifecycle_watcher import LifecycleWatcher
@@ -117,6 +117,29 @@ class DOMWorld:
         context = await self.executionContext()
         return await context.evaluate(pageFunction, *args, withCliAPI=withCliAPI)
 
+    async def evaluate_many(
+        self, calls: Iterable[EvaluationCall], return_exceptions: bool = True
+    ) -> List[Any]:
+        """Calls each page function with its arguments in the current frame
+        in a single round trip, see :meth:`ExecutionContext.evaluate_many`
+
+        :param calls: The page functions, or tuples of a page function and
+         its arguments
+        :param return_exceptions: Should errors be returned instead of raised
+        """
+        context = await self.executionContext()
+        return await context.evaluate_many(calls, return_exceptions)
+
+    async def evaluate_helper(self, name: str, source: str, *args: Any) -> Any:
+        """Calls the page function installed under name in the current frame's
+        execution context, see :meth:`ExecutionContext.evaluate_helper`
+
+        :param name: The name the helper is installed under
+        :param source: The source of the page function
+        """
+        context = await self.executionContext()
+        return await context.evaluate_helper(name, source, *args)
+
     async def evaluate_expression(
         self, expression: str, withCliAPI: bool = False
     ) -> Any:
@@ -398,6 +421,7 @@ class DOMWorld:
             isXPath,
             waitForVisible,
             waitForHidden,
+            helperName="waitForSelectorOrXPath",
         )
         handle = await wait_task.promise
         element_handle = handle.asElement()
@@ -42,6 +42,8 @@ class FrameManagerEvents:
     FrameNavigated: EventType = "FrameManager.framenavigated"
     FrameDetached: EventType = "FrameManager.framedetached"
     LifecycleEvent: EventType = "FrameManager.lifecycleevent"
+    LifecycleSatisfied: EventType = "FrameManager.lifecyclesatisfied"
+    NavigationTiming: EventType = "FrameManager.navigationtiming"
     FrameNavigatedWithinDocument: EventType = "FrameManager.framenavigatedwithindocument"
     ExecutionContextCreated: EventType = "FrameManager.executioncontextcreated"
     ExecutionContextDestroyed: EventType = "FrameManager.executioncontextdestroyed"
@@ -50,6 +52,7 @@ class FrameManagerEvents:
 class NetworkManagerEvents:
     Request: EventType = "NetworkManager.Request"
     Response: EventType = "NetworkManager.Response"
+    ResponsePaused: EventType = "NetworkManager.ResponsePaused"
     RequestFailed: EventType = "NetworkManager.Requestfailed"
     RequestFinished: EventType = "NetworkManager.Requestfinished"
 
@@ -71,12 +74,14 @@ class PageEvents:
     LogEntry: EventType = "Page.logentry"
     Metrics: EventType = "Page.metrics"
     NavigatedWithinDoc: EventType = "Page.navigatedwithindoc"
+    NavigationTiming: EventType = "Page.navigationtiming"
     PageError: EventType = "Page.pageerror"
     Popup: EventType = "Page.popup"
     Request: EventType = "Page.request"
     RequestFailed: EventType = "Page.requestfailed"
     RequestFinished: EventType = "Page.requestfinished"
     Response: EventType = "Page.response"
+    ResponsePaused: EventType = "Page.responsepaused"
     WorkerCreated: EventType = "Page.workercreated"
     WorkerDestroyed: EventType = "Page.workerdestroyed"
     ServiceWorkerAdded: EventType = "Page.serviceWorkerAdded"
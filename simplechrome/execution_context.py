@@ -1,13 +1,25 @@
 """ExecutionContext Context Module."""
 import re
-from typing import Any, Dict, Optional, Pattern, TYPE_CHECKING
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    TYPE_CHECKING,
+    Tuple,
+)
+from weakref import ReferenceType, ref
 
 import math
 
-from ._typings import SlotsT
+from ._typings import EvaluationCall, SlotsT
 from .connection import ClientType
 from .domWorld import DOMWorld
 from .errors import EvaluationError, ProtocolError
+from .handle_scope import HandleScope
 from .helper import Helper
 from .jsHandle import ElementHandle, JSHandle, createJSHandle
 
@@ -22,14 +34,57 @@ SOURCE_URL_REGEX: Pattern = re.compile(
 )
 suffix = f"//# sourceURL={EVALUATION_SCRIPT_URL}"
 
+#: Calls the helper function it is called on (this) with the arguments
+CALL_HELPER_FUNCTION: str = "function(...args) { return this(...args); }"
+#: The message of the error calling a function on a released object fails with
+RELEASED_OBJECT_ERROR: str = "Could not find object with given id"
+#: The messages of the errors returning a result by value fails with
+BY_VALUE_ERRORS: Tuple[str, ...] = (
+    "Object reference chain is too long",
+    "Object couldn't be returned by value",
+)
+#: Calls the batched page functions one after the other, each with its slice
+#: of the arguments, returning {value} or {error} for each
+BATCH_FUNCTION: str = """async function(...args) {
+  const fns = [
+%s
+  ];
+  const counts = %s;
+  const results = [];
+  let offset = 0;
+  for (let i = 0; i < fns.length; i++) {
+    const fnArgs = args.slice(offset, offset + counts[i]);
+    offset += counts[i];
+    let value;
+    try {
+      value = await fns[i](...fnArgs);
+    } catch (e) {
+      results.push({ error: e instanceof Error ? e.stack || e.message : String(e) });
+      continue;
+    }
+    try {
+      // a value that can not be serialized (e.g. a cyclic object) only fails
+      // its own slot instead of the whole batch
+      JSON.stringify(value);
+    } catch (e) {
+      results.push({ error: `Object couldn't be returned by value: ${e}` });
+      continue;
+    }
+    results.push({ value });
+  }
+  return results;
+}"""
+
 
 class ExecutionContext:
     __slots__: SlotsT = [
         "__weakref__",
         "_client",
         "_contextPayload",
-        "_world",
+        "_worldRef",
         "_contextId",
+        "_frameId",
+        "_helpers",
         "_isDefault",
     ]
 
@@ -38,11 +93,18 @@ class ExecutionContext:
     ) -> None:
         self._client: ClientType = client
         self._contextPayload: Dict = contextPayload
-        self._world: Optional[DOMWorld] = world
-        self._contextId: str = self._contextPayload.get("id")
-        self._isDefault: bool = self._contextPayload.get("auxData", {}).get(
-            "isDefault", False
+        # the world owns the context, not the other way around, so that
+        # handles outliving a detached frame do not keep its DOMWorld alive
+        self._worldRef: Optional[ReferenceType] = (
+            ref(world) if world is not None else None
         )
+        self._contextId: str = self._contextPayload.get("id")
+        auxData = self._contextPayload.get("auxData", {})
+        self._frameId: Optional[str] = auxData.get("frameId")
+        self._isDefault: bool = auxData.get("isDefault", False)
+        # name -> source and handle of the helper function installed in
+        # this context
+        self._helpers: Dict[str, Tuple[str, JSHandle]] = {}
 
     @property
     def default(self) -> bool:
@@ -52,9 +114,33 @@ class ExecutionContext:
     def contextId(self) -> str:
         return self._contextId
 
+    @property
+    def frameId(self) -> Optional[str]:
+        return self._frameId
+
+    @property
+    def _world(self) -> Optional[DOMWorld]:
+        return self._worldRef() if self._worldRef is not None else None
+
     @property
     def frame(self) -> Optional["Frame"]:
-        return self._world.frame if self._world is not None else None
+        world = self._world
+        return world.frame if world is not None else None
+
+    @property
+    def handleScope(self) -> Optional[HandleScope]:
+        """The HandleScope of the page of this context entered by the current
+        task, if any"""
+        world = self._world
+        if world is None:
+            return None
+        return world._frameManager.handleScope
+
+    @staticmethod
+    def _inScope(params: Dict[str, Any], scope: Optional[HandleScope]) -> Dict:
+        if scope is not None:
+            params["objectGroup"] = scope.objectGroup
+        return params
 
     async def evaluate(
         self, pageFunction: str, *args: Any, withCliAPI: bool = False
@@ -63,18 +149,238 @@ class ExecutionContext:
 
         Details see :meth:`simplechrome.page.Page.evaluate`.
         """
-        handle = await self.evaluateHandle(pageFunction, *args, withCliAPI=withCliAPI)
+        try:
+            remoteObject = await self._evaluate(
+                pageFunction, args, withCliAPI, returnByValue=True
+            )
+        except ProtocolError as e:
+            message = e.args[0] if e.args else ""
+            if any(reason in message for reason in BY_VALUE_ERRORS):
+                # the result (e.g. a cyclic object) can not be returned by value
+                return None
+            raise
+        return Helper.valueFromRemoteObject(remoteObject)
+
+    async def install_helper(self, name: str, source: str) -> JSHandle:
+        """Returns a handle to the page function source installed in this
+        context under name, the function is only sent and compiled the first
+        time. Installing a different source under the same name replaces the
+        helper. The handle must not be disposed.
+
+        :param name: The name the helper is installed under
+        :param source: The source of the page function
+        """
+        installed = self._helpers.get(name)
+        if installed is not None:
+            installedSource, helper = installed
+            if installedSource == source and not helper._disposed:
+                return helper
+        _obj = await self._client.send(
+            "Runtime.evaluate",
+            {
+                "expression": f"({source})\n{suffix}",
+                "contextId": self._contextId,
+                "returnByValue": False,
+            },
+        )
+        exceptionDetails = _obj.get("exceptionDetails")
+        if exceptionDetails:
+            raise EvaluationError(
+                "Evaluation failed: {}".format(
+                    Helper.getExceptionMessage(exceptionDetails)
+                )
+            )
+        helper = createJSHandle(self, _obj.get("result"))
+        self._helpers[name] = (source, helper)
+        if installed is not None:
+            # the helper installed with a different source is replaced
+            await installed[1].dispose()
+        return helper
+
+    async def call_helper(self, name: str, source: str, *args: Any) -> JSHandle:
+        """Calls the page function source installed in this context under
+        name (see :meth:`install_helper`) with the arguments. Only the
+        arguments are sent once the helper is installed.
+
+        :param name: The name the helper is installed under
+        :param source: The source of the page function
+        """
+        arguments = [self._convertArgument(arg) for arg in args]
+        scope = self.handleScope
+        helper = await self.install_helper(name, source)
+        try:
+            _obj = await self._callHelper(helper, arguments, scope)
+        except ProtocolError as e:
+            if RELEASED_OBJECT_ERROR not in (e.args[0] if e.args else ""):
+                raise
+            # the helper was released (e.g. by Runtime.releaseObjectGroup)
+            helper._disposed = True
+            helper = await self.install_helper(name, source)
+            _obj = await self._callHelper(helper, arguments, scope)
+        exceptionDetails = _obj.get("exceptionDetails")
+        if exceptionDetails:
+            raise EvaluationError(
+                "Evaluation failed: {}".format(
+                    Helper.getExceptionMessage(exceptionDetails)
+                )
+            )
+        return createJSHandle(self, _obj.get("result"), scope)
+
+    async def evaluate_helper(self, name: str, source: str, *args: Any) -> Any:
+        """Calls the page function source installed in this context under
+        name with the arguments and returns the result by value, see
+        :meth:`call_helper`
+
+        :param name: The name the helper is installed under
+        :param source: The source of the page function
+        """
+        handle = await self.call_helper(name, source, *args)
+        return await self._handleValue(handle)
+
+    def _callHelper(
+        self, helper: JSHandle, arguments: List[Dict], scope: Optional[HandleScope]
+    ) -> Awaitable[Dict]:
+        return self._client.send(
+            "Runtime.callFunctionOn",
+            self._inScope(
+                {
+                    "functionDeclaration": CALL_HELPER_FUNCTION,
+                    "objectId": helper._remoteObject.get("objectId"),
+                    "arguments": arguments,
+                    "returnByValue": False,
+                    "awaitPromise": True,
+                    "userGesture": True,
+                },
+                scope,
+            ),
+        )
+
+    async def _handleValue(self, handle: JSHandle) -> Any:
         try:
             result = await handle.jsonValue()
         except ProtocolError as e:
-            if "Object reference chain is too long" in e.args[0]:
-                return
-            if "Object couldn't be returned by value" in e.args[0]:
+            if any(reason in e.args[0] for reason in BY_VALUE_ERRORS):
                 return
             raise EvaluationError(e.args[0])
         await handle.dispose()
         return result
 
+    async def evaluate_many(
+        self, calls: Iterable[EvaluationCall], return_exceptions: bool = True
+    ) -> List[Any]:
+        """Calls each page function with its arguments in order, using a single
+        Runtime.callFunctionOn, and returns their results by value.
+
+        A call is a page function or a tuple of a page function and its
+        arguments, expressions are evaluated as functions returning them.
+        The result of a call that threw, or whose result can not be returned
+        by value (e.g. a cyclic object), is an EvaluationError, raised instead
+        when return_exceptions is false. Each page function is run once.
+
+        :param calls: The page functions and their arguments
+        :param return_exceptions: Should errors be returned instead of raised
+        """
+        functions: List[str] = []
+        counts: List[int] = []
+        arguments: List[Dict] = []
+        for call in calls:
+            if isinstance(call, str):
+                pageFunction, args = call, ()
+            else:
+                pageFunction, *rest = call
+                args = rest[0] if rest else ()
+            if not Helper.is_jsfunc(pageFunction):
+                pageFunction = f"() => (\n{pageFunction}\n)"
+            functions.append(pageFunction)
+            counts.append(len(args))
+            arguments.extend(self._convertArgument(arg) for arg in args)
+        if not functions:
+            return []
+        try:
+            _obj = await self._client.send(
+                "Runtime.callFunctionOn",
+                {
+                    "functionDeclaration": BATCH_FUNCTION
+                    % (",\n".join(functions), counts)
+                    + f"\n{suffix}\n",
+                    "executionContextId": self._contextId,
+                    "arguments": arguments,
+                    "returnByValue": True,
+                    "awaitPromise": True,
+                    "userGesture": True,
+                },
+            )
+        except ProtocolError as e:
+            message = e.args[0] if e.args else ""
+            if not any(reason in message for reason in BY_VALUE_ERRORS):
+                raise
+            # the page functions have run, running them again would repeat
+            # their side effects
+            if not return_exceptions:
+                raise EvaluationError(f"Evaluation failed: {message}")
+            return [EvaluationError(f"Evaluation failed: {message}") for _ in functions]
+        if _obj.get("exceptionDetails"):
+            # a page function does not compile so none of them have run,
+            # evaluate one at a time so the error is reported for that
+            # function only
+            return await self._evaluate_each(
+                functions, counts, arguments, return_exceptions
+            )
+        results: List[Any] = []
+        for item in _obj.get("result", {}).get("value", []):
+            if "error" in item:
+                error = EvaluationError(f"Evaluation failed: {item['error']}")
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            else:
+                results.append(item.get("value"))
+        return results
+
+    async def _evaluate_each(
+        self,
+        functions: List[str],
+        counts: List[int],
+        arguments: List[Dict],
+        return_exceptions: bool,
+    ) -> List[Any]:
+        results: List[Any] = []
+        offset = 0
+        for pageFunction, count in zip(functions, counts):
+            callArguments = arguments[offset : offset + count]
+            offset += count
+            try:
+                _obj = await self._client.send(
+                    "Runtime.callFunctionOn",
+                    {
+                        "functionDeclaration": f"{pageFunction}\n{suffix}\n",
+                        "executionContextId": self._contextId,
+                        "arguments": callArguments,
+                        "returnByValue": True,
+                        "awaitPromise": True,
+                        "userGesture": True,
+                    },
+                )
+            except ProtocolError as e:
+                message = e.args[0] if e.args else ""
+                if not any(reason in message for reason in BY_VALUE_ERRORS):
+                    raise
+                error = EvaluationError(f"Evaluation failed: {message}")
+            else:
+                exceptionDetails = _obj.get("exceptionDetails")
+                if not exceptionDetails:
+                    results.append(Helper.valueFromRemoteObject(_obj["result"]))
+                    continue
+                error = EvaluationError(
+                    "Evaluation failed: {}".format(
+                        Helper.getExceptionMessage(exceptionDetails)
+                    )
+                )
+            if not return_exceptions:
+                raise error
+            results.append(error)
+        return results
+
     async def evaluateHandle(
         self, pageFunction: str, *args: Any, withCliAPI: bool = False
     ) -> "JSHandle":
@@ -82,6 +388,20 @@ class ExecutionContext:
 
         Details see :meth:`simplechrome.page.Page.evaluateHandle`.
         """
+        scope = self.handleScope
+        remoteObject = await self._evaluate(
+            pageFunction, args, withCliAPI, returnByValue=False, scope=scope
+        )
+        return createJSHandle(self, remoteObject, scope)
+
+    async def _evaluate(
+        self,
+        pageFunction: str,
+        args: Iterable[Any],
+        withCliAPI: bool,
+        returnByValue: bool,
+        scope: Optional[HandleScope] = None,
+    ) -> Dict:
         if withCliAPI or not Helper.is_jsfunc(pageFunction):
             expression_with_source_url = (
                 pageFunction
@@ -90,36 +410,33 @@ class ExecutionContext:
             )
             _obj = await self._client.send(
                 "Runtime.evaluate",
-                {
-                    "expression": expression_with_source_url,
-                    "contextId": self._contextId,
-                    "returnByValue": False,
-                    "awaitPromise": True,
-                    "userGesture": True,
-                    "includeCommandLineAPI": withCliAPI,
-                },
+                self._inScope(
+                    {
+                        "expression": expression_with_source_url,
+                        "contextId": self._contextId,
+                        "returnByValue": returnByValue,
+                        "awaitPromise": True,
+                        "userGesture": True,
+                        "includeCommandLineAPI": withCliAPI,
+                    },
+                    scope,
+                ),
+            )
+        else:
+            _obj = await self._client.send(
+                "Runtime.callFunctionOn",
+                self._inScope(
+                    {
+                        "functionDeclaration": f"{pageFunction}\n{suffix}\n",
+                        "executionContextId": self._contextId,
+                        "arguments": [self._convertArgument(arg) for arg in args],
+                        "returnByValue": returnByValue,
+                        "awaitPromise": True,
+                        "userGesture": True,
+                    },
+                    scope,
+                ),
             )
-            exceptionDetails = _obj.get("exceptionDetails")
-            if exceptionDetails:
-                raise EvaluationError(
-                    "Evaluation failed: {}".format(
-                        Helper.getExceptionMessage(exceptionDetails)
-                    )
-                )
-            remoteObject = _obj.get("result")
-            return createJSHandle(self, remoteObject)
-
-        _obj = await self._client.send(
-            "Runtime.callFunctionOn",
-            {
-                "functionDeclaration": f"{pageFunction}\n{suffix}\n",
-                "executionContextId": self._contextId,
-                "arguments": [self._convertArgument(arg) for arg in args],
-                "returnByValue": False,
-                "awaitPromise": True,
-                "userGesture": True,
-            },
-        )
         exceptionDetails = _obj.get("exceptionDetails")
         if exceptionDetails:
             raise EvaluationError(
@@ -127,8 +444,7 @@ class ExecutionContext:
                     Helper.getExceptionMessage(exceptionDetails)
                 )
             )
-        remoteObject = _obj.get("result")
-        return createJSHandle(self, remoteObject)
+        return _obj.get("result")
 
     async def evaluate_expression(
         self, expression: str, withCliAPI: bool = False
@@ -164,11 +480,14 @@ class ExecutionContext:
             raise Exception(
                 "Prototype JSHandle must not be referencing primitive value"
             )
+        scope = self.handleScope
         response = await self._client.send(
             "Runtime.queryObjects",
-            {"prototypeObjectId": prototypeHandle._remoteObject["objectId"]},
+            self._inScope(
+                {"prototypeObjectId": prototypeHandle._remoteObject["objectId"]}, scope
+            ),
         )
-        return createJSHandle(self, response.get("objects"))
+        return createJSHandle(self, response.get("objects"), scope)
 
     def _convertArgument(self, arg: Any) -> Dict:  # noqa: C901
         if arg == -0:
@@ -205,14 +524,18 @@ class ExecutionContext:
             "DOM.describeNode", {"objectId": elementHandle._remoteObject["objectId"]}
         )
 
+        scope = self.handleScope
         resolvedNode = await self._client.send(
             "DOM.resolveNode",
-            {
-                "backendNodeId": nodeInfo.get("node").get("backendNodeId"),
-                "executionContextId": self._contextId,
-            },
+            self._inScope(
+                {
+                    "backendNodeId": nodeInfo.get("node").get("backendNodeId"),
+                    "executionContextId": self._contextId,
+                },
+                scope,
+            ),
         )
-        return createJSHandle(self, resolvedNode.get("object")).asElement()
+        return createJSHandle(self, resolvedNode.get("object"), scope).asElement()
 
     def __str__(self) -> str:
         frame_id = f"frameId={self.frame.id}, " if self.frame else ""
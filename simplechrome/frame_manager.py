@@ -4,13 +4,24 @@ import logging
 from asyncio import Future, gather, sleep
 from collections import OrderedDict
 from sys import exc_info
-from typing import Any, Awaitable, Dict, List, Optional, Set, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Union,
+)
 
 from pyee2 import EventEmitterS
 
 from ._typings import (
     AsyncAny,
     CDPEvent,
+    EvaluationCall,
     Loop,
     Number,
     OptionalLoop,
@@ -23,15 +34,23 @@ from .errors import NavigationError, WaitSetupError
 from .events import Events
 from .execution_context import EVALUATION_SCRIPT_URL, ExecutionContext
 from .frame_resource_tree import FrameResourceTree
+from .handle_scope import HandleScope, active_handle_scope
 from .helper import Helper
 from .jsHandle import ElementHandle, JSHandle
-from .lifecycle_watcher import LifecycleWatcher
+from .lifecycle_watcher import LifecycleWatcher, TrackedLifecycleEvents
+from .navigation_timing import NavigationTiming
+from .network_idle_monitor import (
+    DEFAULT_IGNORED_TYPES,
+    DEFAULT_SAFETY_WINDOW,
+    NetworkIdleMonitor,
+)
+from .settle import SETTLE_INSTALL_SCRIPT, SettleCondition
 from .timeoutSettings import TimeoutSettings
 
 if TYPE_CHECKING:
     from .page import Page  # noqa: F401
     from .network_manager import NetworkManager  # noqa: F401
-    from .request_response import Response  # noqa: F401
+    from .request_response import Request, Response  # noqa: F401
 
 __all__ = ["FrameManager", "Frame"]
 
@@ -55,6 +74,7 @@ class FrameManager(EventEmitterS):
         "_networkManager",
         "_networkManager",
         "_page",
+        "_settleProbeAdded",
         "_timeoutSettings",
     ]
 
@@ -83,6 +103,7 @@ class FrameManager(EventEmitterS):
 
         self._mainFrame: Optional[Frame] = None
         self._emits_life: bool = False
+        self._settleProbeAdded: bool = False
 
         self._client.on("Page.frameAttached", self._onFrameAttached)
         self._client.on("Page.frameNavigated", self._onFrameNavigated)
@@ -116,11 +137,28 @@ class FrameManager(EventEmitterS):
     def page(self) -> Optional["Page"]:
         return self._page
 
+    @property
+    def handleScope(self) -> Optional[HandleScope]:
+        """The innermost HandleScope of this page entered by the current
+        task, if any"""
+        return active_handle_scope(self)
+
     def network_idle_promise(
-        self, num_inflight: int = 2, idle_time: int = 2, global_wait: int = 60
-    ) -> Awaitable[None]:
+        self,
+        num_inflight: int = 2,
+        idle_time: Number = 2,
+        global_wait: Number = 60,
+        safety_window: OptionalNumber = DEFAULT_SAFETY_WINDOW,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
+    ) -> Awaitable[Dict[str, Any]]:
         return self._networkManager.network_idle_promise(
-            num_inflight=num_inflight, idle_time=idle_time, global_wait=global_wait
+            num_inflight=num_inflight,
+            idle_time=idle_time,
+            global_wait=global_wait,
+            safety_window=safety_window,
+            ignored_types=ignored_types,
+            ignored_urls=ignored_urls,
         )
 
     def setDefaultNavigationTimeout(self, timeout: Number) -> None:
@@ -137,6 +175,24 @@ class FrameManager(EventEmitterS):
     ) -> Optional[ExecutionContext]:
         return self._contextIdToContext.get(contextId)
 
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of live frames, execution contexts and DOM worlds
+        (with an execution context) this frame manager is tracking
+        as well as the number of isolated worlds it created
+        """
+        worlds = 0
+        for frame in self._frames.values():
+            if frame._mainWorld._hasContext():
+                worlds += 1
+            if frame._secondaryWorld._hasContext():
+                worlds += 1
+        return {
+            "frames": len(self._frames),
+            "contexts": len(self._contextIdToContext),
+            "worlds": worlds,
+            "isolatedWorlds": len(self._isolatedWorlds),
+        }
+
     def frames(self) -> List["Frame"]:
         """Retrun all frames."""
         return list(self._frames.values())
@@ -219,6 +275,8 @@ class FrameManager(EventEmitterS):
         watcher = LifecycleWatcher(
             self, frame, waitUnitl, timeout, all_frames, self._loop
         )
+        if watcher.tracksCallbacks:
+            await self.ensureSettleProbe()
 
         ensureNewDocumentNavigation = {"ensure": False}
 
@@ -249,6 +307,7 @@ class FrameManager(EventEmitterS):
         watcher.dispose()
         if error is not None:
             raise error
+        self._recordNavigationTiming(frame, watcher.navigationRequest)
         return watcher.navigationResponse
 
     async def __navigate(
@@ -286,6 +345,8 @@ class FrameManager(EventEmitterS):
         watcher = LifecycleWatcher(
             self, frame, waitUnitl, timeout, all_frames, self._loop
         )
+        if watcher.tracksCallbacks:
+            await self.ensureSettleProbe()
         done, pending = await Helper.wait_for_first_done(
             watcher.timeoutPromise,
             watcher.terminationPromise,
@@ -297,17 +358,53 @@ class FrameManager(EventEmitterS):
         error = done.pop().result()
         if error is not None:
             raise error
+        self._recordNavigationTiming(frame, watcher.navigationRequest)
         return watcher.navigationResponse
 
     async def ensureSecondaryDOMWorld(self) -> None:
         await self._ensureIsolatedWorld(UTILITY_WORLD_NAME)
 
+    async def ensureSettleProbe(self) -> None:
+        """Adds the settle probe to every new document of the page so that
+        the timers and animation frames of a document are tracked from its
+        start"""
+        if self._settleProbeAdded:
+            return
+        self._settleProbeAdded = True
+        await self._client.send(
+            "Page.addScriptToEvaluateOnNewDocument", {"source": SETTLE_INSTALL_SCRIPT}
+        )
+
+    def _recordNavigationTiming(
+        self, frame: "Frame", request: Optional["Request"]
+    ) -> NavigationTiming:
+        """Creates the timing record for a completed navigation of the frame,
+        attaching it to the navigation response and emitting it"""
+        lifecycle = None
+        if request is not None and request.loaderId == frame._loaderId:
+            lifecycle = frame._lifecycleTimestamps
+        timing = NavigationTiming(frame, request, lifecycle)
+        if request is not None and request.response is not None:
+            request.response._navigationTiming = timing
+        self.emit(Events.FrameManager.NavigationTiming, timing)
+        return timing
+
     def _onLifecycleEvent(self, event: CDPEvent) -> None:
         frame = self._frames.get(event["frameId"])
         if frame is None:
             return
-        frame._onLifecycleEvent(event["loaderId"], event["name"])
+        satisfied = frame._onLifecycleEvent(
+            event["loaderId"], event["name"], event.get("timestamp")
+        )
         self.emit(Events.FrameManager.LifecycleEvent, frame)
+        self._emitLifecycleSatisfied(satisfied)
+
+    def _emitLifecycleSatisfied(self, frames: List["Frame"]) -> None:
+        """Notifies listeners of the frames whose own or subtree lifecycle
+        just became complete for one of the tracked lifecycle events"""
+        emit = self.emit
+        for frame in frames:
+            emit(Events.FrameManager.LifecycleSatisfied, frame)
 
     def _handleFrameTree(self, frameTree: Dict, is_first: bool = False) -> None:
         self._frames.clear()
@@ -387,8 +484,9 @@ class FrameManager(EventEmitterS):
         frame = self._frames.get(frameId)
         if frame is None:
             return
-        frame._onLoadingStopped()
+        satisfied = frame._onLoadingStopped()
         self.emit(Events.FrameManager.LifecycleEvent, frame)
+        self._emitLifecycleSatisfied(satisfied)
 
     def _onFrameNavigatedWithinDocument(self, event: CDPEvent) -> None:
         frameId: str = event.get("frameId")
@@ -418,38 +516,64 @@ class FrameManager(EventEmitterS):
             ):
                 world = frame._secondaryWorld
 
-        if auxData and auxData.get("type") == "isolated":
-            self._isolatedWorlds.add(contextPayload.get("name"))
-
         context = ExecutionContext(self._client, contextPayload, world)
         if world:
+            # the previous context of this world is dead even if we never
+            # received its executionContextDestroyed event
+            previous = world._executionContext
+            if previous is not None:
+                self._dropContext(previous)
             world._setContext(context)
-        self._contextIdToContext[contextPayload.get("id")] = context
+        contextId = contextPayload.get("id")
+        self._contextIdToContext[contextId] = context
+        if frame:
+            frame._contextIds.add(contextId)
 
     def _onExecutionContextDestroyed(self, event: CDPEvent) -> None:
         executionContextId: str = event.get("executionContextId")
         context = self._contextIdToContext.get(executionContextId)
         if not context:
             return
-        del self._contextIdToContext[executionContextId]
-        if context._world:
-            context._world._setContext(None)
+        self._dropContext(context)
 
     def _onExecutionContextsCleared(self, *args: Any) -> None:
         for context in self._contextIdToContext.values():
-            if context._world:
-                context._world._setContext(None)
+            world = context._world
+            if world:
+                world._setContext(None)
         self._contextIdToContext.clear()
+        for frame in self._frames.values():
+            frame._contextIds.clear()
+
+    def _dropContext(self, context: ExecutionContext) -> None:
+        contextId = context._contextId
+        self._contextIdToContext.pop(contextId, None)
+        frame = self._frames.get(context._frameId) if context._frameId else None
+        if frame is not None:
+            frame._contextIds.discard(contextId)
+        world = context._world
+        if world is not None and world._executionContext is context:
+            world._setContext(None)
+
+    def _dropFrameContexts(self, frame: "Frame") -> None:
+        contextIdToContext = self._contextIdToContext
+        for contextId in frame._contextIds:
+            contextIdToContext.pop(contextId, None)
+        frame._contextIds.clear()
 
     def _removeFramesRecursively(self, frame: "Frame") -> None:
         removeFramesRecursively = self._removeFramesRecursively
         for child in frame.childFrames:
             removeFramesRecursively(child)
-        frame._detach()
+        satisfied = frame._detach()
+        self._dropFrameContexts(frame)
         self._frames.pop(frame.id, None)
         self.emit(Events.FrameManager.FrameDetached, frame)
+        self._emitLifecycleSatisfied(satisfied)
 
     async def _ensureIsolatedWorld(self, name: str) -> None:
+        if name in self._isolatedWorlds:
+            return
         self._isolatedWorlds.add(name)
         await self._client.send(
             "Page.addScriptToEvaluateOnNewDocument",
@@ -483,16 +607,19 @@ class Frame(EventEmitterS):
         "_at_lifecycle",
         "_childFrames",
         "_client",
+        "_contextIds",
         "_detached",
         "_emits_life",
         "_frameManager",
         "_id",
         "_lifecycleEvents",
+        "_lifecycleTimestamps",
         "_loaderId",
         "_mainWorld",
         "_name",
         "_parentFrame",
         "_secondaryWorld",
+        "_subtreePending",
         "_url",
     ]
 
@@ -534,11 +661,23 @@ class Frame(EventEmitterS):
         self._secondaryWorld: DOMWorld = DOMWorld(
             frameManager, self, frameManager._timeoutSettings, self._loop
         )
+        self._contextIds: Set[Union[str, int]] = set()
         self._lifecycleEvents: Set[str] = set()
+        # replaced, not cleared, on init so navigation timing records
+        # keep the timestamps of the document they describe
+        self._lifecycleTimestamps: Dict[str, Number] = {}
+        # number of frames in this frame's subtree (itself included) that
+        # have yet to see each of the tracked lifecycle events
+        self._subtreePending: Dict[str, int] = dict.fromkeys(
+            TrackedLifecycleEvents, 1
+        )
         self._childFrames: Set[Frame] = set()  # maybe list
         self._at_lifecycle: Optional[str] = None
         if self._parentFrame:
             self._parentFrame._childFrames.add(self)
+            propagate = self._parentFrame._propagateLifecycle
+            for name in TrackedLifecycleEvents:
+                propagate(name, 1)
 
     @property
     def domWorld(self) -> DOMWorld:
@@ -635,6 +774,24 @@ class Frame(EventEmitterS):
     ) -> AsyncAny:
         return self._mainWorld.evaluate(pageFunction, *args, withCliAPI=withCliAPI)
 
+    def evaluate_many(
+        self, calls: Iterable[EvaluationCall], return_exceptions: bool = True
+    ) -> Awaitable[List[Any]]:
+        """Calls each page function with its arguments in the frame in a single
+        round trip, returning their results by value.
+
+        Details see :meth:`simplechrome.page.Page.evaluate_many`.
+        """
+        return self._mainWorld.evaluate_many(calls, return_exceptions)
+
+    def evaluate_helper(self, name: str, source: str, *args: Any) -> AsyncAny:
+        """Calls the page function installed under name in the frame with the
+        arguments, returning the result by value.
+
+        Details see :meth:`simplechrome.page.Page.evaluate_helper`.
+        """
+        return self._mainWorld.evaluate_helper(name, source, *args)
+
     def evaluate_expression(
         self, expression: str, withCliAPI: bool = False
     ) -> AsyncAny:
@@ -918,9 +1075,76 @@ class Frame(EventEmitterS):
             self._wait_for_life_cycle("loaded", Helper.ensure_loop(loop), timeout)
         )
 
+    async def waitForSettled(
+        self,
+        condition: Optional[SettleCondition] = None,
+        timeout: OptionalNumber = None,
+    ) -> None:
+        """Wait until the current document of this frame has settled
+
+        :param condition: When the frame is considered settled,
+         defaults to SettleCondition()
+        :param timeout: Maximum time in seconds to wait for,
+         defaults to the navigation timeout
+        """
+        if condition is None:
+            condition = SettleCondition()
+        if timeout is None:
+            timeout = self._frameManager._timeoutSettings.navigationTimeout
+        if condition.tracks_callbacks:
+            await self._frameManager.ensureSettleProbe()
+        watcher = condition.watcher(
+            self, self._frameManager._networkManager, self._loop
+        )
+        await Helper.waitWithTimeout(
+            watcher.wait(),
+            timeout,
+            "the frame to settle",
+            self._loop,
+            cb=watcher.dispose,
+        )
+
     def network_idle_waiter(
-        self, loop: OptionalLoop = None, timeout: OptionalNumber = None
+        self,
+        loop: OptionalLoop = None,
+        timeout: OptionalNumber = None,
+        scope: Optional[str] = None,
+        num_inflight: int = 0,
+        idle_time: Number = 0.5,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
     ) -> Future:
+        """Returns a future that resolves once the network is idle.
+
+        Without a scope the future resolves on the frame's networkIdle lifecycle
+        event, which requires lifecycle emitting to be enabled. With the scope
+        ``self`` only the requests made by this frame are considered and with
+        ``subtree`` the requests made by this frame and its descendants.
+
+        :param loop: Optional asyncio event loop to use
+        :param timeout: Maximum time in seconds to wait for network idle
+        :param scope: Optional frame scope of the requests considered
+        :param num_inflight: Scoped only, the number of requests that may
+         be in flight while the network is idle
+        :param idle_time: Scoped only, the time in seconds the network must be
+         idle for
+        :param ignored_types: Scoped only, the resource types of the requests
+         never considered
+        :param ignored_urls: Scoped only, URL globs of the requests never
+         considered
+        """
+        if scope is not None:
+            return NetworkIdleMonitor.monitor(
+                self._client,
+                num_inflight=num_inflight,
+                idle_time=idle_time,
+                global_wait=timeout if timeout is not None else 60,
+                loop=loop or self._loop,
+                frame=self,
+                scope=scope,
+                ignored_types=ignored_types,
+                ignored_urls=ignored_urls,
+            )
         if not self._emits_life:
             raise WaitSetupError("Must enable life cycle emitting")
         return self._loop.create_task(
@@ -947,31 +1171,93 @@ class Frame(EventEmitterS):
     def _navigatedWithinDocument(self, url: str) -> None:
         self._url = url
 
-    def _onLoadingStopped(self) -> None:
-        self._lifecycleEvents.add("DOMContentLoaded")
-        self._lifecycleEvents.add("load")
+    def _lifecycleComplete(self, expected: List[str], subtree: bool = True) -> bool:
+        """Returns T/F indicating if this frame, or its entire subtree
+        when `subtree` is true, has seen each of the expected lifecycle events
 
-    def _onLifecycleEvent(self, loaderId: str, name: str) -> None:
+        :param expected: The protocol lifecycle event names to check for
+        :param subtree: Should the child frames also be considered
+        """
+        if subtree:
+            pending = self._subtreePending
+            for name in expected:
+                if pending.get(name, 1) != 0:
+                    return False
+            return True
+        events = self._lifecycleEvents
+        for name in expected:
+            if name not in events:
+                return False
+        return True
+
+    def _propagateLifecycle(
+        self, name: str, delta: int, satisfied: Optional[List["Frame"]] = None
+    ) -> None:
+        """Applies `delta` to the pending count of the tracked lifecycle event
+        for this frame and each of its ancestors, recording the frames whose
+        subtree became complete for the event in `satisfied`
+        """
+        frame: Optional[Frame] = self
+        while frame is not None:
+            pending = frame._subtreePending[name] + delta
+            frame._subtreePending[name] = pending
+            if pending == 0 and satisfied is not None and frame not in satisfied:
+                satisfied.append(frame)
+            frame = frame._parentFrame
+
+    def _addLifecycleEvent(self, name: str, satisfied: List["Frame"]) -> None:
+        if name in self._lifecycleEvents:
+            return
+        self._lifecycleEvents.add(name)
+        if name not in TrackedLifecycleEvents:
+            return
+        if self not in satisfied:
+            satisfied.append(self)
+        self._propagateLifecycle(name, -1, satisfied)
+
+    def _onLoadingStopped(self) -> List["Frame"]:
+        satisfied: List[Frame] = []
+        self._addLifecycleEvent("DOMContentLoaded", satisfied)
+        self._addLifecycleEvent("load", satisfied)
+        return satisfied
+
+    def _onLifecycleEvent(
+        self, loaderId: str, name: str, timestamp: OptionalNumber = None
+    ) -> List["Frame"]:
+        satisfied: List[Frame] = []
         if name == "init":
             self._loaderId = loaderId
+            for seen in self._lifecycleEvents:
+                if seen in TrackedLifecycleEvents:
+                    self._propagateLifecycle(seen, 1)
             self._lifecycleEvents.clear()
+            self._lifecycleTimestamps = {}
             self._at_lifecycle = "init"
         else:
-            self._lifecycleEvents.add(name)
+            self._addLifecycleEvent(name, satisfied)
             self._at_lifecycle = name
+        if timestamp is not None:
+            self._lifecycleTimestamps.setdefault(name, timestamp)
         if self._emits_life:
             self.emit(Events.Frame.LifeCycleEvent, name)
+        return satisfied
 
-    def _detach(self) -> None:
+    def _detach(self) -> List["Frame"]:
+        satisfied: List[Frame] = []
         self._detached = True
         self._secondaryWorld._detach()
         self._mainWorld._detach()
         if self._emits_life:
             self.emit(Events.Frame.Detached)
         self.remove_all_listeners()
-        if self._parentFrame:
-            self._parentFrame._childFrames.remove(self)
+        parent = self._parentFrame
+        if parent:
+            parent._childFrames.remove(self)
+            for name, pending in self._subtreePending.items():
+                if pending:
+                    parent._propagateLifecycle(name, -pending, satisfied)
         self._parentFrame = None
+        return satisfied
 
     def __str__(self) -> str:
         return f"Frame(url={self._url}, name={self._name}, detached={self._detached}, id={self._id})"
@@ -0,0 +1,138 @@
+"""Scopes releasing the remote objects of JSHandles as a group"""
+import sys
+from itertools import count
+from typing import Any, Iterator, List, Optional, TYPE_CHECKING, Tuple
+from weakref import WeakSet
+
+if sys.version_info < (3, 7):
+    # makes the contextvars backport follow asyncio tasks
+    import aiocontextvars  # noqa: F401
+from contextvars import ContextVar, Token
+
+from ._typings import SlotsT
+from .connection import ClientType
+
+if TYPE_CHECKING:
+    from .frame_manager import FrameManager  # noqa: F401
+    from .jsHandle import JSHandle  # noqa: F401
+
+__all__ = ["HandleScope", "active_handle_scope"]
+
+_scopeIds: Iterator[int] = count(1)
+#: The handle scopes entered by the current task (and the tasks it created
+#: while they were active), innermost last
+_activeScopes: ContextVar = ContextVar("simplechrome_handle_scopes", default=())
+
+
+def active_handle_scope(frameManager: "FrameManager") -> Optional["HandleScope"]:
+    """Returns the innermost HandleScope of the page of the frame manager
+    entered by the current task, if any
+
+    :param frameManager: The frame manager of the page
+    """
+    scopes: Tuple[HandleScope, ...] = _activeScopes.get()
+    for scope in reversed(scopes):
+        if scope._frameManager is frameManager and not scope._released:
+            return scope
+    return None
+
+
+class HandleScope:
+    """Tags the remote objects of the JSHandles created while the scope is
+    active with an object group, releasing all of them with a single
+    ``Runtime.releaseObjectGroup`` once the scope exits.
+
+    Disposing a handle of an active scope does not release its object, it is
+    released along with the group, and handles of an exited scope are
+    disposed. Only the handles created by the code running inside the
+    ``async with`` block (including the tasks it creates) belong to the
+    scope, other coroutines using the page concurrently are not affected.
+    Scopes can be nested, handles belong to the innermost one.
+
+    Usage::
+
+        async with page.handle_scope():
+            links = await page.querySelectorAll("a")
+            hrefs = [await page.evaluate("a => a.href", link) for link in links]
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_clients",
+        "_frameManager",
+        "_handles",
+        "_objectGroup",
+        "_released",
+        "_token",
+    ]
+
+    def __init__(self, frameManager: "FrameManager") -> None:
+        """Initialize a new HandleScope
+
+        :param frameManager: The frame manager of the page the scope is for
+        """
+        self._frameManager: "FrameManager" = frameManager
+        self._objectGroup: str = f"simplechrome-scope-{next(_scopeIds)}"
+        self._handles: WeakSet = WeakSet()
+        self._clients: List[ClientType] = []
+        self._released: bool = False
+        self._token: Optional[Token] = None
+
+    @property
+    def objectGroup(self) -> str:
+        """The object group of the remote objects of the scope"""
+        return self._objectGroup
+
+    @property
+    def released(self) -> bool:
+        """Has the object group been released"""
+        return self._released
+
+    def track(self, handle: "JSHandle") -> None:
+        """Adds the handle, whose remote object belongs to the object group,
+        to the scope
+
+        :param handle: The handle
+        """
+        handle._scope = self
+        self._handles.add(handle)
+        if handle._client not in self._clients:
+            self._clients.append(handle._client)
+
+    async def release(self) -> None:
+        """Disposes the handles of the scope and releases its object group"""
+        if self._released:
+            return
+        self._released = True
+        for handle in list(self._handles):
+            handle._disposed = True
+        self._handles.clear()
+        for client in self._clients:
+            try:
+                await client.send(
+                    "Runtime.releaseObjectGroup", {"objectGroup": self._objectGroup}
+                )
+            except Exception:
+                # the page may have been navigated or closed, its objects are
+                # gone already
+                pass
+        self._clients.clear()
+
+    async def __aenter__(self) -> "HandleScope":
+        self._token = _activeScopes.set(_activeScopes.get() + (self,))
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        if self._token is not None:
+            _activeScopes.reset(self._token)
+            self._token = None
+        await self.release()
+
+    def __str__(self) -> str:
+        return (
+            f"HandleScope(objectGroup={self._objectGroup}, "
+            f"handles={len(self._handles)}, released={self._released})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,534 @@
+"""HAR 1.2 capture of the network traffic of a page"""
+import base64
+from asyncio import Semaphore, Task, gather
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from ujson import dumps
+
+from ._typings import CDPEvent, Loop, OptionalLoop, SlotsT
+from .batch_writer import BatchWriter
+from .body_capture import BodyCapturePolicy
+from .events import Events
+from .helper import EEListener, Helper
+
+if TYPE_CHECKING:
+    from .navigation_timing import NavigationTiming  # noqa: F401
+    from .network_manager import NetworkManager  # noqa: F401
+    from .page import Page  # noqa: F401
+    from .request_response import Request, Response  # noqa: F401
+
+__all__ = ["HARRecorder"]
+
+HAR_VERSION: str = "1.2"
+
+_HTTP_VERSIONS: Dict[str, str] = {
+    "h2": "HTTP/2.0",
+    "h3": "HTTP/3",
+    "http/1.0": "HTTP/1.0",
+    "http/1.1": "HTTP/1.1",
+    "quic": "HTTP/3",
+}
+
+HAREntry = Dict[str, Any]
+
+
+def _har_date(wallTime: Optional[float]) -> str:
+    if wallTime is None:
+        moment = datetime.utcnow()
+    else:
+        moment = datetime.utcfromtimestamp(wallTime)
+    return moment.isoformat(timespec="milliseconds") + "Z"
+
+
+def _http_version(protocol: Optional[str]) -> str:
+    if not protocol:
+        return ""
+    return _HTTP_VERSIONS.get(protocol.lower(), protocol.upper())
+
+
+def _har_headers(headers: Optional[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Chrome joins repeated headers with a newline, they are split back
+    into separate headers"""
+    harHeaders = []
+    if headers:
+        for name, value in headers.items():
+            for part in str(value).split("\n"):
+                harHeaders.append({"name": name, "value": part})
+    return harHeaders
+
+
+def _header_value(headers: List[Dict[str, str]], name: str) -> Optional[str]:
+    name = name.lower()
+    for header in headers:
+        if header["name"].lower() == name:
+            return header["value"]
+    return None
+
+
+def _request_cookies(headers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    cookies = []
+    for header in headers:
+        if header["name"].lower() != "cookie":
+            continue
+        for pair in header["value"].split(";"):
+            name, _, value = pair.strip().partition("=")
+            if name:
+                cookies.append({"name": name, "value": value})
+    return cookies
+
+
+def _response_cookies(headers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    cookies = []
+    for header in headers:
+        if header["name"].lower() != "set-cookie":
+            continue
+        name, _, value = header["value"].split(";", 1)[0].strip().partition("=")
+        if name:
+            cookies.append({"name": name, "value": value})
+    return cookies
+
+
+def _duration(start: Optional[float], end: Optional[float]) -> float:
+    if start is None or end is None or start < 0 or end < 0:
+        return -1
+    return max(end - start, 0)
+
+
+def har_timings(
+    request: "Request", response: Optional["Response"]
+) -> Dict[str, float]:
+    """Returns the HAR timings, in milliseconds, of the request computed from
+    the Network.ResourceTiming of its response
+
+    :param request: The request
+    :param response: The response of the request, if one was received
+    """
+    timings: Dict[str, float] = {
+        "blocked": -1,
+        "dns": -1,
+        "connect": -1,
+        "ssl": -1,
+        "send": 0,
+        "wait": 0,
+        "receive": 0,
+    }
+    if response is None:
+        return timings
+    sentAt = request.timeStamp
+    finishedAt = response.finishedTimestamp
+    timing = response.timing
+    if not timing:
+        # served from the memory cache, a data URL or a service worker
+        receivedAt = response.timestamp
+        if sentAt is not None and receivedAt is not None:
+            timings["wait"] = max((receivedAt - sentAt) * 1000, 0)
+            if finishedAt is not None:
+                timings["receive"] = max((finishedAt - receivedAt) * 1000, 0)
+        return timings
+    requestTime = timing.get("requestTime", 0)
+    firstPhase = next(
+        (
+            timing[phase]
+            for phase in ("dnsStart", "connectStart", "sendStart")
+            if timing.get(phase, -1) >= 0
+        ),
+        0,
+    )
+    queued = (requestTime - sentAt) * 1000 if sentAt is not None else 0
+    timings["blocked"] = max(queued, 0) + firstPhase
+    timings["dns"] = _duration(timing.get("dnsStart"), timing.get("dnsEnd"))
+    timings["connect"] = _duration(timing.get("connectStart"), timing.get("connectEnd"))
+    timings["ssl"] = _duration(timing.get("sslStart"), timing.get("sslEnd"))
+    sendEnd = timing.get("sendEnd", 0)
+    timings["send"] = max(sendEnd - timing.get("sendStart", 0), 0)
+    headersEnd = timing.get("receiveHeadersEnd", sendEnd)
+    timings["wait"] = max(headersEnd - sendEnd, 0)
+    if finishedAt is not None:
+        timings["receive"] = max((finishedAt - requestTime) * 1000 - headersEnd, 0)
+    return timings
+
+
+class HARRecorder:
+    """Records the requests and responses of a page as a HAR 1.2 log.
+
+    Entries are built as requests finish or fail, by at most ``concurrency``
+    tasks at once each holding its slot until its entry is queued, and are
+    appended to the ``entries`` array of the HAR file by a background writer,
+    so only the entries not yet written (at most ``concurrency +
+    max_pending``) and one record per page are held in memory. The log is
+    completed once recording is stopped. Once writing fails nothing more is
+    recorded and :meth:`stop` raises the error.
+
+    Timings come from the Network.ResourceTiming of the responses, sizes from
+    ``Network.dataReceived`` and ``Network.loadingFinished``. When a
+    BodyCapturePolicy is supplied it is installed on the network manager while
+    recording and the bodies it captures are included base64 encoded.
+
+    Usage::
+
+        async with page.har_recorder("capture.har"):
+            await page.goto(url)
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_capturePolicy",
+        "_concurrency",
+        "_currentPage",
+        "_dataReceived",
+        "_entries",
+        "_entryCount",
+        "_file",
+        "_listeners",
+        "_loop",
+        "_networkManager",
+        "_pages",
+        "_pagesByLoader",
+        "_path",
+        "_previousPolicy",
+        "_target",
+        "_tasks",
+    ]
+
+    def __init__(
+        self,
+        target: Union["Page", "NetworkManager"],
+        path: str,
+        capture_policy: Optional[BodyCapturePolicy] = None,
+        max_pending: int = 64,
+        concurrency: int = 4,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new HARRecorder
+
+        :param target: The page or network manager to be recorded
+        :param path: The path of the HAR file written to
+        :param capture_policy: Optional policy selecting the response bodies
+         included in the log
+        :param max_pending: The maximum number of entries waiting to be written
+        :param concurrency: The maximum number of entries built or waiting to
+         be queued at once
+        :param loop: Optional asyncio event loop to use
+        """
+        self._target: Union["Page", "NetworkManager"] = target
+        self._networkManager: "NetworkManager" = getattr(
+            target, "network_manager", target
+        )
+        self._path: str = path
+        self._capturePolicy: Optional[BodyCapturePolicy] = capture_policy
+        self._previousPolicy: Optional[BodyCapturePolicy] = None
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._entries: BatchWriter = BatchWriter(
+            self._write, max_pending, self._loop, open=self._open
+        )
+        self._concurrency: Semaphore = Semaphore(concurrency, loop=self._loop)
+        # requestId -> [decoded bytes, encoded bytes] received
+        self._dataReceived: Dict[str, List[int]] = {}
+        self._pages: List[Dict[str, Any]] = []
+        self._pagesByLoader: Dict[str, Dict[str, Any]] = {}
+        self._currentPage: Optional[Dict[str, Any]] = None
+        self._entryCount: int = 0
+        self._file: Optional[Any] = None
+        self._tasks: Set[Task] = set()
+        self._listeners: List[EEListener] = []
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def recording(self) -> bool:
+        return self._entries.running
+
+    @property
+    def entryCount(self) -> int:
+        """The number of entries written to the HAR file"""
+        return self._entryCount
+
+    def start(self) -> None:
+        """Start recording"""
+        if self._entries.running:
+            return
+        networkManager = self._networkManager
+        if self._capturePolicy is not None:
+            previousCapture = networkManager.body_capture
+            self._previousPolicy = (
+                previousCapture.policy if previousCapture is not None else None
+            )
+            networkManager.setBodyCapturePolicy(self._capturePolicy)
+        self._entries.start()
+        self._listeners.extend(
+            [
+                Helper.addEventListener(
+                    networkManager, Events.NetworkManager.Request, self._onRequest
+                ),
+                Helper.addEventListener(
+                    networkManager,
+                    Events.NetworkManager.RequestFinished,
+                    self._onRequestDone,
+                ),
+                Helper.addEventListener(
+                    networkManager,
+                    Events.NetworkManager.RequestFailed,
+                    self._onRequestDone,
+                ),
+                Helper.addEventListener(
+                    networkManager._client,
+                    "Network.dataReceived",
+                    self._onDataReceived,
+                ),
+                Helper.addEventListener(
+                    networkManager._client,
+                    "Network.loadingFailed",
+                    self._onLoadingFailed,
+                ),
+            ]
+        )
+        if self._target is not networkManager:
+            self._listeners.append(
+                Helper.addEventListener(
+                    self._target,
+                    Events.Page.NavigationTiming,
+                    self._onNavigationTiming,
+                )
+            )
+
+    async def stop(self) -> None:
+        """Stop recording, waiting for every finished request to be written
+        and completing the HAR file. Raises the error opening or writing the
+        HAR file failed with, if any"""
+        if not self._entries.running:
+            return
+        Helper.removeEventListeners(self._listeners)
+        # requests still in flight are not recorded
+        self._dataReceived.clear()
+        if self._capturePolicy is not None:
+            self._networkManager.setBodyCapturePolicy(self._previousPolicy)
+            self._previousPolicy = None
+        if self._tasks:
+            await gather(*self._tasks, loop=self._loop, return_exceptions=True)
+        try:
+            await self._entries.close()
+        finally:
+            await self._loop.run_in_executor(None, self._finish, self._pages)
+
+    def _onRequest(self, request: "Request") -> None:
+        if not request.isNavigationRequest:
+            return
+        frame = request.frame
+        if frame is not None and frame.parentFrame is not None:
+            return
+        page = self._pagesByLoader.get(request.loaderId)
+        if page is None:
+            page = {
+                "startedDateTime": _har_date(request.wallTime),
+                "id": f"page_{len(self._pages) + 1}",
+                "title": request.url,
+                "pageTimings": {"onContentLoad": -1, "onLoad": -1},
+            }
+            self._pages.append(page)
+            self._pagesByLoader[request.loaderId] = page
+        self._currentPage = page
+
+    def _onNavigationTiming(self, timing: "NavigationTiming") -> None:
+        page = self._pagesByLoader.get(timing.loaderId)
+        if page is None:
+            return
+        pageTimings = page["pageTimings"]
+        for harName, lifecycleName in (
+            ("onContentLoad", "DOMContentLoaded"),
+            ("onLoad", "load"),
+        ):
+            elapsed = timing.elapsed(lifecycleName)
+            if elapsed is not None:
+                pageTimings[harName] = elapsed * 1000
+
+    def _onDataReceived(self, event: CDPEvent) -> None:
+        received = self._dataReceived.get(event.get("requestId"))
+        if received is None:
+            received = self._dataReceived[event.get("requestId")] = [0, 0]
+        received[0] += event.get("dataLength", 0)
+        received[1] += event.get("encodedDataLength", 0)
+
+    def _onLoadingFailed(self, event: CDPEvent) -> None:
+        # failed requests the network manager does not emit would otherwise
+        # keep their counts forever
+        self._dataReceived.pop(event.get("requestId"), None)
+
+    def _onRequestDone(self, request: "Request") -> None:
+        received = self._dataReceived.pop(request.requestId, None)
+        if request.url.startswith("data:"):
+            return
+        task = self._loop.create_task(self._record(request, received))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _record(self, request: "Request", received: Optional[List[int]]) -> None:
+        response = request.response
+        # the slot is held until the entry is queued so that at most
+        # concurrency bodies are held while waiting for the writer
+        async with self._concurrency:
+            if self._entries.error is not None:
+                # writing failed, nothing more is recorded
+                return
+            body: Optional[bytes] = None
+            if (
+                response is not None
+                and response.captured_body is not None
+                and request not in request.redirectChain
+            ):
+                body = await response.captured_body.read()
+            postData = request.postData
+            if postData is None and request.hasPostData:
+                try:
+                    postData = await request.get_post_data()
+                except Exception:
+                    postData = None
+            await self._entries.put(
+                dumps(
+                    self._buildEntry(request, response, received, body, postData),
+                    escape_forward_slashes=False,
+                )
+            )
+
+    def _buildEntry(
+        self,
+        request: "Request",
+        response: Optional["Response"],
+        received: Optional[List[int]],
+        body: Optional[bytes],
+        postData: Optional[str],
+    ) -> HAREntry:
+        requestHeaders = _har_headers(
+            (response.requestHeaders if response is not None else None)
+            or request.headers
+        )
+        harRequest: Dict[str, Any] = {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": _http_version(
+                response.protocol if response is not None else None
+            ),
+            "cookies": _request_cookies(requestHeaders),
+            "headers": requestHeaders,
+            "queryString": [
+                {"name": name, "value": value}
+                for name, value in parse_qsl(
+                    urlsplit(request.url).query, keep_blank_values=True
+                )
+            ],
+            "headersSize": -1,
+            "bodySize": len(postData.encode("utf-8")) if postData else 0,
+        }
+        if postData:
+            harRequest["postData"] = {
+                "mimeType": _header_value(requestHeaders, "content-type") or "",
+                "text": postData,
+            }
+
+        decoded, encoded = received if received is not None else (0, 0)
+        if body is not None:
+            decoded = len(body)
+        if response is not None:
+            responseHeaders = _har_headers(response.headers)
+            content: Dict[str, Any] = {
+                "size": decoded,
+                "mimeType": response.mimeType or "",
+            }
+            if body is not None:
+                content["text"] = base64.b64encode(body).decode("ascii")
+                content["encoding"] = "base64"
+            harResponse: Dict[str, Any] = {
+                "status": response.status,
+                "statusText": response.statusText,
+                "httpVersion": _http_version(response.protocol),
+                "cookies": _response_cookies(responseHeaders),
+                "headers": responseHeaders,
+                "content": content,
+                "redirectURL": _header_value(responseHeaders, "location") or "",
+                "headersSize": -1,
+                "bodySize": encoded if received is not None else -1,
+                "_transferSize": response.encodedDataLength,
+            }
+        else:
+            harResponse = {
+                "status": 0,
+                "statusText": "",
+                "httpVersion": "",
+                "cookies": [],
+                "headers": [],
+                "content": {"size": 0, "mimeType": ""},
+                "redirectURL": "",
+                "headersSize": -1,
+                "bodySize": -1,
+                "_error": request.failureText,
+            }
+
+        timings = har_timings(request, response)
+        entry: HAREntry = {
+            "startedDateTime": _har_date(request.wallTime),
+            "time": sum(
+                value
+                for name, value in timings.items()
+                if value > 0 and name != "ssl"
+            ),
+            "request": harRequest,
+            "response": harResponse,
+            "cache": {},
+            "timings": timings,
+            "_resourceType": request.resourceType,
+        }
+        page = self._pagesByLoader.get(request.loaderId, self._currentPage)
+        if page is not None:
+            entry["pageref"] = page["id"]
+        if response is not None and response.remoteIPAddress:
+            entry["serverIPAddress"] = response.remoteIPAddress
+        return entry
+
+    def _open(self) -> None:
+        from . import __version__
+
+        creator = dumps({"name": "simplechrome", "version": __version__})
+        self._file = open(self._path, "w", encoding="utf-8")
+        self._file.write(
+            f'{{"log":{{"version":"{HAR_VERSION}","creator":{creator},"entries":['
+        )
+        self._entryCount = 0
+
+    def _write(self, entries: List[str]) -> None:
+        for entry in entries:
+            if self._entryCount:
+                self._file.write(",\n")
+            self._file.write(entry)
+            self._entryCount += 1
+        self._file.flush()
+
+    def _finish(self, pages: List[Dict[str, Any]]) -> None:
+        if self._file is None:
+            return
+        try:
+            if self._entries.error is None:
+                self._file.write(
+                    f'],"pages":{dumps(pages, escape_forward_slashes=False)}}}}}\n'
+                )
+        finally:
+            self._file.close()
+            self._file = None
+
+    async def __aenter__(self) -> "HARRecorder":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def __str__(self) -> str:
+        return (
+            f"HARRecorder(path={self._path}, recording={self.recording}, "
+            f"entries={self._entryCount})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,440 @@
+"""Declarative request interception rules"""
+import base64
+import logging
+import mimetypes
+import re
+from abc import ABC, abstractmethod
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+import aiofiles
+
+from ._typings import CDPEvent, HTTPHeaders, SlotsT
+from .connection import ClientType
+
+__all__ = [
+    "AbortRequest",
+    "ContinueRequest",
+    "FulfillRequest",
+    "InterceptionAction",
+    "InterceptionRule",
+    "InterceptionRuleSet",
+]
+
+HeaderMatchers = Dict[str, Union[str, Pattern]]
+
+logger = logging.getLogger(__name__)
+
+
+def glob_to_regex(glob: str) -> str:
+    """Converts a Fetch URL pattern (``*`` matches zero or more characters,
+    ``?`` exactly one and backslash escapes) into an equivalent regex
+
+    :param glob: The URL pattern
+    """
+    parts: List[str] = []
+    escaped = False
+    for char in glob:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def globs_to_regex(globs: Iterable[str]) -> Optional[Pattern]:
+    """Compiles the URL patterns (see :func:`glob_to_regex`) into a single
+    regex matching the URLs that match any of them, None if there are none
+
+    :param globs: The URL patterns
+    """
+    globs = list(globs)
+    if not globs:
+        return None
+    return re.compile(
+        "|".join(f"(?:{glob_to_regex(glob)})\\Z" for glob in globs), re.DOTALL
+    )
+
+
+def _headers_array(headers: HTTPHeaders) -> List[Dict[str, str]]:
+    return [{"name": name, "value": value} for name, value in headers.items()]
+
+
+class InterceptionAction(ABC):
+    """Base class of the actions applied to requests matched by a rule"""
+
+    __slots__: SlotsT = []
+
+    @abstractmethod
+    async def apply(self, client: ClientType, event: CDPEvent) -> None:
+        """Applies the action to the paused request
+
+        :param client: The client the request was paused on
+        :param event: The Fetch.requestPaused event of the paused request
+        """
+
+
+class AbortRequest(InterceptionAction):
+    """Fails the request"""
+
+    __slots__: SlotsT = ["_errorReason"]
+
+    def __init__(self, errorReason: str = "Failed") -> None:
+        """Initialize a new AbortRequest action
+
+        :param errorReason: The Network.ErrorReason the request fails with
+        """
+        self._errorReason: str = errorReason
+
+    async def apply(self, client: ClientType, event: CDPEvent) -> None:
+        await client.send(
+            "Fetch.failRequest",
+            {"requestId": event.get("requestId"), "errorReason": self._errorReason},
+        )
+
+    def __str__(self) -> str:
+        return f"AbortRequest(errorReason={self._errorReason})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class ContinueRequest(InterceptionAction):
+    """Continues the request, optionally with overrides"""
+
+    __slots__: SlotsT = ["_overrides"]
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        method: Optional[str] = None,
+        postData: Optional[Union[str, bytes]] = None,
+        headers: Optional[HTTPHeaders] = None,
+    ) -> None:
+        """Initialize a new ContinueRequest action
+
+        :param url: If set, the request url will be changed
+        :param method: If set, the request method will be changed
+        :param postData: If set, the post data of the request will be changed
+        :param headers: If set, replaces the request headers
+        """
+        overrides: Dict = {}
+        if url is not None:
+            overrides["url"] = url
+        if method is not None:
+            overrides["method"] = method
+        if postData is not None:
+            if isinstance(postData, str):
+                postData = postData.encode("utf-8")
+            overrides["postData"] = base64.b64encode(postData).decode("ascii")
+        if headers is not None:
+            overrides["headers"] = _headers_array(headers)
+        self._overrides: Dict = overrides
+
+    async def apply(self, client: ClientType, event: CDPEvent) -> None:
+        await client.send(
+            "Fetch.continueRequest",
+            dict(requestId=event.get("requestId"), **self._overrides),
+        )
+
+    def __str__(self) -> str:
+        return f"ContinueRequest(overrides={list(self._overrides)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class FulfillRequest(InterceptionAction):
+    """Fulfills the request with a response from data or from a file"""
+
+    __slots__: SlotsT = ["_body", "_headers", "_path", "_status"]
+
+    def __init__(
+        self,
+        status: int = 200,
+        headers: Optional[HTTPHeaders] = None,
+        contentType: Optional[str] = None,
+        body: Optional[Union[str, bytes]] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        """Initialize a new FulfillRequest action
+
+        :param status: The response status code
+        :param headers: The response headers
+        :param contentType: If set, the Content-Type of the response. Guessed
+         from the path when fulfilling from a file
+        :param body: The response body
+        :param path: Path to a file whose contents are the response body,
+         read every time the action is applied. The request fails if the
+         file can not be read
+        """
+        if body is not None and path is not None:
+            raise ValueError("Only one of body or path can be supplied")
+        self._status: int = status
+        self._headers: HTTPHeaders = dict(headers or {})
+        if contentType is None and path is not None:
+            contentType, _ = mimetypes.guess_type(path)
+        if contentType is not None:
+            self._headers["Content-Type"] = contentType
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self._body: Optional[bytes] = body
+        self._path: Optional[str] = path
+
+    async def apply(self, client: ClientType, event: CDPEvent) -> None:
+        requestId = event.get("requestId")
+        body = self._body
+        if self._path is not None:
+            try:
+                async with aiofiles.open(self._path, "rb") as body_in:
+                    body = await body_in.read()
+            except OSError as e:
+                # the request is failed rather than left paused
+                logger.warning("FulfillRequest could not read %s: %s", self._path, e)
+                await client.send(
+                    "Fetch.failRequest",
+                    {"requestId": requestId, "errorReason": "Failed"},
+                )
+                return
+        headers = self._headers
+        response: Dict = {
+            "requestId": requestId,
+            "responseCode": self._status,
+        }
+        if body is not None:
+            response["body"] = base64.b64encode(body).decode("ascii")
+            if not any(name.lower() == "content-length" for name in headers):
+                headers = dict(headers)
+                headers["Content-Length"] = str(len(body))
+        response["responseHeaders"] = _headers_array(headers)
+        await client.send("Fetch.fulfillRequest", response)
+
+    def __str__(self) -> str:
+        return f"FulfillRequest(status={self._status}, path={self._path})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class InterceptionRule:
+    """Matches requests paused by Fetch and the action applied to them.
+
+    A rule matches a request when every supplied matcher matches it.
+    The url glob and resource types are pushed down into the Fetch.enable
+    patterns so that only requests that could match a rule are paused.
+    """
+
+    __slots__: SlotsT = [
+        "_action",
+        "_headers",
+        "_methods",
+        "_regex",
+        "_resource_types",
+        "_url",
+        "_urlRegex",
+    ]
+
+    def __init__(
+        self,
+        action: InterceptionAction,
+        url: Optional[str] = None,
+        regex: Optional[Union[str, Pattern]] = None,
+        resource_types: Optional[Iterable[str]] = None,
+        methods: Optional[Iterable[str]] = None,
+        headers: Optional[HeaderMatchers] = None,
+    ) -> None:
+        """Initialize a new InterceptionRule
+
+        :param action: The action applied to matching requests
+        :param url: URL glob, ``*`` matches zero or more characters and
+         ``?`` exactly one
+        :param regex: Regular expression searched for in the URL
+        :param resource_types: The resource types (e.g. Image, Script) matched
+        :param methods: The request methods matched
+        :param headers: Mapping of header name to the exact value or a regular
+         expression searched for in the value of the header
+        """
+        self._action: InterceptionAction = action
+        self._url: Optional[str] = url
+        self._urlRegex: Optional[Pattern] = re.compile(
+            glob_to_regex(url), re.DOTALL
+        ) if url is not None else None
+        self._regex: Optional[Pattern] = None
+        if regex is not None:
+            self._regex = re.compile(regex)
+        self._resource_types: Optional[FrozenSet[str]] = frozenset(
+            resource_types
+        ) if resource_types is not None else None
+        self._methods: Optional[FrozenSet[str]] = frozenset(
+            method.upper() for method in methods
+        ) if methods is not None else None
+        self._headers: List[Tuple[str, Union[str, Pattern]]] = [
+            (name.lower(), value) for name, value in (headers or {}).items()
+        ]
+
+    @property
+    def action(self) -> InterceptionAction:
+        return self._action
+
+    @property
+    def resource_types(self) -> Optional[FrozenSet[str]]:
+        return self._resource_types
+
+    def fetch_patterns(self) -> List[Dict[str, str]]:
+        """Returns the Fetch.RequestPatterns covering every request this rule
+        can match"""
+        urlPattern = self._url if self._url is not None else "*"
+        if self._resource_types is None:
+            return [{"urlPattern": urlPattern}]
+        return [
+            {"urlPattern": urlPattern, "resourceType": resourceType}
+            for resourceType in sorted(self._resource_types)
+        ]
+
+    def matches(self, url: str, method: str, headers: Dict[str, str]) -> bool:
+        """Returns T/F indicating if the rule matches the request. The resource
+        type is checked by the rule set the rule was compiled into
+
+        :param url: The URL of the request
+        :param method: The method of the request
+        :param headers: The headers of the request
+        """
+        if self._urlRegex is not None and self._urlRegex.fullmatch(url) is None:
+            return False
+        if self._regex is not None and self._regex.search(url) is None:
+            return False
+        if self._methods is not None and method.upper() not in self._methods:
+            return False
+        if self._headers:
+            lowered = {name.lower(): value for name, value in headers.items()}
+            for name, expected in self._headers:
+                value = lowered.get(name)
+                if value is None:
+                    return False
+                if isinstance(expected, str):
+                    if value != expected:
+                        return False
+                elif expected.search(value) is None:
+                    return False
+        return True
+
+    def __str__(self) -> str:
+        return (
+            f"InterceptionRule(action={self._action}, url={self._url}, "
+            f"regex={self._regex}, resource_types={self._resource_types}, "
+            f"methods={self._methods})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class InterceptionRuleSet:
+    """Rules compiled for matching paused requests.
+
+    The rules are indexed by resource type and their URL matchers combined into
+    a single regex so that requests matching no rule are rejected with one
+    search. When several rules match a request the first one supplied wins.
+    """
+
+    __slots__: SlotsT = ["_anyRule", "_byResourceType", "_rules", "_urlFilter"]
+
+    def __init__(self, rules: Iterable[InterceptionRule]) -> None:
+        self._rules: List[InterceptionRule] = list(rules)
+        self._byResourceType: Dict[str, List[InterceptionRule]] = {}
+        self._anyRule: List[InterceptionRule] = []
+        for rule in self._rules:
+            if rule._resource_types is None:
+                self._anyRule.append(rule)
+                for bucket in self._byResourceType.values():
+                    bucket.append(rule)
+                continue
+            for resourceType in rule._resource_types:
+                bucket = self._byResourceType.get(resourceType)
+                if bucket is None:
+                    bucket = self._byResourceType[resourceType] = list(self._anyRule)
+                bucket.append(rule)
+        self._urlFilter: Optional[Pattern] = self._compileUrlFilter()
+
+    @property
+    def rules(self) -> List[InterceptionRule]:
+        return self._rules
+
+    def fetch_patterns(self) -> List[Dict[str, str]]:
+        """Returns the Fetch.RequestPatterns pausing only the requests
+        that could be matched by a rule"""
+        patterns: List[Dict[str, str]] = []
+        for rule in self._rules:
+            for pattern in rule.fetch_patterns():
+                if pattern == {"urlPattern": "*"}:
+                    return [pattern]
+                if pattern not in patterns:
+                    patterns.append(pattern)
+        return patterns
+
+    def _compileUrlFilter(self) -> Optional[Pattern]:
+        urlFilters: List[str] = []
+        for rule in self._rules:
+            if rule._urlRegex is not None:
+                urlFilters.append(f"(?:{rule._urlRegex.pattern})\\Z")
+            elif (
+                rule._regex is not None
+                and not rule._regex.groups
+                and not rule._regex.flags & ~re.UNICODE
+            ):
+                urlFilters.append(f"(?:.*?{rule._regex.pattern})")
+            else:
+                # the rule can not be combined, every request must be checked.
+                # Combining shifts the numbers of groups, breaking numbered
+                # backreferences, and repeats named groups
+                return None
+        if not urlFilters:
+            return None
+        try:
+            return re.compile("|".join(urlFilters), re.DOTALL)
+        except re.error:
+            return None
+
+    def match(self, event: CDPEvent) -> Optional[InterceptionRule]:
+        """Returns the first rule matching the request of the Fetch.requestPaused
+        event, or None if no rule matches it
+
+        :param event: The Fetch.requestPaused event
+        """
+        candidates = self._byResourceType.get(event.get("resourceType"), self._anyRule)
+        if not candidates:
+            return None
+        request = event.get("request", {})
+        url = request.get("url", "")
+        if self._urlFilter is not None and self._urlFilter.match(url) is None:
+            return None
+        method = request.get("method", "GET")
+        headers = request.get("headers", {})
+        for rule in candidates:
+            if rule.matches(url, method, headers):
+                return rule
+        return None
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __str__(self) -> str:
+        return f"InterceptionRuleSet(rules={len(self._rules)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,291 @@
+"""Dispatching of the commands resolving requests paused by Fetch"""
+from asyncio import CancelledError, Future, Task
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+from ._typings import CDPEvent, Loop, OptionalLoop, SlotsT
+from .connection import ClientType
+from .errors import NetworkError
+from .helper import Helper
+from .interception import InterceptionAction
+from .network_stats import LatencyHistogram, StatsDict
+from .request_table import RequestTable
+
+__all__ = ["InterceptionDispatcher"]
+
+#: The default maximum number of commands resolving paused requests sent at once
+DEFAULT_INTERCEPTION_CONCURRENCY: int = 16
+#: The default maximum number of paused requests whose pause time is tracked
+DEFAULT_MAX_PAUSED: int = 10000
+
+
+class InterceptionDispatcher:
+    """Owns the tasks sending the commands (e.g. Fetch.continueRequest)
+    that resolve the requests paused by Fetch.
+
+    At most ``concurrency`` commands are in flight at once, the rest wait
+    in order. Failed commands are counted per command and re-raised to
+    whoever awaits them, commands still pending when the dispatcher is closed
+    (e.g. the page closed) are cancelled. When an InterceptionAction fails
+    the request is continued so that it is not left paused. The time between
+    a request being paused and the command resolving it completing is
+    recorded in a LatencyHistogram, a request the browser is still waiting on
+    (including one whose commands all failed) is reported by :meth:`stats`
+    along with how long the oldest one has been paused.
+    """
+
+    __slots__: SlotsT = [
+        "_cancelled",
+        "_client",
+        "_closed",
+        "_completed",
+        "_concurrency",
+        "_errors",
+        "_latency",
+        "_loop",
+        "_pausedAt",
+        "_running",
+        "_tasks",
+        "_waiters",
+    ]
+
+    def __init__(
+        self,
+        client: ClientType,
+        concurrency: int = DEFAULT_INTERCEPTION_CONCURRENCY,
+        max_paused: int = DEFAULT_MAX_PAUSED,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new InterceptionDispatcher
+
+        :param client: The client the requests are paused on
+        :param concurrency: The maximum number of commands sent at once
+        :param max_paused: The maximum number of paused requests tracked
+        :param loop: Optional asyncio event loop to use
+        """
+        self._client: ClientType = client
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._concurrency: int = concurrency
+        # the commands waiting for one of the concurrency slots, in order
+        self._waiters: Deque[Future] = deque()
+        # interceptionId -> the loop time the request was paused at
+        self._pausedAt: RequestTable = RequestTable(
+            max_size=max_paused, loop=self._loop
+        )
+        self._tasks: Set[Task] = set()
+        self._latency: LatencyHistogram = LatencyHistogram()
+        self._errors: Dict[str, int] = {}
+        self._running: int = 0
+        self._completed: int = 0
+        self._cancelled: int = 0
+        self._closed: bool = False
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """The histogram of milliseconds from a request being paused
+        to the command resolving it completing"""
+        return self._latency
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def setConcurrency(self, concurrency: int) -> None:
+        """Changes the maximum number of commands sent at once. Commands
+        already running finish, waiting commands start once fewer than the
+        new limit are running
+
+        :param concurrency: The maximum number of commands sent at once
+        """
+        self._concurrency = concurrency
+        self._wakeWaiters()
+
+    def paused(self, interceptionId: str) -> None:
+        """Records that the request was paused now
+
+        :param interceptionId: The Fetch requestId of the paused request
+        """
+        self._pausedAt[interceptionId] = self._loop.time()
+
+    def send(
+        self, interceptionId: Optional[str], method: str, params: Dict[str, Any]
+    ) -> Future:
+        """Sends the command resolving the paused request, returns a future
+        resolved with the result of the command
+
+        :param interceptionId: The Fetch requestId of the paused request
+        :param method: The command (e.g. Fetch.continueRequest)
+        :param params: The parameters of the command
+        """
+        return self.dispatch(interceptionId, method, self._client.send, method, params)
+
+    def apply(self, action: InterceptionAction, event: CDPEvent) -> Future:
+        """Applies the InterceptionAction to the paused request of the
+        Fetch.requestPaused event, returns a future resolved once it was applied
+
+        :param action: The InterceptionAction
+        :param event: The Fetch.requestPaused event
+        """
+        interceptionId = event.get("requestId")
+        return self._dispatch(
+            interceptionId,
+            action.__class__.__name__,
+            action.apply,
+            (self._client, event),
+            ("Fetch.continueRequest", {"requestId": interceptionId}),
+        )
+
+    def dispatch(
+        self,
+        interceptionId: Optional[str],
+        label: str,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Future:
+        """Runs fn(*args) once fewer than concurrency commands are in flight,
+        returns a future resolved with its result
+
+        :param interceptionId: The Fetch requestId of the paused request
+        :param label: The name errors are counted under
+        :param fn: The coroutine function resolving the paused request
+        :param args: The arguments fn is called with
+        """
+        return self._dispatch(interceptionId, label, fn, args, None)
+
+    def _dispatch(
+        self,
+        interceptionId: Optional[str],
+        label: str,
+        fn: Callable[..., Awaitable[Any]],
+        args: tuple,
+        fallback: Optional[Tuple[str, Dict[str, Any]]],
+    ) -> Future:
+        if self._closed:
+            future = self._loop.create_future()
+            future.set_exception(NetworkError(f"{label} after the page was closed"))
+            future.add_done_callback(self._taskDone)
+            return future
+        task = self._loop.create_task(
+            self._run(interceptionId, label, fn, args, fallback)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._taskDone)
+        return task
+
+    def close(self) -> None:
+        """Cancels every pending command, later commands fail"""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        self._pausedAt.clear()
+
+    def stats(self) -> StatsDict:
+        """Returns the number of commands waiting, running, completed, failed
+        (per command) and cancelled, the number of requests still paused and
+        the milliseconds the oldest has been paused for, and the pause
+        latency histogram"""
+        pausedAt = self._pausedAt.values()
+        oldest = None
+        if pausedAt:
+            oldest = (self._loop.time() - min(pausedAt)) * 1000
+        return {
+            "concurrency": self._concurrency,
+            "waiting": len(self._tasks) - self._running,
+            "running": self._running,
+            "completed": self._completed,
+            "errors": dict(self._errors),
+            "cancelled": self._cancelled,
+            "paused": len(pausedAt),
+            "oldestPaused": oldest,
+            "pauseLatency": self._latency.as_dict(),
+        }
+
+    async def _run(
+        self,
+        interceptionId: Optional[str],
+        label: str,
+        fn: Callable[..., Awaitable[Any]],
+        args: tuple,
+        fallback: Optional[Tuple[str, Dict[str, Any]]],
+    ) -> Any:
+        try:
+            await self._acquire()
+        except CancelledError:
+            self._cancelled += 1
+            raise
+        try:
+            result = await fn(*args)
+        except CancelledError:
+            self._cancelled += 1
+            raise
+        except Exception:
+            self._errors[label] = self._errors.get(label, 0) + 1
+            if fallback is not None:
+                await self._fallback(interceptionId, *fallback)
+            raise
+        else:
+            self._completed += 1
+            self._resolved(interceptionId)
+            return result
+        finally:
+            self._release()
+
+    async def _fallback(
+        self, interceptionId: Optional[str], method: str, params: Dict[str, Any]
+    ) -> None:
+        try:
+            await self._client.send(method, params)
+        except CancelledError:
+            raise
+        except Exception:
+            # the request stays paused and is reported by stats
+            self._errors[method] = self._errors.get(method, 0) + 1
+        else:
+            self._resolved(interceptionId)
+
+    def _resolved(self, interceptionId: Optional[str]) -> None:
+        pausedAt = self._pausedAt.pop(interceptionId)
+        if pausedAt is not None:
+            self._latency.record((self._loop.time() - pausedAt) * 1000)
+
+    async def _acquire(self) -> None:
+        if not self._waiters and self._running < self._concurrency:
+            self._running += 1
+            return
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the command was cancelled
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._wakeWaiters()
+
+    def _wakeWaiters(self) -> None:
+        while self._waiters and self._running < self._concurrency:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot is handed over so no new command can take it first
+                self._running += 1
+                waiter.set_result(None)
+
+    def _taskDone(self, task: Future) -> None:
+        self._tasks.discard(task)
+        # retrieve the exception so failures that nobody awaits are not logged
+        # as never retrieved, they are counted in the errors
+        if not task.cancelled():
+            task.exception()
+
+    def __str__(self) -> str:
+        return (
+            f"InterceptionDispatcher(concurrency={self._concurrency}, "
+            f"pending={len(self._tasks)}, paused={len(self._pausedAt)})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -12,21 +12,35 @@ from .helper import Helper
 if TYPE_CHECKING:
     from .execution_context import ExecutionContext  # noqa: F401
     from .frame_manager import FrameManager, Frame  # noqa: F401
+    from .handle_scope import HandleScope  # noqa: F401
     from .page import Page  # noqa: F401
 
 __all__ = ["JSHandle", "ElementHandle", "createJSHandle"]
 
 
 def createJSHandle(
-    context: "ExecutionContext", remoteObject: Dict
+    context: "ExecutionContext",
+    remoteObject: Dict,
+    scope: Optional["HandleScope"] = None,
 ) -> Union["ElementHandle", "JSHandle"]:
+    """Creates the JSHandle, or ElementHandle for nodes, of the remote object
+
+    :param context: The execution context the remote object belongs to
+    :param remoteObject: The Runtime.RemoteObject
+    :param scope: The HandleScope whose object group the remote object
+     belongs to, if any
+    """
     frame = context.frame
     if remoteObject.get("subtype") == "node" and frame:
         frameManager = frame._frameManager
-        return ElementHandle(
+        handle: JSHandle = ElementHandle(
             context, context._client, remoteObject, frameManager.page, frameManager
         )
-    return JSHandle(context, context._client, remoteObject)
+    else:
+        handle = JSHandle(context, context._client, remoteObject)
+    if scope is not None and remoteObject.get("objectId"):
+        scope.track(handle)
+    return handle
 
 
 class JSHandle:
@@ -36,6 +50,7 @@ class JSHandle:
         "_client",
         "_remoteObject",
         "_disposed",
+        "_scope",
     ]
 
     @classmethod
@@ -49,6 +64,7 @@ class JSHandle:
         self._client = client
         self._remoteObject = remoteObject
         self._disposed = False
+        self._scope: Optional["HandleScope"] = None
 
     @property
     def executionContext(self) -> "ExecutionContext":
@@ -98,7 +114,9 @@ class JSHandle:
         for prop in properties["result"]:
             if not prop.get("enumerable"):
                 continue
-            result[prop.get("name")] = createJSHandle(context, prop.get("value"))
+            result[prop.get("name")] = createJSHandle(
+                context, prop.get("value"), self._scope
+            )
         return result
 
     async def asArray(self) -> List["JSHandle"]:
@@ -130,6 +148,9 @@ class JSHandle:
         if self._disposed:
             return
         self._disposed = True
+        if self._scope is not None and not self._scope.released:
+            # released along with the object group of its scope
+            return
         await Helper.releaseObject(self._client, self._remoteObject)
 
     def _properties(self) -> Awaitable[Dict]:
@@ -146,7 +167,7 @@ class JSHandle:
             if not prop.get("enumerable"):
                 continue
             remote_obj = prop.get("value")
-            add_handle(createJSHandle(context, remote_obj))
+            add_handle(createJSHandle(context, remote_obj, self._scope))
         return handle_list
 
     def _element_list(self, properties: Dict) -> List["ElementHandle"]:
@@ -157,7 +178,7 @@ class JSHandle:
             if not prop.get("enumerable"):
                 continue
             remote_obj = prop.get("value")
-            add_handle(createJSHandle(context, remote_obj).asElement())
+            add_handle(createJSHandle(context, remote_obj, self._scope).asElement())
         return handle_list
 
     def __str__(self) -> str:
@@ -13,7 +13,7 @@ from asyncio import AbstractEventLoop
 from pathlib import Path
 from subprocess import DEVNULL, PIPE, Popen
 from tempfile import mkdtemp
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Pattern, Union
 
 from appdirs import AppDirs
 
@@ -24,7 +24,17 @@ from .connection import Connection, createForWebSocket
 from .errors import LauncherError
 from .helper import Helper
 
-__all__ = ["Launcher", "launch", "connect", "DEFAULT_ARGS"]
+__all__ = [
+    "Launcher",
+    "launch",
+    "connect",
+    "DEFAULT_ARGS",
+    "host_resolver_rules_arg",
+    "network_args",
+    "network_options",
+    "proxy_bypass_list_arg",
+    "proxy_server_arg",
+]
 
 DEFAULT_CHROMIUM_REVISION: str = "656675"
 CHROMIUM_REVISION: str = os.getenv(
@@ -65,6 +75,38 @@ DEFAULT_ARGS = [
 ]
 
 Options = Dict[str, Union[int, str, bool, List[str]]]
+HostResolverRules = Mapping[str, Optional[str]]
+ProxyServer = Union[str, Mapping[str, str]]
+
+#: Host patterns, ``*`` matches any characters
+HOST_PATTERN_RE: Pattern = re.compile(r"^[A-Za-z0-9*._\-]+$")
+#: Rule targets, a host or IP (IPv6 in brackets) with an optional port
+HOST_TARGET_RE: Pattern = re.compile(
+    r"^(?:\[[0-9A-Fa-f:.]+\]|[A-Za-z0-9._\-]+)(?::(?P<port>\d{1,5}))?$"
+)
+#: Proxies, a host or IP with an optional scheme and port
+PROXY_RE: Pattern = re.compile(
+    r"^(?:(?P<scheme>[a-z0-9]+)://)?"
+    r"(?:\[[0-9A-Fa-f:.]+\]|[A-Za-z0-9._\-]+)(?::(?P<port>\d{1,5}))?$"
+)
+#: The schemes of the proxies understood by Chrome
+PROXY_SCHEMES: List[str] = [
+    "direct",
+    "http",
+    "https",
+    "quic",
+    "socks",
+    "socks4",
+    "socks5",
+]
+#: The URL schemes a proxy can be chosen for
+PROXY_URL_SCHEMES: List[str] = ["ftp", "http", "https"]
+#: The switches built from the network options
+NETWORK_SWITCHES: Dict[str, str] = {
+    "hostResolverRules": "--host-resolver-rules",
+    "proxyServer": "--proxy-server",
+    "proxyBypassList": "--proxy-bypass-list",
+}
 
 
 def args_include(args: List[str], needle: str) -> bool:
@@ -100,6 +142,133 @@ def default_args(opts: Dict) -> List[str]:
     return chromeArgs
 
 
+def _valid_port(port: Optional[str]) -> bool:
+    return port is None or 0 < int(port) < 65536
+
+
+def host_resolver_rules_arg(rules: HostResolverRules) -> str:
+    """Returns the value of the --host-resolver-rules switch mapping each host
+    pattern to its target, e.g. ``{"*.example.com": "127.0.0.1:8080"}``
+    resolves every subdomain of example.com to port 8080 of localhost.
+    A target of ``~NOTFOUND`` makes the host unresolvable and None excludes
+    the host from every mapping rule, so it is resolved normally.
+
+    Mapping rules are applied first match wins in the order of the mapping,
+    so more specific patterns must come before the patterns they overlap,
+    e.g. ``{"ads.example.com": "~NOTFOUND", "*.example.com": "127.0.0.1"}``.
+
+    :param rules: Mapping of host pattern to target
+    """
+    built: List[str] = []
+    for pattern, target in rules.items():
+        if not isinstance(pattern, str) or not HOST_PATTERN_RE.match(pattern):
+            raise LauncherError(f"Invalid host resolver rule pattern: {pattern!r}")
+        if target is None:
+            built.append(f"EXCLUDE {pattern}")
+            continue
+        if target != "~NOTFOUND":
+            match = HOST_TARGET_RE.match(target) if isinstance(target, str) else None
+            if match is None or not _valid_port(match.group("port")):
+                raise LauncherError(
+                    f"Invalid host resolver rule target for {pattern}: {target!r}"
+                )
+        built.append(f"MAP {pattern} {target}")
+    return ", ".join(built)
+
+
+def _proxy(proxy: str) -> str:
+    match = PROXY_RE.match(proxy) if isinstance(proxy, str) else None
+    if (
+        match is None
+        or not _valid_port(match.group("port"))
+        or (match.group("scheme") or "http") not in PROXY_SCHEMES
+    ):
+        raise LauncherError(f"Invalid proxy server: {proxy!r}")
+    return proxy
+
+
+def proxy_server_arg(proxy: ProxyServer) -> str:
+    """Returns the value of the --proxy-server switch. Either a single proxy
+    (e.g. ``socks5://localhost:1080``) used for every URL or a mapping of URL
+    scheme (ftp, http or https) to the proxy used for URLs of that scheme
+
+    :param proxy: The proxy or mapping of URL scheme to proxy
+    """
+    if not isinstance(proxy, Mapping):
+        return _proxy(proxy)
+    built: List[str] = []
+    for scheme, schemeProxy in proxy.items():
+        if scheme not in PROXY_URL_SCHEMES:
+            raise LauncherError(f"Invalid proxy URL scheme: {scheme!r}")
+        built.append(f"{scheme}={_proxy(schemeProxy)}")
+    return ";".join(built)
+
+
+def proxy_bypass_list_arg(bypass: Iterable[str]) -> str:
+    """Returns the value of the --proxy-bypass-list switch, the hosts
+    (e.g. ``*.example.com``, ``127.0.0.1:8080`` or ``<local>``) whose URLs
+    are fetched without the proxy
+
+    :param bypass: The hosts whose URLs are fetched directly
+    """
+    if isinstance(bypass, str):
+        bypass = [bypass]
+    built: List[str] = []
+    for host in bypass:
+        if not isinstance(host, str) or not host or re.search(r"[;,\s]", host):
+            raise LauncherError(f"Invalid proxy bypass entry: {host!r}")
+        built.append(host)
+    return ";".join(built)
+
+
+def network_options(opts: Dict) -> Dict[str, Any]:
+    """Returns the hostResolverRules, proxyServer and proxyBypassList launch
+    options, absent options are None. Raises a LauncherError if an option
+    conflicts with the supplied args
+
+    :param opts: The launch options
+    """
+    rules = opts.get("hostResolverRules")
+    if rules is not None and not isinstance(rules, Mapping):
+        raise LauncherError("hostResolverRules must map host patterns to targets")
+    proxy = opts.get("proxyServer")
+    bypass = opts.get("proxyBypassList")
+    if bypass is not None and proxy is None:
+        raise LauncherError("proxyBypassList requires proxyServer")
+    if isinstance(bypass, str):
+        bypass = [bypass]
+    supplied_chrome_args = opts.get("args", [])
+    for option, switch in NETWORK_SWITCHES.items():
+        if opts.get(option) is not None and args_include(supplied_chrome_args, switch):
+            raise LauncherError(f"{option} conflicts with the supplied {switch} arg")
+    return {
+        "hostResolverRules": dict(rules) if rules is not None else None,
+        "proxyServer": dict(proxy) if isinstance(proxy, Mapping) else proxy,
+        "proxyBypassList": list(bypass) if bypass is not None else None,
+    }
+
+
+def network_args(opts: Dict) -> List[str]:
+    """Returns the --host-resolver-rules, --proxy-server and
+    --proxy-bypass-list switches built from the hostResolverRules,
+    proxyServer and proxyBypassList launch options
+
+    :param opts: The launch options
+    """
+    options = network_options(opts)
+    chromeArgs: List[str] = []
+    if options["hostResolverRules"]:
+        rules = host_resolver_rules_arg(options["hostResolverRules"])
+        chromeArgs.append(f"--host-resolver-rules={rules}")
+    if options["proxyServer"] is not None:
+        proxy = proxy_server_arg(options["proxyServer"])
+        chromeArgs.append(f"--proxy-server={proxy}")
+    if options["proxyBypassList"]:
+        bypass = proxy_bypass_list_arg(options["proxyBypassList"])
+        chromeArgs.append(f"--proxy-bypass-list={bypass}")
+    return chromeArgs
+
+
 class Launcher:
     __slots__ = [
         "projectRoot",
@@ -134,6 +303,7 @@ class Launcher:
             )
         else:
             chromeArguments.extend(opts.get("args", []))
+        chromeArguments.extend(network_args(opts))
 
         port = opts.get("port", "0")
         if not args_include(chromeArguments, "--remote-debugging-"):
@@ -195,6 +365,7 @@ class Launcher:
                 self.__kill_chrome,
                 targetInfo=targets.get("targetInfos", [None])[0],
                 loop=loop_,
+                networkOptions=network_options(opts),
             )
             await chrome.waitForTarget(lambda t: t.type == "page")
             return chrome
@@ -1,5 +1,5 @@
-from asyncio import Future, Task, TimeoutError
-from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING, Union
+from asyncio import Future, Task, TimeoutError, gather
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, TYPE_CHECKING, Union
 
 from async_timeout import timeout
 
@@ -7,6 +7,7 @@ from ._typings import Loop, OptionalLoop, OptionalNumber
 from .errors import NavigationError
 from .events import Events
 from .helper import EEListener, Helper
+from .settle import SettleCondition, SettleWatcher
 
 if TYPE_CHECKING:
     from .frame_manager import FrameManager, Frame  # noqa: F401
@@ -14,7 +15,7 @@ if TYPE_CHECKING:
     from .request_response import Request, Response  # noqa: F401
 
 
-__all__ = ["LifecycleWatcher"]
+__all__ = ["LifecycleWatcher", "TrackedLifecycleEvents"]
 
 WaitToProtocolLifecycle: Dict[str, str] = {
     "load": "load",
@@ -23,6 +24,12 @@ WaitToProtocolLifecycle: Dict[str, str] = {
     "networkidle2": "networkAlmostIdle",
 }
 
+#: The waitUntil value equivalent to SettleCondition()
+SETTLED: str = "settled"
+
+#: The protocol lifecycle events each frame keeps subtree completion counters for
+TrackedLifecycleEvents: FrozenSet[str] = frozenset(WaitToProtocolLifecycle.values())
+
 
 class LifecycleWatcher:
     __slots__ = [
@@ -40,6 +47,10 @@ class LifecycleWatcher:
         "_networkManager",
         "_newDocumentNavigationPromise",
         "_sameDocumentNavigationPromise",
+        "_settleTask",
+        "_settleWatchers",
+        "_settledLoaderId",
+        "_settlingLoaderId",
         "_terminationPromise",
         "_timeout",
         "_timeoutPromise",
@@ -68,6 +79,10 @@ class LifecycleWatcher:
         self._initialLoaderId: str = self._frame._loaderId
         self._expectedLifecycle: List[str] = []
         self._hasSameDocumentNavigation: bool = False
+        self._settleWatchers: List[SettleWatcher] = []
+        self._settleTask: Optional[Task] = None
+        self._settledLoaderId: Optional[str] = None
+        self._settlingLoaderId: Optional[str] = None
         self._build_expected_lifecyle()
         self._eventListeners: List[EEListener] = [
             Helper.addEventListener(
@@ -82,8 +97,8 @@ class LifecycleWatcher:
             ),
             Helper.addEventListener(
                 self._frameManager,
-                Events.FrameManager.LifecycleEvent,
-                self._checkLifecycleComplete,
+                Events.FrameManager.LifecycleSatisfied,
+                self._onLifecycleSatisfied,
             ),
             Helper.addEventListener(
                 self._frameManager,
@@ -130,6 +145,19 @@ class LifecycleWatcher:
     def lifecyclePromise(self) -> Future:
         return self._lifecyclePromise
 
+    @property
+    def tracksCallbacks(self) -> bool:
+        """Does a settle condition waited for check the pending timers or
+        animation frames"""
+        return any(
+            settleWatcher._condition.tracks_callbacks
+            for settleWatcher in self._settleWatchers
+        )
+
+    @property
+    def navigationRequest(self) -> Optional["Request"]:
+        return self._navigationRequest
+
     @property
     def navigationResponse(self) -> Optional["Response"]:
         if self._navigationRequest:
@@ -138,6 +166,10 @@ class LifecycleWatcher:
 
     def dispose(self) -> None:
         Helper.removeEventListeners(self._eventListeners)
+        if self._settleTask is not None and not self._settleTask.done():
+            self._settleTask.cancel()
+        for settleWatcher in self._settleWatchers:
+            settleWatcher.dispose()
         Helper.cleanup_futures(
             self._terminationPromise,
             self._timeoutPromise,
@@ -146,8 +178,16 @@ class LifecycleWatcher:
             self._newDocumentNavigationPromise,
         )
 
+    def _onLifecycleSatisfied(self, frame: "Frame") -> None:
+        if frame is self._frame:
+            self._checkLifecycleComplete()
+
     def _checkLifecycleComplete(self, *args: Any, **kwargs: Any) -> None:
-        if not self._checkLifecycle(self._frame, self._expectedLifecycle):
+        if not self._frame._lifecycleComplete(
+            self._expectedLifecycle, self._all_frames
+        ):
+            return
+        if not self._isSettled():
             return
         if not self._lifecyclePromise.done():
             self._lifecyclePromise.set_result(None)
@@ -167,15 +207,39 @@ class LifecycleWatcher:
         ):
             self._newDocumentNavigationPromise.set_result(None)
 
-    def _checkLifecycle(self, frame: "Frame", expectedLifecycle: List[str]) -> bool:
-        for event in expectedLifecycle:
-            if event not in frame._lifecycleEvents:
-                return False
-        if self._all_frames:
-            for child in frame.childFrames:
-                if not self._checkLifecycle(child, expectedLifecycle):
-                    return False
-        return True
+    def _isSettled(self) -> bool:
+        """Returns T/F indicating if the frame's current document has settled,
+        starting to wait for it to settle when it has not"""
+        if not self._settleWatchers:
+            return True
+        loaderId = self._frame._loaderId
+        if self._settledLoaderId == loaderId:
+            return True
+        if self._settlingLoaderId != loaderId:
+            if self._settleTask is not None and not self._settleTask.done():
+                self._settleTask.cancel()
+            self._settlingLoaderId = loaderId
+            self._settleTask = self._loop.create_task(self._settle(loaderId))
+        return False
+
+    async def _settle(self, loaderId: str) -> None:
+        try:
+            await gather(
+                *[settleWatcher.wait() for settleWatcher in self._settleWatchers],
+                loop=self._loop,
+            )
+        except Exception as e:
+            self._terminate(
+                NavigationError.Failed(
+                    f"Waiting for the frame to settle failed: {e}",
+                    response=self.navigationResponse,
+                )
+            )
+            return
+        if self._frame._loaderId != loaderId:
+            return
+        self._settledLoaderId = loaderId
+        self._checkLifecycleComplete()
 
     def _terminate(self, error: Exception) -> None:
         if not self._terminationPromise.done():
@@ -188,8 +252,6 @@ class LifecycleWatcher:
                     "Navigating frame was detached", response=self.navigationResponse
                 )
             )
-            return
-        self._checkLifecycleComplete()
 
     def _navigatedWithinDocument(self, frame: "Frame") -> None:
         if frame is not self._frame:
@@ -223,15 +285,28 @@ class LifecycleWatcher:
         waitUntil = self._waitUntil
         if isinstance(waitUntil, list):
             waitUntil = waitUntil
-        elif isinstance(waitUntil, str):
+        elif isinstance(waitUntil, (str, SettleCondition)):
             waitUntil = [waitUntil]
         else:
             waitUntil = ["load"]
+        settleConditions: List[SettleCondition] = []
         for value in waitUntil:
+            if value == SETTLED:
+                value = SettleCondition()
+            if isinstance(value, SettleCondition):
+                settleConditions.append(value)
+                continue
             protocolEvent = WaitToProtocolLifecycle.get(value)
             if protocolEvent is None:
                 raise ValueError(f"Unknown value for options.waitUntil: {value}")
             self._expectedLifecycle.append(protocolEvent)
+        if settleConditions and not self._expectedLifecycle:
+            # settling is only checked for once the document has loaded
+            self._expectedLifecycle.append(WaitToProtocolLifecycle["load"])
+        for condition in settleConditions:
+            self._settleWatchers.append(
+                condition.watcher(self._frame, self._networkManager, self._loop)
+            )
 
     def __str__(self) -> str:
         info = f"all_frames={self._all_frames}, waitUntil={self._waitUntil}, timeout={self._timeout}"
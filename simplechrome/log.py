@@ -1,4 +1,4 @@
-from asyncio import AbstractEventLoop
+from asyncio import AbstractEventLoop, gather
 from typing import Dict, List, Optional, Union
 
 from pyee2 import EventEmitterS
@@ -94,8 +94,10 @@ class Log(EventEmitterS):
         self.emit(LogEvents.EntryAdded, LogEntry(entry))
 
     async def _release_log_args(self, args: List[Dict]) -> None:
-        for arg in args:
-            await Helper.releaseObject(self._client, arg)
+        await gather(
+            *[Helper.releaseObject(self._client, arg) for arg in args],
+            loop=self._loop,
+        )
 
     def __str__(self) -> str:
         return f"Log(enabled={self._enabled}, reporting_violations={self._reporting_violations})"
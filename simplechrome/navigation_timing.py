@@ -0,0 +1,167 @@
+from typing import Dict, Optional, TYPE_CHECKING, Union
+
+from ._typings import Number, SlotsT
+
+if TYPE_CHECKING:
+    from .frame_manager import Frame  # noqa: F401
+    from .request_response import Request, Response  # noqa: F401
+
+__all__ = ["NavigationTiming"]
+
+
+class NavigationTiming:
+    """Timing information for a single navigation of a frame.
+
+    Combines the lifecycle event timestamps of the document the navigation
+    committed with the timing of its navigation request. All timestamps other
+    than ``wallTime`` are protocol monotonic times in seconds. Lifecycle events
+    that fire after the navigation resolved (e.g. networkIdle when only waiting
+    for load) are added to the record until the frame starts a new document.
+    """
+
+    __slots__: SlotsT = ["_frameId", "_lifecycle", "_loaderId", "_request", "_url"]
+
+    def __init__(
+        self,
+        frame: "Frame",
+        request: Optional["Request"] = None,
+        lifecycle: Optional[Dict[str, Number]] = None,
+    ) -> None:
+        """Initialize a new NavigationTiming
+
+        :param frame: The frame that was navigated
+        :param request: The navigation request, if the navigation made one
+        :param lifecycle: The lifecycle timestamps of the navigated document
+        """
+        self._frameId: str = frame.id
+        self._url: str = frame.url
+        self._loaderId: str = frame._loaderId
+        self._request: Optional["Request"] = request
+        self._lifecycle: Dict[str, Number] = lifecycle if lifecycle is not None else {}
+
+    @property
+    def frameId(self) -> str:
+        """Id of the navigated frame"""
+        return self._frameId
+
+    @property
+    def url(self) -> str:
+        """The URL the frame was navigated to"""
+        return self._url
+
+    @property
+    def loaderId(self) -> str:
+        """Id of the navigated document's loader"""
+        return self._loaderId
+
+    @property
+    def request(self) -> Optional["Request"]:
+        """The navigation request"""
+        return self._request
+
+    @property
+    def response(self) -> Optional["Response"]:
+        """The navigation response"""
+        if self._request is not None:
+            return self._request.response
+        return None
+
+    @property
+    def lifecycle(self) -> Dict[str, Number]:
+        """Mapping of lifecycle event name to the time it fired"""
+        return self._lifecycle
+
+    @property
+    def wallTime(self) -> Optional[float]:
+        """Wall clock time the first request of the redirect chain was sent at"""
+        first = self._firstRequest()
+        if first is not None:
+            return first.wallTime
+        return None
+
+    @property
+    def startTime(self) -> Optional[Number]:
+        """Time the first request of the redirect chain was sent at, or
+        the time of the init lifecycle event if there was no request"""
+        first = self._firstRequest()
+        if first is not None and first.timeStamp is not None:
+            return first.timeStamp
+        return self._lifecycle.get("init")
+
+    @property
+    def requestTime(self) -> Optional[Number]:
+        """Time the final request of the redirect chain was sent at"""
+        if self._request is not None:
+            return self._request.timeStamp
+        return None
+
+    @property
+    def responseTime(self) -> Optional[Number]:
+        """Time the navigation response was received at"""
+        response = self.response
+        if response is not None:
+            return response.timestamp
+        return None
+
+    @property
+    def redirectCount(self) -> int:
+        """Number of redirects followed before the final request"""
+        if self._request is not None:
+            return len(self._request.redirectChain)
+        return 0
+
+    @property
+    def encodedDataLength(self) -> Optional[float]:
+        """Number of bytes received for the navigation response"""
+        response = self.response
+        if response is not None:
+            return response.encodedDataLength
+        return None
+
+    def elapsed(self, name: str) -> Optional[Number]:
+        """Returns the number of seconds between the start of the navigation
+        and the time the lifecycle event `name` fired (or `response`
+        for the response), None if it has not fired
+
+        :param name: The name of the lifecycle event
+        """
+        start = self.startTime
+        if name == "response":
+            at = self.responseTime
+        else:
+            at = self._lifecycle.get(name)
+        if start is None or at is None:
+            return None
+        return at - start
+
+    def as_dict(self) -> Dict[str, Union[str, Number, Dict, None]]:
+        """Returns the timing record as a plain dictionary"""
+        start = self.startTime
+        lifecycle: Dict[str, Optional[Number]] = {}
+        for name, at in self._lifecycle.items():
+            lifecycle[name] = at - start if start is not None else None
+        return {
+            "frameId": self._frameId,
+            "url": self._url,
+            "loaderId": self._loaderId,
+            "wallTime": self.wallTime,
+            "startTime": start,
+            "requestTime": self.requestTime,
+            "responseTime": self.responseTime,
+            "responseElapsed": self.elapsed("response"),
+            "redirectCount": self.redirectCount,
+            "encodedDataLength": self.encodedDataLength,
+            "lifecycle": lifecycle,
+        }
+
+    def _firstRequest(self) -> Optional["Request"]:
+        if self._request is None:
+            return None
+        chain = self._request.redirectChain
+        return chain[0] if chain else self._request
+
+    def __str__(self) -> str:
+        return f"NavigationTiming(url={self._url}, frameId={self._frameId}, redirectCount={self.redirectCount})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
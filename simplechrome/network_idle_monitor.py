@@ -1,60 +1,151 @@
-from asyncio import CancelledError, Future, Task, TimeoutError, sleep
-from typing import Any, Dict, List, Optional, Set
+from asyncio import Future, Handle, Task
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    TYPE_CHECKING,
+)
 
-from async_timeout import timeout
 from pyee2 import EventEmitterS
 
-from ._typings import OptionalLoop, SlotsT
+from ._typings import Number, OptionalLoop, OptionalNumber, SlotsT
 from .connection import ClientType
 from .helper import EEListener, Helper
+from .interception import globs_to_regex
+
+if TYPE_CHECKING:
+    from .frame_manager import Frame  # noqa: F401
 
 __all__ = ["NetworkIdleMonitor"]
 
+#: The values of the scope of a frame scoped monitor
+FRAME_SCOPES: Set[str] = {"self", "subtree"}
+#: The resource types whose requests are ignored by default. WebSockets and
+#: event streams stay open for the lifetime of the page and pings (beacons
+#: and ``<a ping>``) are fire and forget
+DEFAULT_IGNORED_TYPES: FrozenSet[str] = frozenset({"EventSource", "Ping", "WebSocket"})
+#: The default seconds after which a network that saw no request is idle
+DEFAULT_SAFETY_WINDOW: Number = 5
+
 
 class NetworkIdleMonitor(EventEmitterS):
     """Monitors the network requests of the remote browser to determine when
-    network idle happens"""
+    network idle happens.
+
+    When given a frame only the requests made by that frame (scope ``self``)
+    or by the frame and its descendants (scope ``subtree``) are considered.
+    Requests of an ignored resource type (e.g. EventSource, Ping) or whose URL
+    matches an ignored URL pattern (e.g. a long-poll endpoint) are never
+    considered.
+
+    The idle, safety and global wait timers are ``loop.call_later`` handles.
+    The idle timer is not cancelled when a request starts, it records when the
+    network became quiet and on firing either emits idle or re-arms itself for
+    the remainder, so at most one timer is pending regardless of how many
+    requests a busy page makes.
+
+    The task returned by :meth:`create_idle_future` resolves to :meth:`stats`.
+    """
 
     __slots__: SlotsT = [
         "__weakref__",
         "_client",
+        "_frame",
+        "_global_handle",
         "_global_wait",
         "_idle_future",
+        "_idle_handle",
         "_idle_time",
+        "_ignored",
+        "_ignored_types",
+        "_ignored_urls",
         "_listeners",
+        "_max_inflight",
         "_num_inflight",
+        "_quiet_since",
+        "_reached",
         "_requestIds",
-        "_safety_task",
-        "_to",
+        "_requests",
+        "_resets",
+        "_safety_handle",
+        "_safety_window",
+        "_scope",
+        "_started_at",
     ]
 
     def __init__(
         self,
         client: ClientType,
         num_inflight: int = 2,
-        idle_time: int = 2,
-        global_wait: int = 60,
+        idle_time: Number = 2,
+        global_wait: Number = 60,
         loop: OptionalLoop = None,
+        frame: Optional["Frame"] = None,
+        scope: str = "self",
+        safety_window: OptionalNumber = DEFAULT_SAFETY_WINDOW,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
     ) -> None:
+        """Initialize a new NetworkIdleMonitor
+
+        :param client: The client whose Network events are monitored
+        :param num_inflight: The number of requests that may be in flight
+         while the network is idle
+        :param idle_time: Seconds the network must be idle for
+        :param global_wait: Maximum seconds to wait for network idle
+        :param loop: Optional asyncio event loop to use
+        :param frame: Optional frame whose requests are considered
+        :param scope: The scope of a frame scoped monitor, self or subtree
+        :param safety_window: Seconds after which the network is idle if no
+         request was made, None to disable
+        :param ignored_types: The resource types of requests never considered
+        :param ignored_urls: URL globs of requests never considered, ``*``
+         matches zero or more characters and ``?`` exactly one
+        """
+        if frame is not None and scope not in FRAME_SCOPES:
+            raise ValueError(f"Unknown network idle scope: {scope}")
         super().__init__(loop=Helper.ensure_loop(loop))
         self._client: ClientType = client
+        self._frame: Optional["Frame"] = frame
+        self._scope: str = scope
         self._requestIds: Set[str] = set()
         self._num_inflight: int = num_inflight
-        self._idle_time: int = idle_time
-        self._global_wait: int = global_wait
-        self._to: Optional[Task] = None
-        self._safety_task: Optional[Task] = None
+        self._idle_time: Number = idle_time
+        self._global_wait: Number = global_wait
+        self._safety_window: OptionalNumber = safety_window
+        self._ignored_types: FrozenSet[str] = frozenset(ignored_types or ())
+        self._ignored_urls: Optional[Pattern] = globs_to_regex(ignored_urls or ())
+        self._idle_handle: Optional[Handle] = None
+        self._safety_handle: Optional[Handle] = None
+        self._global_handle: Optional[Handle] = None
+        self._quiet_since: OptionalNumber = None
         self._idle_future: Optional[Future] = None
         self._listeners: Optional[List[EEListener]] = None
+        self._started_at: OptionalNumber = None
+        self._reached: Optional[str] = None
+        self._requests: int = 0
+        self._ignored: int = 0
+        self._resets: int = 0
+        self._max_inflight: int = 0
 
     @classmethod
     def monitor(
         cls,
         client: ClientType,
         num_inflight: int = 2,
-        idle_time: int = 2,
-        global_wait: int = 60,
+        idle_time: Number = 2,
+        global_wait: Number = 60,
         loop: OptionalLoop = None,
+        frame: Optional["Frame"] = None,
+        scope: str = "self",
+        safety_window: OptionalNumber = DEFAULT_SAFETY_WINDOW,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
     ) -> Task:
         niw = cls(
             client=client,
@@ -62,6 +153,11 @@ class NetworkIdleMonitor(EventEmitterS):
             idle_time=idle_time,
             global_wait=global_wait,
             loop=loop,
+            frame=frame,
+            scope=scope,
+            safety_window=safety_window,
+            ignored_types=ignored_types,
+            ignored_urls=ignored_urls,
         )
         return niw.create_idle_future()
 
@@ -76,24 +172,49 @@ class NetworkIdleMonitor(EventEmitterS):
         self.once("idle", self.idle_cb)
         return self._loop.create_task(self._global_to_wait())
 
-    def idle_cb(self) -> None:
-        """Sets the idle future results to done"""
-        if not self._idle_future.done():
+    def idle_cb(self, reason: str = "idle") -> None:
+        """Sets the idle future results to done
+
+        :param reason: How idle was reached, idle, safety or globalWait
+        """
+        if self._idle_future is not None and not self._idle_future.done():
+            self._reached = reason
             self._idle_future.set_result(True)
 
     def clean_up(self, *args: Any, **kwargs: Any) -> None:
         """Cleans up after ourselves"""
         if self._listeners is not None:
             Helper.removeEventListeners(self._listeners)
-        if self._safety_task is not None and not self._safety_task.done():
-            self._safety_task.cancel()
-        if self._to is not None and not self._to.done():
-            self._to.cancel()
+            self._listeners = None
+        for handle in (self._idle_handle, self._safety_handle, self._global_handle):
+            if handle is not None:
+                handle.cancel()
+        self._idle_handle = None
+        self._safety_handle = None
+        self._global_handle = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how idle was reached (idle, safety or globalWait, None if
+        not yet), the seconds it took, the number of requests considered and
+        ignored, the most considered in flight at once and the number of times
+        the network stopped being idle before idle was reached"""
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = self._loop.time() - self._started_at
+        return {
+            "reached": self._reached,
+            "elapsed": elapsed,
+            "requests": self._requests,
+            "ignored": self._ignored,
+            "maxInflight": self._max_inflight,
+            "resets": self._resets,
+        }
 
-    async def _global_to_wait(self) -> None:
+    async def _global_to_wait(self) -> Dict[str, Any]:
         """Coroutine that waits for the idle future to resolve or
         global wait time to be hit
         """
+        self._started_at = self._loop.time()
         self._idle_future.add_done_callback(self.clean_up)
         self._listeners = [
             Helper.addEventListener(
@@ -106,50 +227,120 @@ class NetworkIdleMonitor(EventEmitterS):
                 self._client, "Network.loadingFailed", self.req_finished
             ),
         ]
-
+        self._global_handle = self._loop.call_later(
+            self._global_wait, self.idle_cb, "globalWait"
+        )
+        if self._safety_window is not None:
+            self._safety_handle = self._loop.call_later(
+                self._safety_window, self.idle_cb, "safety"
+            )
+        if self._frame is not None:
+            # frame scoped monitors know the requests already in flight
+            # so they can start counting down right away
+            self._seed_inflight()
+            if len(self._requestIds) <= self._num_inflight:
+                self._quiet()
         try:
-            self._safety_task = self._loop.create_task(self.safety())
-            async with timeout(self._global_wait, loop=self._loop):
-                await self._idle_future
-        except TimeoutError:
+            await self._idle_future
+        finally:
+            self.clean_up()
+            self._requestIds.clear()
+        if self._reached != "idle":
             self.emit("idle")
+        return self.stats()
 
-        self._requestIds.clear()
-        if self._to is not None and not self._to.done():
-            self._to.cancel()
-            try:
-                async with timeout(10, loop=self._loop):
-                    await self._to
-            except (TimeoutError, CancelledError):
-                pass
-            self._to = None
-
-    async def safety(self) -> None:
-        """Guards against waiting the full global wait time if the network was idle and stays idle"""
-        await sleep(5, loop=self._loop)
-        if self._idle_future and not self._idle_future.done():
-            self._idle_future.set_result(True)
+    def _quiet(self) -> None:
+        """Records that the network became idle now and arms the idle timer
+        if it is not already armed"""
+        self._quiet_since = self._loop.time()
+        if self._idle_handle is None:
+            self._idle_handle = self._loop.call_later(self._idle_time, self._idle_due)
 
-    async def _start_timeout(self) -> None:
-        """Starts the idle time wait and if this Coroutine is not canceled
-        and the idle time elapses the idle event is emitted signifying
-        network idle has been reached
-        """
-        await sleep(self._idle_time, loop=self._loop)
+    def _idle_due(self) -> None:
+        self._idle_handle = None
+        if self._quiet_since is None:
+            # the network stopped being idle, re-armed once it is idle again
+            return
+        remaining = self._quiet_since + self._idle_time - self._loop.time()
+        if remaining > 0:
+            self._idle_handle = self._loop.call_later(remaining, self._idle_due)
+            return
         self.emit("idle")
 
+    def tracks_frame(self, frameId: Optional[str]) -> bool:
+        """Returns T/F indicating if requests made by the frame with the
+        supplied id are considered by this monitor
+
+        :param frameId: The id of the frame that made the request
+        """
+        if self._frame is None:
+            return True
+        if frameId is None:
+            return False
+        if frameId == self._frame.id:
+            return True
+        if self._scope != "subtree":
+            return False
+        frame = self._frame._frameManager.frame(frameId)
+        while frame is not None:
+            if frame is self._frame:
+                return True
+            frame = frame.parentFrame
+        return False
+
+    def is_ignored(self, resourceType: Optional[str], url: Optional[str]) -> bool:
+        """Returns T/F indicating if requests of the resource type to the URL
+        are never considered by this monitor
+
+        :param resourceType: The resource type of the request
+        :param url: The URL of the request
+        """
+        if resourceType in self._ignored_types:
+            return True
+        return (
+            self._ignored_urls is not None
+            and url is not None
+            and self._ignored_urls.match(url) is not None
+        )
+
+    def _seed_inflight(self) -> None:
+        networkManager = self._frame._frameManager._networkManager
+        if networkManager is None:
+            return
+        for request in networkManager.inflight():
+            if self.tracks_frame(request.frameId) and not self.is_ignored(
+                request.resourceType, request.url
+            ):
+                self._requestIds.add(request.requestId)
+        self._max_inflight = len(self._requestIds)
+        if self._requestIds and self._safety_handle is not None:
+            # requests were made, the safety window no longer applies
+            self._safety_handle.cancel()
+            self._safety_handle = None
+
     def req_started(self, info: Dict) -> None:
         """Listener for the Network.requestWillBeSent events
 
         :param info: The request info supplied by the CDP
         """
-        self._requestIds.add(info["requestId"])
-        if len(self._requestIds) > self._num_inflight and self._to:
-            self._to.cancel()
-            self._to = None
-        if self._safety_task is not None:
-            self._safety_task.cancel()
-            self._safety_task = None
+        if not self.tracks_frame(info.get("frameId")):
+            return
+        if self.is_ignored(info.get("type"), info.get("request", {}).get("url")):
+            self._ignored += 1
+            return
+        requestId = info["requestId"]
+        if requestId not in self._requestIds:
+            self._requests += 1
+            self._requestIds.add(requestId)
+        inflight = len(self._requestIds)
+        if inflight > self._max_inflight:
+            self._max_inflight = inflight
+        if inflight > self._num_inflight and self._quiet_since is not None:
+            self._quiet_since = None
+            self._resets += 1
+        if self._safety_handle is not None:
+            self._safety_handle.cancel()
+            self._safety_handle = None
 
     def req_finished(self, info: Dict) -> None:
         """Listener for the Network.loadingFinished and
@@ -157,8 +348,16 @@ class NetworkIdleMonitor(EventEmitterS):
 
         :param info: The request info supplied by the CDP
         """
-        rid = info["requestId"]
-        if rid in self._requestIds:
-            self._requestIds.remove(rid)
-        if len(self._requestIds) <= self._num_inflight and self._to is None:
-            self._to = self._loop.create_task(self._start_timeout())
+        self._requestIds.discard(info["requestId"])
+        if len(self._requestIds) <= self._num_inflight and self._quiet_since is None:
+            self._quiet()
+
+    def __str__(self) -> str:
+        return (
+            f"NetworkIdleMonitor(num_inflight={self._num_inflight}, "
+            f"idle_time={self._idle_time}, inflight={len(self._requestIds)}, "
+            f"reached={self._reached})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -1,21 +1,78 @@
 """Network Manager module."""
 
 import asyncio
-from typing import Any, Awaitable, Dict, List, Optional, Set
+from typing import Any, Awaitable, Dict, FrozenSet, Iterable, List, Optional, Set
 
 from pyee2 import EventEmitterS
 
-from ._typings import CDPEvent, HTTPHeaders, OptionalLoop, SlotsT
+from ._typings import (
+    CDPEvent,
+    HTTPHeaders,
+    Number,
+    OptionalLoop,
+    OptionalNumber,
+    SlotsT,
+)
+from .body_capture import (
+    BodyCapture,
+    BodyCapturePolicy,
+    BodyFetchResult,
+    BodyFilter,
+    BodySink,
+    fetch_bodies,
+)
 from .connection import ClientType
 from .cookie import Cookie
 from .events import Events
-from .frame_manager import FrameManager
+from .frame_manager import Frame, FrameManager
 from .helper import Helper
-from .network_idle_monitor import NetworkIdleMonitor
+from .interception import InterceptionRule, InterceptionRuleSet
+from .interception_dispatcher import InterceptionDispatcher
+from .network_idle_monitor import (
+    DEFAULT_IGNORED_TYPES,
+    DEFAULT_SAFETY_WINDOW,
+    NetworkIdleMonitor,
+)
+from .network_records import ResponseEventRecord
+from .network_stats import NetworkStats
 from .request_response import Request, Response
+from .request_table import RequestTable
 
 __all__ = ["NetworkManager"]
 
+#: The default maximum number of requests tracked at once
+DEFAULT_MAX_REQUESTS: int = 10000
+#: The default maximum number of requests waiting to be matched with
+#: their Fetch.requestPaused or Network.requestWillBeSent event
+DEFAULT_MAX_PENDING: int = 1000
+#: The default number of seconds a request waits to be matched
+DEFAULT_PENDING_TTL: OptionalNumber = 60
+#: The default maximum number of finished responses retained for fetch_bodies
+DEFAULT_MAX_FINISHED: int = 1000
+
+#: The values of Network.ResourceType
+RESOURCE_TYPES: FrozenSet[str] = frozenset(
+    {
+        "CSPViolationReport",
+        "Document",
+        "EventSource",
+        "Fetch",
+        "Font",
+        "Image",
+        "Manifest",
+        "Media",
+        "Other",
+        "Ping",
+        "Preflight",
+        "Script",
+        "SignedExchange",
+        "Stylesheet",
+        "TextTrack",
+        "WebSocket",
+        "XHR",
+    }
+)
+
 
 class NetworkManager(EventEmitterS):
     """NetworkManager class."""
@@ -25,6 +82,7 @@ class NetworkManager(EventEmitterS):
         "_client",
         "_frameManager",
         "_requestIdToRequest",
+        "_finishedResponses",
         "_interceptionIdToRequest",
         "_requestIdToRequestWillBeSentEvent",
         "_extraHTTPHeaders",
@@ -33,12 +91,22 @@ class NetworkManager(EventEmitterS):
         "_offline",
         "_attemptedAuthentications",
         "_userRequestInterceptionEnabled",
+        "_userResponseInterceptionEnabled",
         "_protocolRequestInterceptionEnabled",
+        "_protocolResponseInterceptionEnabled",
         "_requestIdToInterceptionId",
         "_userCacheDisabled",
         "_sw_bypass",
         "_userAgent",
         "_ignoreHTTPSErrors",
+        "_bodyCapture",
+        "_interceptionRules",
+        "_protocolFetchPatterns",
+        "_compactRecords",
+        "_networkStats",
+        "_dispatcher",
+        "_blockedResourceTypes",
+        "_blockedURLPatterns",
     ]
 
     def __init__(
@@ -55,16 +123,40 @@ class NetworkManager(EventEmitterS):
         self._userCacheDisabled: bool = False
         self._userRequestInterceptionEnabled: bool = False
         self._protocolRequestInterceptionEnabled: bool = False
-        self._requestIdToRequest: Dict[str, Request] = {}
+        self._userResponseInterceptionEnabled: bool = False
+        self._protocolResponseInterceptionEnabled: bool = False
+        self._requestIdToRequest: RequestTable = RequestTable(
+            max_size=DEFAULT_MAX_REQUESTS, loop=self._loop
+        )
+        # requestId -> Response whose loading finished, for fetch_bodies
+        self._finishedResponses: RequestTable = RequestTable(
+            max_size=DEFAULT_MAX_FINISHED, loop=self._loop
+        )
         self._interceptionIdToRequest: Dict[str, Request] = {}
         self._extraHTTPHeaders: HTTPHeaders = {}
         self._credentials: Optional[Dict[str, str]] = None
         self._attemptedAuthentications: Set[str] = set()
-        self._requestIdToRequestWillBeSentEvent: Dict[str, Dict] = {}
-        self._requestIdToInterceptionId: Dict[str, str] = {}
+        self._requestIdToRequestWillBeSentEvent: RequestTable = RequestTable(
+            DEFAULT_PENDING_TTL, DEFAULT_MAX_PENDING, loop=self._loop
+        )
+        self._requestIdToInterceptionId: RequestTable = RequestTable(
+            DEFAULT_PENDING_TTL, DEFAULT_MAX_PENDING, loop=self._loop
+        )
         self._userAgent: Optional[str] = None
         self._sw_bypass: bool = False
         self._ignoreHTTPSErrors: bool = ignoreHTTPSErrors
+        self._bodyCapture: Optional[BodyCapture] = None
+        self._interceptionRules: Optional[InterceptionRuleSet] = None
+        self._protocolFetchPatterns: List[Dict[str, str]] = []
+        self._compactRecords: bool = False
+        self._networkStats: NetworkStats = NetworkStats(
+            max_size=DEFAULT_MAX_REQUESTS, loop=self._loop
+        )
+        self._dispatcher: InterceptionDispatcher = InterceptionDispatcher(
+            client, loop=self._loop
+        )
+        self._blockedResourceTypes: FrozenSet[str] = frozenset()
+        self._blockedURLPatterns: List[str] = []
 
         self._client.on("Network.requestWillBeSent", self._onRequestWillBeSent)
         self._client.on(
@@ -73,8 +165,10 @@ class NetworkManager(EventEmitterS):
         self._client.on("Network.responseReceived", self._onResponseReceived)
         self._client.on("Network.loadingFinished", self._onLoadingFinished)
         self._client.on("Network.loadingFailed", self._onLoadingFailed)
+        self._client.on("Network.dataReceived", self._networkStats.dataReceived)
         self._client.on("Fetch.requestPaused", self._onRequestPaused)
         self._client.on("Fetch.authRequired", self._onAuthRequired)
+        self._client.on("Page.frameNavigated", self._onFrameNavigated)
 
     @property
     def service_workers_bypassed(self) -> bool:
@@ -85,19 +179,161 @@ class NetworkManager(EventEmitterS):
         return self._userCacheDisabled
 
     def network_idle_promise(
-        self, num_inflight: int = 2, idle_time: int = 2, global_wait: int = 60
-    ) -> Awaitable[None]:
+        self,
+        num_inflight: int = 2,
+        idle_time: Number = 2,
+        global_wait: Number = 60,
+        safety_window: OptionalNumber = DEFAULT_SAFETY_WINDOW,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
+    ) -> Awaitable[Dict[str, Any]]:
         return NetworkIdleMonitor.monitor(
             self._client,
             num_inflight=num_inflight,
             idle_time=idle_time,
             global_wait=global_wait,
             loop=self._loop,
+            safety_window=safety_window,
+            ignored_types=ignored_types,
+            ignored_urls=ignored_urls,
         )
 
     def setFrameManager(self, frameManager: "FrameManager") -> None:
         self._frameManager = frameManager
 
+    def inflight(self, frame: Optional["Frame"] = None) -> List[Request]:
+        """Returns the requests that have been sent but have not
+        finished or failed yet
+
+        :param frame: Optional frame whose requests are returned
+        """
+        requests = self._requestIdToRequest.values()
+        if frame is None:
+            return requests
+        return [request for request in requests if request.frameId == frame.id]
+
+    def finished(self, frame: Optional["Frame"] = None) -> List[Response]:
+        """Returns the retained responses whose loading finished, oldest first.
+        Responses are retained until their frame commits a new document or
+        the number retained exceeds the limit set by
+        :meth:`setRequestTableLimits`
+
+        :param frame: Optional frame whose responses are returned
+        """
+        responses = self._finishedResponses.values()
+        if frame is None:
+            return responses
+        return [
+            response for response in responses if response.request.frameId == frame.id
+        ]
+
+    def fetch_bodies(
+        self,
+        filter: Optional[BodyFilter] = None,
+        concurrency: int = 8,
+        sink: Optional[BodySink] = None,
+    ) -> Awaitable[BodyFetchResult]:
+        """Retrieves the bodies of the retained responses matching filter,
+        at most concurrency at once, see :func:`fetch_bodies`
+
+        :param filter: A BodyCapturePolicy or a function returning T/F indicating
+         if the body of the response should be retrieved
+        :param concurrency: The maximum number of bodies retrieved at once
+        :param sink: Optional function receiving the response and its body
+        """
+        return fetch_bodies(
+            self._finishedResponses.values(),
+            filter=filter,
+            concurrency=concurrency,
+            sink=sink,
+            loop=self._loop,
+        )
+
+    def requestTableStats(self) -> Dict[str, Dict[str, OptionalNumber]]:
+        """Returns the size, limits and number of evicted entries of the tables
+        tracking in flight requests, retained finished responses and requests
+        waiting to be matched with their requestWillBeSent (requestWillBeSent)
+        or requestPaused (interceptionIds) event"""
+        return {
+            "requests": self._requestIdToRequest.stats(),
+            "finished": self._finishedResponses.stats(),
+            "requestWillBeSent": self._requestIdToRequestWillBeSentEvent.stats(),
+            "interceptionIds": self._requestIdToInterceptionId.stats(),
+        }
+
+    @property
+    def network_stats(self) -> NetworkStats:
+        """The live counters of the network traffic"""
+        return self._networkStats
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the live counters of the network traffic:
+        the number of requests started, finished, failed and served from cache,
+        the in flight high-water mark, the encoded bytes received by resource
+        type and origin, time to first byte percentiles (milliseconds), the
+        number of requests blocked by resource type and by URL pattern, the
+        stats of the request tables and of the interception dispatcher"""
+        stats = self._networkStats.as_dict()
+        stats["requestTables"] = self.requestTableStats()
+        stats["interception"] = self._dispatcher.stats()
+        return stats
+
+    @property
+    def interception_dispatcher(self) -> InterceptionDispatcher:
+        """The dispatcher sending the commands resolving paused requests"""
+        return self._dispatcher
+
+    def setInterceptionConcurrency(self, concurrency: int) -> None:
+        """Sets the maximum number of commands resolving paused requests
+        (e.g. Fetch.continueRequest) sent at once
+
+        :param concurrency: The maximum number of commands sent at once
+        """
+        self._dispatcher.setConcurrency(concurrency)
+
+    def dispose(self) -> None:
+        """Cancels the pending commands resolving paused requests,
+        called once the page closed"""
+        self._dispatcher.close()
+
+    def resetStats(self) -> None:
+        """Resets the live counters of the network traffic, e.g. before
+        starting a new capture"""
+        self._networkStats.reset()
+
+    def setRequestTableLimits(
+        self,
+        maxRequests: Optional[int] = DEFAULT_MAX_REQUESTS,
+        requestTTL: OptionalNumber = None,
+        maxPending: Optional[int] = DEFAULT_MAX_PENDING,
+        pendingTTL: OptionalNumber = DEFAULT_PENDING_TTL,
+        maxFinished: Optional[int] = DEFAULT_MAX_FINISHED,
+    ) -> None:
+        """Sets the limits of the tables tracking requests. Entries over
+        the limits are forgotten, so later events for them are ignored.
+
+        Regardless of the limits, when a frame commits a navigation the
+        waiting requests, finished responses and requests whose response was
+        received of its previous documents are forgotten along with the
+        expired entries. Its requests still waiting for their response are
+        kept until the browser reports their completion or failure, since
+        keepalive requests and beacons outlive the navigation.
+
+        :param maxRequests: The maximum number of in flight requests tracked
+        :param requestTTL: Seconds after which an in flight request is forgotten
+        :param maxPending: The maximum number of requests waiting to be matched
+        :param pendingTTL: Seconds after which a waiting request is forgotten
+        :param maxFinished: The maximum number of finished responses retained
+         for :meth:`fetch_bodies`, 0 to retain none
+        """
+        self._requestIdToRequest.setLimits(requestTTL, maxRequests)
+        self._networkStats.setLimits(maxRequests, requestTTL)
+        self._requestIdToRequestWillBeSentEvent.setLimits(pendingTTL, maxPending)
+        self._requestIdToInterceptionId.setLimits(pendingTTL, maxPending)
+        self._finishedResponses.setLimits(None, maxFinished)
+        if maxFinished == 0:
+            self._finishedResponses.clear()
+
     def extraHTTPHeaders(self) -> HTTPHeaders:
         """Get extra http headers."""
         return dict(**self._extraHTTPHeaders)
@@ -207,11 +443,106 @@ class NetworkManager(EventEmitterS):
         self._userRequestInterceptionEnabled = value
         await self._updateProtocolRequestInterception()
 
+    async def setResponseInterception(self, value: bool) -> None:
+        """Enable response interception.
+
+        When enabled each response is paused once its headers have been received
+        and emitted as ResponsePaused. Listeners may take the response body using
+        Response.stream or Response.save, otherwise the response is continued.
+        """
+        self._userResponseInterceptionEnabled = value
+        await self._updateProtocolRequestInterception()
+
+    @property
+    def compactRecords(self) -> bool:
+        """Do new requests and responses only keep selected fields of their events"""
+        return self._compactRecords
+
+    def setCompactRecords(self, enabled: bool) -> None:
+        """Enable/disable compact requests and responses.
+
+        Compact requests and responses keep only the fields of their CDP
+        events exposed by their properties, in slotted records with interned
+        strings, and drop the events (including initiator stack traces, raw
+        header text and security details). Their as_dict builds a new
+        dictionary of the kept fields. Only affects requests made afterwards.
+
+        :param enabled: Should new requests and responses be compact
+        """
+        self._compactRecords = enabled
+
+    @property
+    def body_capture(self) -> Optional[BodyCapture]:
+        """The body capture of the current body capture policy"""
+        return self._bodyCapture
+
+    def setBodyCapturePolicy(self, policy: Optional[BodyCapturePolicy]) -> None:
+        """Sets the policy describing which response bodies are prefetched
+        once their loading finishes. The captured body is available from
+        Response.captured_body and is used by Response.buffer, text and json.
+
+        :param policy: The body capture policy or None to stop capturing bodies
+        """
+        if policy is None:
+            self._bodyCapture = None
+        else:
+            self._bodyCapture = BodyCapture(policy, loop=self._loop)
+
+    @property
+    def interceptionRules(self) -> Optional[InterceptionRuleSet]:
+        """The compiled interception rules, if any"""
+        return self._interceptionRules
+
+    async def setInterceptionRules(
+        self, rules: Optional[Iterable[InterceptionRule]]
+    ) -> None:
+        """Sets the rules applied to requests before they reach Python.
+
+        Only requests that could match a rule (by URL glob and resource type)
+        are paused, so the rules can be used without request interception.
+        When request interception is enabled the rules are applied first and
+        requests handled by a rule are emitted already handled. Responses
+        served from the memory cache are never paused.
+
+        :param rules: The rules in priority order or None to remove the rules
+        """
+        ruleSet = InterceptionRuleSet(rules) if rules is not None else None
+        self._interceptionRules = ruleSet if ruleSet else None
+        await self._updateProtocolRequestInterception()
+
+    @property
+    def blockedResourceTypes(self) -> FrozenSet[str]:
+        return self._blockedResourceTypes
+
+    @property
+    def blockedURLPatterns(self) -> List[str]:
+        return list(self._blockedURLPatterns)
+
+    async def setBlockedResourceTypes(self, types: Optional[Iterable[str]]) -> None:
+        """Blocks requests of the resource types (e.g. Image, Media, Font)
+        from loading.
+
+        Only requests of the blocked types are paused, by Fetch.enable patterns
+        with their resourceType, and they are failed as BlockedByClient as soon
+        as they pause without being turned into Requests. Requests of the other
+        types are never paused unless request interception or a rule needs them.
+
+        :param types: The resource types to block or None to unblock every type
+        """
+        blocked = frozenset(types or ())
+        unknown = blocked - RESOURCE_TYPES
+        if unknown:
+            raise ValueError(f"Unknown resource types: {sorted(unknown)}")
+        self._blockedResourceTypes = blocked
+        await self._updateProtocolRequestInterception()
+
     async def setBlockedURLs(self, urls: List[str]) -> None:
-        """Blocks URLs from loading
+        """Blocks URLs from loading. Blocking is done by the browser, so
+        no request is paused.
 
         :param urls: URL patterns to block. Wildcards ('*') are allowed.
         """
+        self._blockedURLPatterns = list(urls)
         await self._client.send("Network.setBlockedURLs", {"urls": urls})
 
     async def setCookie(self, cookie: Optional[Dict] = None, **kwargs: Any) -> bool:
@@ -286,11 +617,16 @@ class NetworkManager(EventEmitterS):
 
     async def _updateProtocolRequestInterception(self) -> None:
         enabled = self._userRequestInterceptionEnabled or bool(self._credentials)
-        if enabled == self._protocolRequestInterceptionEnabled:
-            return
+        cacheChanged = enabled != self._protocolRequestInterceptionEnabled
         self._protocolRequestInterceptionEnabled = enabled
-        if enabled:
-            patterns = [{"urlPattern": "*"}] if enabled else []
+        self._protocolResponseInterceptionEnabled = (
+            self._userResponseInterceptionEnabled
+        )
+        patterns = self._fetchPatterns()
+        if patterns == self._protocolFetchPatterns and not cacheChanged:
+            return
+        self._protocolFetchPatterns = patterns
+        if patterns:
             await asyncio.gather(
                 self._updateProtocolCacheDisabled(),
                 self._client.send("Fetch.enable", {"patterns": patterns}),
@@ -300,6 +636,22 @@ class NetworkManager(EventEmitterS):
                 self._updateProtocolCacheDisabled(), self._client.send("Fetch.disable")
             )
 
+    def _fetchPatterns(self) -> List[Dict[str, str]]:
+        patterns = []
+        if self._protocolRequestInterceptionEnabled:
+            patterns.append({"urlPattern": "*"})
+        else:
+            if self._interceptionRules is not None:
+                patterns.extend(self._interceptionRules.fetch_patterns())
+            if {"urlPattern": "*"} not in patterns:
+                patterns.extend(
+                    {"urlPattern": "*", "resourceType": resourceType}
+                    for resourceType in sorted(self._blockedResourceTypes)
+                )
+        if self._protocolResponseInterceptionEnabled:
+            patterns.append({"urlPattern": "*", "requestStage": "Response"})
+        return patterns
+
     async def _updateProtocolCacheDisabled(self) -> None:
         await self._client.send(
             "Network.setCacheDisabled",
@@ -310,20 +662,26 @@ class NetworkManager(EventEmitterS):
         )
 
     def _onRequestWillBeSent(self, event: CDPEvent) -> None:
+        self._networkStats.requestWillBeSent(event)
         if self._protocolRequestInterceptionEnabled and not event["request"].get(
             "url", ""
         ).startswith("data:"):
             requestId = event.get("requestId")
-            interceptionId = self._requestIdToInterceptionId.get(requestId)
-            if interceptionId:
-                self._onRequest(event, interceptionId)
-                self._requestIdToInterceptionId.pop(requestId, None)
+            if requestId in self._requestIdToInterceptionId:
+                # the interceptionId is None when the request was handled by a rule
+                interceptionId = self._requestIdToInterceptionId.pop(requestId)
+                self._onRequest(event, interceptionId, interceptionId is None)
             else:
                 self._requestIdToRequestWillBeSentEvent[requestId] = event
             return
         self._onRequest(event, None)
 
-    def _onRequest(self, event: CDPEvent, interceptionId: Optional[str] = None) -> None:
+    def _onRequest(
+        self,
+        event: CDPEvent,
+        interceptionId: Optional[str] = None,
+        interceptionHandled: bool = False,
+    ) -> None:
         redirectChain: List[Request] = []
         requestId = event.get("requestId")
         if event.get("redirectResponse") is not None:
@@ -342,39 +700,111 @@ class NetworkManager(EventEmitterS):
             interceptionId,
             self._userRequestInterceptionEnabled,
             redirectChain,
+            compact=self._compactRecords,
+            dispatcher=self._dispatcher,
         )
+        request._interceptionHandled = interceptionHandled
         self._requestIdToRequest[requestId] = request
         self.emit(Events.NetworkManager.Request, request)
 
     def _onRequestSeveredFromCache(self, event: CDPEvent) -> None:
-        request = self._requestIdToRequest.get(event.get("requestId"))
+        self._networkStats.requestServedFromCache(event)
+        request = self._trackedRequest(event.get("requestId"))
         if request is not None:
             request._fromMemoryCache = True
 
+    def _trackedRequest(self, requestId: Optional[str]) -> Optional[Request]:
+        request = self._requestIdToRequest.get(requestId)
+        if request is None:
+            # requests that never pause (e.g. served from the memory cache or
+            # blocked) are only emitted once their fate is known
+            event = self._requestIdToRequestWillBeSentEvent.pop(requestId)
+            if event is not None:
+                self._onRequest(event, None, True)
+                request = self._requestIdToRequest.get(requestId)
+        return request
+
+    def _forgetRequest(self, request: Request) -> None:
+        requestId = request.requestId
+        self._requestIdToRequest.pop(requestId)
+        self._requestIdToInterceptionId.pop(requestId)
+        self._attemptedAuthentications.discard(request._interceptionId)
+
+    def _onFrameNavigated(self, event: CDPEvent) -> None:
+        framePayload = event.get("frame", {})
+        frameId = framePayload.get("id")
+        loaderId = framePayload.get("loaderId")
+
+        def previousDocument(requestId: str, value: Any) -> bool:
+            # navigation requests may belong to a document yet to be committed
+            if isinstance(value, Request):
+                requestLoaderId = value.loaderId
+                requestFrameId = value.frameId
+            else:
+                requestLoaderId = value.get("loaderId")
+                requestFrameId = value.get("frameId")
+            return (
+                requestFrameId == frameId
+                and requestLoaderId != loaderId
+                and requestLoaderId != requestId
+            )
+
+        self._requestIdToRequestWillBeSentEvent.sweep(previousDocument)
+        self._requestIdToInterceptionId.sweep()
+        self._finishedResponses.sweep(
+            lambda requestId, response: previousDocument(requestId, response.request)
+        )
+        # requests of the previous documents still waiting for their response
+        # are not forgotten, the browser fails the canceled ones itself while
+        # keepalive requests and beacons outlive the navigation and still
+        # finish. Those that received their response are forgotten as their
+        # loading may never be reported finished, see https://crbug.com/750469
+        self._requestIdToRequest.sweep(
+            lambda requestId, request: request._response is not None
+            and previousDocument(requestId, request)
+        )
+
     def _handleRequestRedirect(self, request: Request, event: CDPEvent) -> None:
-        newEvent: Dict = dict(**event)
+        compact = request.compact
+        if compact:
+            # only copy the fields the compact response keeps
+            newEvent: Dict = {
+                field: event.get(field) for field in ResponseEventRecord.__slots__
+            }
+        else:
+            newEvent = dict(**event)
+            newEvent.pop("redirectResponse", None)
         newEvent["response"] = event.get("redirectResponse")
-        newEvent.pop("redirectResponse", None)
-        response = Response(self._client, request, newEvent, loop=self._loop)
+        response = Response(
+            self._client, request, newEvent, loop=self._loop, compact=compact
+        )
         request._redirectChain.append(request)
         request._response = response
         response._bodyLoadedPromise.set()
-        self._requestIdToRequest.pop(request.requestId, None)
-        self._attemptedAuthentications.discard(request._interceptionId)
+        self._forgetRequest(request)
         self.emit(Events.NetworkManager.Response, response)
         self.emit(Events.NetworkManager.RequestFinished, request)
 
     def _onResponseReceived(self, event: CDPEvent) -> None:
-        request = self._requestIdToRequest.get(event["requestId"])
+        self._networkStats.responseReceived(event)
+        request = self._trackedRequest(event["requestId"])
         # FileUpload sends a response without a matching request.
         if request is None:
             return
-        response = Response(self._client, request, event, loop=self._loop)
-        request._response = response
+        response = request._response
+        if response is not None and response._interceptionId is not None:
+            # the response was created when it was paused by Fetch
+            response._updateFromResponseReceived(event)
+        else:
+            response = Response(
+                self._client, request, event, loop=self._loop, compact=request.compact
+            )
+            request._response = response
         self.emit(Events.NetworkManager.Response, response)
 
     def _onLoadingFinished(self, event: CDPEvent) -> None:
-        request = self._requestIdToRequest.get(event.get("requestId", ""))
+        self._networkStats.loadingFinished(event)
+        request = self._trackedRequest(event.get("requestId", ""))
         # For certain requestIds we never receive requestWillBeSent event.
         # @see https://crbug.com/750469
         if request is None:
@@ -383,13 +813,21 @@ class NetworkManager(EventEmitterS):
         # event from protocol. @see https://crbug.com/883475
         response = request._response
         if response is not None:
+            response._encodedDataLength = event.get(
+                "encodedDataLength", response._encodedDataLength
+            )
+            response._finishedTimestamp = event.get("timestamp")
             response._bodyLoadedPromise.set()
-        self._requestIdToRequest.pop(request.requestId, None)
-        self._attemptedAuthentications.discard(request._interceptionId)
+            if self._bodyCapture is not None:
+                self._bodyCapture.capture(response)
+            if self._finishedResponses.max_size != 0:
+                self._finishedResponses[request.requestId] = response
+        self._forgetRequest(request)
         self.emit(Events.NetworkManager.RequestFinished, request)
 
     def _onLoadingFailed(self, event: CDPEvent) -> None:
-        request = self._requestIdToRequest.get(event["requestId"])
+        self._networkStats.loadingFailed(event)
+        request = self._trackedRequest(event["requestId"])
         # For certain requestIds we never receive requestWillBeSent event.
         # @see https://crbug.com/750469
         if request is None:
@@ -401,8 +839,7 @@ class NetworkManager(EventEmitterS):
         response = request._response
         if response is not None:
             response._bodyLoadedPromise.set()
-        self._requestIdToRequest.pop(request.requestId, None)
-        self._attemptedAuthentications.discard(request._interceptionId)
+        self._forgetRequest(request)
         self.emit(Events.NetworkManager.RequestFailed, request)
 
     def _onAuthRequired(self, event: CDPEvent) -> None:
@@ -417,33 +854,79 @@ class NetworkManager(EventEmitterS):
         if self._credentials:
             authChallengeResponse["username"] = self._credentials["username"]
             authChallengeResponse["password"] = self._credentials["password"]
-        self._loop.create_task(
-            self._client.send(
-                "Fetch.continueWithAuth",
-                {
-                    "requestId": requestId,
-                    "authChallengeResponse": authChallengeResponse,
-                },
-            )
+        self._dispatcher.paused(requestId)
+        self._dispatcher.send(
+            requestId,
+            "Fetch.continueWithAuth",
+            {"requestId": requestId, "authChallengeResponse": authChallengeResponse},
         )
 
     def _onRequestPaused(self, event: CDPEvent) -> None:
-        if (
-            not self._userRequestInterceptionEnabled
-            and self._protocolRequestInterceptionEnabled
-        ):
-            self._loop.create_task(
-                self._client.send(
-                    "Fetch.continueRequest", {"requestId": event.get("requestId")}
-                )
+        self._dispatcher.paused(event.get("requestId"))
+        if "responseStatusCode" in event or "responseErrorReason" in event:
+            self._onResponsePaused(event)
+            return
+        interceptionId = event.get("requestId")
+        resourceType = event.get("resourceType")
+        if resourceType in self._blockedResourceTypes:
+            self._networkStats.resourceTypeBlocked(resourceType)
+            self._dispatcher.send(
+                interceptionId,
+                "Fetch.failRequest",
+                {"requestId": interceptionId, "errorReason": "BlockedByClient"},
             )
+            interceptionId = None
+        else:
+            rule = None
+            if self._interceptionRules is not None:
+                rule = self._interceptionRules.match(event)
+            if rule is not None:
+                self._dispatcher.apply(rule.action, event)
+                interceptionId = None
+            elif not self._userRequestInterceptionEnabled:
+                self._dispatcher.send(
+                    interceptionId,
+                    "Fetch.continueRequest",
+                    {"requestId": interceptionId},
+                )
+                interceptionId = None
+        if not self._protocolRequestInterceptionEnabled:
             return
         requestId = event.get("networkId")
-        interceptionId = event.get("requestId")
         if requestId and requestId in self._requestIdToRequestWillBeSentEvent:
             requestWillBeSentEvent = self._requestIdToRequestWillBeSentEvent.pop(
                 requestId, None
             )
-            self._onRequest(requestWillBeSentEvent, interceptionId)
+            self._onRequest(
+                requestWillBeSentEvent, interceptionId, interceptionId is None
+            )
             return
         self._requestIdToInterceptionId[requestId] = interceptionId
+
+    def _onResponsePaused(self, event: CDPEvent) -> None:
+        interceptionId = event.get("requestId")
+        request = self._requestIdToRequest.get(event.get("networkId"))
+        if (
+            request is None
+            or "responseErrorReason" in event
+            or not self._userResponseInterceptionEnabled
+        ):
+            self._dispatcher.send(
+                interceptionId, "Fetch.continueRequest", {"requestId": interceptionId}
+            )
+            return
+        response = Response.fromRequestPaused(
+            self._client,
+            request,
+            event,
+            loop=self._loop,
+            compact=request.compact,
+            dispatcher=self._dispatcher,
+        )
+        request._response = response
+        self.emit(Events.NetworkManager.ResponsePaused, response)
+        if not response._interceptionHandled:
+            response._interceptionHandled = True
+            self._dispatcher.send(
+                interceptionId, "Fetch.continueRequest", {"requestId": interceptionId}
+            )
@@ -0,0 +1,170 @@
+"""Compact storage for the fields of the CDP network events kept by
+Request and Response"""
+from sys import intern
+from typing import Any, ClassVar, Dict, FrozenSet, Optional
+
+from ._typings import SlotsT
+
+__all__ = [
+    "CompactRecord",
+    "RequestEventRecord",
+    "RequestRecord",
+    "ResponseEventRecord",
+    "ResponseRecord",
+]
+
+#: Fields holding header dictionaries whose header names are interned
+HEADER_FIELDS: FrozenSet[str] = frozenset({"headers", "requestHeaders"})
+
+
+def intern_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Returns a copy of the headers whose names are interned
+
+    :param headers: The headers dictionary
+    """
+    return {intern(name): value for name, value in headers.items()}
+
+
+class CompactRecord:
+    """A slotted stand-in for a dictionary of a CDP event that keeps only the
+    fields named by its slots, dropping everything else (e.g. initiator stack
+    traces or raw header text). Values of the fields in ``interned`` and
+    header names are interned, so every record shares a single copy of strings
+    such as methods, resource types and mime types.
+
+    Supports the subset of the dictionary interface used by Request and
+    Response, a field that was absent from the event is None.
+    """
+
+    __slots__: SlotsT = []
+
+    #: The fields whose string values are interned
+    interned: ClassVar[FrozenSet[str]] = frozenset()
+
+    def __init__(self, source: Optional[Dict]) -> None:
+        """Initialize a new record from the event dictionary
+
+        :param source: The event dictionary
+        """
+        source = source or {}
+        interned = self.interned
+        for field in self.__slots__:
+            value = source.get(field)
+            if value is not None:
+                if field in interned and isinstance(value, str):
+                    value = intern(value)
+                elif field in HEADER_FIELDS and isinstance(value, dict):
+                    value = intern_headers(value)
+            setattr(self, field, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the fields that are present as a new dictionary"""
+        fields = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if value is not None:
+                fields[field] = value
+        return fields
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class RequestEventRecord(CompactRecord):
+    """The fields kept of a Network.requestWillBeSent event"""
+
+    __slots__: SlotsT = [
+        "documentURL",
+        "frameId",
+        "hasUserGesture",
+        "loaderId",
+        "requestId",
+        "timestamp",
+        "type",
+        "wallTime",
+    ]
+
+    interned: ClassVar[FrozenSet[str]] = frozenset({"type"})
+
+
+class RequestRecord(CompactRecord):
+    """The fields kept of a Network.Request"""
+
+    __slots__: SlotsT = [
+        "hasPostData",
+        "headers",
+        "initialPriority",
+        "isLinkPreload",
+        "method",
+        "mixedContentType",
+        "postData",
+        "referrerPolicy",
+        "url",
+        "urlFragment",
+    ]
+
+    interned: ClassVar[FrozenSet[str]] = frozenset(
+        {"initialPriority", "method", "mixedContentType", "referrerPolicy"}
+    )
+
+
+class ResponseEventRecord(CompactRecord):
+    """The fields kept of a Network.responseReceived event"""
+
+    __slots__: SlotsT = [
+        "frameId",
+        "loaderId",
+        "requestId",
+        "resourceType",
+        "timestamp",
+        "type",
+    ]
+
+    interned: ClassVar[FrozenSet[str]] = frozenset({"resourceType", "type"})
+
+
+class ResponseRecord(CompactRecord):
+    """The fields kept of a Network.Response"""
+
+    __slots__: SlotsT = [
+        "encodedDataLength",
+        "fromDiskCache",
+        "fromServiceWorker",
+        "headers",
+        "mimeType",
+        "protocol",
+        "remoteIPAddress",
+        "remotePort",
+        "requestHeaders",
+        "securityState",
+        "status",
+        "statusText",
+        "timing",
+        "url",
+    ]
+
+    interned: ClassVar[FrozenSet[str]] = frozenset(
+        {"mimeType", "protocol", "remoteIPAddress", "securityState", "statusText"}
+    )
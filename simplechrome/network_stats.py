@@ -0,0 +1,348 @@
+"""Live counters of the network traffic of a page"""
+from bisect import bisect_left
+from sys import intern
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from ._typings import CDPEvent, Number, OptionalLoop, OptionalNumber, SlotsT
+from .request_table import RequestTable
+
+__all__ = ["LatencyHistogram", "NetworkStats"]
+
+#: The upper bounds, in milliseconds, of the buckets of a LatencyHistogram
+DEFAULT_LATENCY_BUCKETS: Tuple[Number, ...] = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    30000,
+    60000,
+)
+
+StatsDict = Dict[str, Any]
+
+
+class LatencyHistogram:
+    """A fixed bucket histogram of durations in milliseconds.
+
+    Uses constant memory regardless of the number of recorded durations,
+    percentiles are estimated by interpolating within the bucket holding them.
+    """
+
+    __slots__: SlotsT = ["_bounds", "_count", "_counts", "_max", "_min", "_sum"]
+
+    def __init__(self, bounds: Tuple[Number, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize a new LatencyHistogram
+
+        :param bounds: The ascending upper bounds of the buckets in milliseconds,
+         durations over the last bound are counted in an overflow bucket
+        """
+        self._bounds: Tuple[Number, ...] = bounds
+        self._counts: List[int] = [0] * (len(bounds) + 1)
+        self._count: int = 0
+        self._sum: float = 0
+        self._min: OptionalNumber = None
+        self._max: OptionalNumber = None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> OptionalNumber:
+        if not self._count:
+            return None
+        return self._sum / self._count
+
+    def record(self, duration: Number) -> None:
+        """Records a duration
+
+        :param duration: The duration in milliseconds
+        """
+        duration = max(duration, 0)
+        self._counts[bisect_left(self._bounds, duration)] += 1
+        self._count += 1
+        self._sum += duration
+        if self._min is None or duration < self._min:
+            self._min = duration
+        if self._max is None or duration > self._max:
+            self._max = duration
+
+    def percentile(self, p: Number) -> OptionalNumber:
+        """Returns the estimated duration below which p percent of the recorded
+        durations fall, None if nothing was recorded
+
+        :param p: The percentile, between 0 and 100
+        """
+        if not self._count:
+            return None
+        rank = self._count * p / 100
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if count and seen + count >= rank:
+                lower = self._bounds[index - 1] if index else 0
+                upper = self._bounds[index] if index < len(self._bounds) else self._max
+                lower = max(lower, self._min)
+                upper = min(upper, self._max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self._max
+
+    def reset(self) -> None:
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0
+        self._min = None
+        self._max = None
+
+    def as_dict(self) -> StatsDict:
+        """Returns the count, mean, extremes, common percentiles and the
+        bucket counts (keyed by upper bound) of the histogram"""
+        buckets: Dict[str, int] = {}
+        for index, count in enumerate(self._counts):
+            bound = self._bounds[index] if index < len(self._bounds) else "+Inf"
+            buckets[str(bound)] = count
+        return {
+            "count": self._count,
+            "mean": self.mean,
+            "min": self._min,
+            "max": self._max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": buckets,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self._count}, p50={self.percentile(50)}, "
+            f"p99={self.percentile(99)})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return intern(f"{parts.scheme}:")
+    return intern(f"{parts.scheme}://{parts.netloc}")
+
+
+class NetworkStats:
+    """Counters of the requests made by a page fed directly from the CDP
+    Network events, so no Request or Response is kept alive to compute them.
+
+    Only a small record (resource type, origin, start time and bytes counted)
+    is kept per in flight request, in a RequestTable bounded like the
+    NetworkManager's. Bytes are the encoded bytes received (including
+    headers), counted as ``Network.dataReceived`` arrives and corrected to
+    the total reported by ``Network.loadingFinished``.
+    """
+
+    __slots__: SlotsT = [
+        "_blockedByResourceType",
+        "_blockedByURL",
+        "_bytesByOrigin",
+        "_bytesByResourceType",
+        "_fromCache",
+        "_failed",
+        "_finished",
+        "_inflight",
+        "_inflightHighWater",
+        "_started",
+        "_totalBytes",
+        "_ttfb",
+    ]
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: OptionalNumber = None,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new NetworkStats
+
+        :param max_size: The maximum number of in flight requests tracked
+        :param ttl: Seconds after which an in flight request is forgotten
+        :param loop: Optional asyncio event loop to use
+        """
+        # requestId -> [resourceType, origin, start timestamp, bytes counted]
+        self._inflight: RequestTable = RequestTable(ttl, max_size, loop=loop)
+        self._started: int = 0
+        self._finished: int = 0
+        self._failed: int = 0
+        self._fromCache: int = 0
+        self._inflightHighWater: int = 0
+        self._totalBytes: int = 0
+        self._bytesByResourceType: Dict[str, int] = {}
+        self._bytesByOrigin: Dict[str, int] = {}
+        self._ttfb: LatencyHistogram = LatencyHistogram()
+        self._blockedByResourceType: Dict[str, int] = {}
+        self._blockedByURL: int = 0
+
+    @property
+    def ttfb(self) -> LatencyHistogram:
+        """The histogram of the milliseconds between a request being sent
+        and its response headers being received"""
+        return self._ttfb
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def setLimits(self, max_size: Optional[int], ttl: OptionalNumber) -> None:
+        """Changes the limits of the table of in flight requests
+
+        :param max_size: The maximum number of in flight requests tracked
+        :param ttl: Seconds after which an in flight request is forgotten
+        """
+        self._inflight.setLimits(ttl, max_size)
+
+    def requestWillBeSent(self, event: CDPEvent) -> None:
+        requestId = event.get("requestId")
+        if event.get("redirectResponse") is not None:
+            # the previous request of the redirect chain finished
+            self._onResponse(
+                requestId, event.get("redirectResponse"), event.get("timestamp")
+            )
+            self._finish(requestId, None)
+        request = event.get("request", {})
+        self._inflight[requestId] = [
+            intern(event.get("type") or "Other"),
+            _origin(request.get("url", "")),
+            event.get("timestamp"),
+            0,
+        ]
+        self._started += 1
+        inflight = len(self._inflight)
+        if inflight > self._inflightHighWater:
+            self._inflightHighWater = inflight
+
+    def requestServedFromCache(self, event: CDPEvent) -> None:
+        if event.get("requestId") in self._inflight:
+            self._fromCache += 1
+
+    def responseReceived(self, event: CDPEvent) -> None:
+        requestId = event.get("requestId")
+        record = self._inflight.get(requestId)
+        if record is not None and event.get("type"):
+            record[0] = intern(event.get("type"))
+        self._onResponse(requestId, event.get("response", {}), event.get("timestamp"))
+
+    def dataReceived(self, event: CDPEvent) -> None:
+        record = self._inflight.get(event.get("requestId"))
+        if record is not None:
+            self._countBytes(record, event.get("encodedDataLength", 0))
+
+    def loadingFinished(self, event: CDPEvent) -> None:
+        self._finish(event.get("requestId"), event.get("encodedDataLength"))
+
+    def loadingFailed(self, event: CDPEvent) -> None:
+        if event.get("blockedReason") == "inspector":
+            # blocked by Network.setBlockedURLs
+            self._blockedByURL += 1
+        if self._inflight.pop(event.get("requestId")) is not None:
+            self._failed += 1
+
+    def resourceTypeBlocked(self, resourceType: str) -> None:
+        self._blockedByResourceType[resourceType] = (
+            self._blockedByResourceType.get(resourceType, 0) + 1
+        )
+
+    def reset(self) -> None:
+        """Resets every counter, requests in flight remain tracked"""
+        self._started = 0
+        self._finished = 0
+        self._failed = 0
+        self._fromCache = 0
+        self._inflightHighWater = len(self._inflight)
+        self._totalBytes = 0
+        self._bytesByResourceType = {}
+        self._bytesByOrigin = {}
+        self._ttfb.reset()
+        self._blockedByResourceType = {}
+        self._blockedByURL = 0
+
+    def as_dict(self) -> StatsDict:
+        """Returns a snapshot of the counters"""
+        return {
+            "requests": {
+                "started": self._started,
+                "finished": self._finished,
+                "failed": self._failed,
+                "fromCache": self._fromCache,
+                "inflight": len(self._inflight),
+                "inflightHighWater": self._inflightHighWater,
+            },
+            "bytes": {
+                "total": self._totalBytes,
+                "byResourceType": dict(self._bytesByResourceType),
+                "byOrigin": dict(self._bytesByOrigin),
+            },
+            "ttfb": self._ttfb.as_dict(),
+            "blocked": {
+                "byResourceType": dict(self._blockedByResourceType),
+                "byURLPattern": self._blockedByURL,
+            },
+        }
+
+    def _onResponse(
+        self, requestId: str, response: Dict, timestamp: OptionalNumber
+    ) -> None:
+        record = self._inflight.get(requestId)
+        if record is None:
+            return
+        if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            self._fromCache += 1
+            return
+        sentAt = record[2]
+        timing = response.get("timing")
+        ttfb: OptionalNumber = None
+        if timing and sentAt is not None:
+            ttfb = (timing.get("requestTime", sentAt) - sentAt) * 1000 + timing.get(
+                "receiveHeadersEnd", 0
+            )
+        elif timestamp is not None and sentAt is not None:
+            ttfb = (timestamp - sentAt) * 1000
+        if ttfb is not None:
+            self._ttfb.record(ttfb)
+
+    def _finish(self, requestId: str, encodedDataLength: OptionalNumber) -> None:
+        record = self._inflight.pop(requestId)
+        if record is None:
+            return
+        if encodedDataLength is not None and encodedDataLength > record[3]:
+            self._countBytes(record, encodedDataLength - record[3])
+        self._finished += 1
+
+    def _countBytes(self, record: List[Any], size: Union[int, float]) -> None:
+        size = int(size)
+        if size <= 0:
+            return
+        record[3] += size
+        self._totalBytes += size
+        resourceType, origin = record[0], record[1]
+        self._bytesByResourceType[resourceType] = (
+            self._bytesByResourceType.get(resourceType, 0) + size
+        )
+        self._bytesByOrigin[origin] = self._bytesByOrigin.get(origin, 0) + size
+
+    def __str__(self) -> str:
+        return (
+            f"NetworkStats(started={self._started}, finished={self._finished}, "
+            f"failed={self._failed}, inflight={len(self._inflight)})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -10,6 +10,7 @@ from typing import (
     Callable,
     ClassVar,
     Dict,
+    Iterable,
     List,
     Optional,
     Set,
@@ -23,13 +24,16 @@ from pyee2 import EventEmitterS
 
 from ._typings import (
     CDPEvent,
+    EvaluationCall,
     HTTPHeaders,
     Number,
     OptionalLoop,
+    OptionalNumber,
     OptionalViewport,
     SlotsT,
     Viewport,
 )
+from .body_capture import BodyCapturePolicy, BodyFetchResult, BodyFilter, BodySink
 from .connection import ClientType, Connection
 from .console_message import ConsoleMessage
 from .cookie import Cookie
@@ -40,11 +44,16 @@ from .events import Events
 from .execution_context import ElementHandle, JSHandle, createJSHandle
 from .frame_manager import Frame, FrameManager
 from .frame_resource_tree import FrameResourceTree
+from .handle_scope import HandleScope
+from .har import HARRecorder
 from .helper import Helper
 from .input import Keyboard, Mouse, Touchscreen
+from .interception import InterceptionRule
 from .log import Log, LogEntry
+from .network_idle_monitor import DEFAULT_IGNORED_TYPES, DEFAULT_SAFETY_WINDOW
 from .network_manager import NetworkManager
 from .request_response import Request, Response
+from .settle import SettleCondition
 from .timeoutSettings import TimeoutSettings
 from .tracing import Tracing
 from .worker_manager import WorkerManager
@@ -191,6 +200,10 @@ class Page(EventEmitterS):
             Events.FrameManager.FrameNavigatedWithinDocument,
             lambda event: self.emit(Events.Page.FrameNavigatedWithinDocument, event),
         )
+        _fm.on(
+            Events.FrameManager.NavigationTiming,
+            lambda timing: self.emit(Events.Page.NavigationTiming, timing),
+        )
 
         _nm = self._networkManager
         _nm.on(
@@ -201,6 +214,10 @@ class Page(EventEmitterS):
             Events.NetworkManager.Response,
             lambda event: self.emit(Events.Page.Response, event),
         )
+        _nm.on(
+            Events.NetworkManager.ResponsePaused,
+            lambda event: self.emit(Events.Page.ResponsePaused, event),
+        )
         _nm.on(
             Events.NetworkManager.RequestFailed,
             lambda event: self.emit(Events.Page.RequestFailed, event),
@@ -238,6 +255,7 @@ class Page(EventEmitterS):
         client.on("Inspector.targetCrashed", self._onTargetCrashed)
 
         def closed(*args: Any, **kwargs: Any) -> None:
+            self._networkManager.dispose()
             self.emit(Events.Page.Close)
             self._closed = True
 
@@ -336,10 +354,21 @@ class Page(EventEmitterS):
         self._timeoutSettings.setDefaultJSTimeout(timeout)
 
     def network_idle_promise(
-        self, num_inflight: int = 2, idle_time: int = 2, global_wait: int = 60
-    ) -> Awaitable[None]:
+        self,
+        num_inflight: int = 2,
+        idle_time: Number = 2,
+        global_wait: Number = 60,
+        safety_window: OptionalNumber = DEFAULT_SAFETY_WINDOW,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
+    ) -> Awaitable[Dict[str, Any]]:
         return self._frameManager.network_idle_promise(
-            num_inflight=num_inflight, idle_time=idle_time, global_wait=global_wait
+            num_inflight=num_inflight,
+            idle_time=idle_time,
+            global_wait=global_wait,
+            safety_window=safety_window,
+            ignored_types=ignored_types,
+            ignored_urls=ignored_urls,
         )
 
     def enable_lifecycle_emitting(self) -> None:
@@ -680,6 +709,17 @@ class Page(EventEmitterS):
             raise PageError("no main frame.")
         return frame.waitForXPath(xpath, options, **kwargs)
 
+    def waitForSettled(
+        self,
+        condition: Optional[SettleCondition] = None,
+        timeout: OptionalNumber = None,
+    ) -> Awaitable[None]:
+        """Wait until the current document of the main frame has settled.
+
+        Details see :meth:`simplechrome.frame_manager.Frame.waitForSettled`.
+        """
+        return self._frameManager.mainFrame.waitForSettled(condition, timeout)
+
     def waitForFunction(
         self, pageFunction: str, options: Dict = None, *args: Any, **kwargs: Any
     ) -> Awaitable[Optional[JSHandle]]:
@@ -792,6 +832,108 @@ class Page(EventEmitterS):
         """Enable/disable request interception."""
         await self._networkManager.setRequestInterception(value)
 
+    async def setResponseInterception(self, value: bool) -> None:
+        """Enable/disable response interception.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setResponseInterception`.
+        """
+        await self._networkManager.setResponseInterception(value)
+
+    async def setInterceptionRules(
+        self, rules: Optional[Iterable[InterceptionRule]]
+    ) -> None:
+        """Set the rules applied to requests before they reach Python.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setInterceptionRules`.
+        """
+        await self._networkManager.setInterceptionRules(rules)
+
+    async def block_resource_types(self, types: Optional[Iterable[str]]) -> None:
+        """Block requests of the resource types (e.g. Image, Media, Font,
+        Stylesheet) from loading, None to unblock every type.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setBlockedResourceTypes`.
+        """
+        await self._networkManager.setBlockedResourceTypes(types)
+
+    async def block_url_patterns(self, patterns: Optional[Iterable[str]]) -> None:
+        """Block requests whose URL matches one of the patterns from loading,
+        wildcards ('*') are allowed. None to unblock every URL.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setBlockedURLs`.
+        """
+        await self._networkManager.setBlockedURLs(list(patterns or ()))
+
+    def setCompactRecords(self, enabled: bool) -> None:
+        """Enable/disable compact requests and responses.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setCompactRecords`.
+        """
+        self._networkManager.setCompactRecords(enabled)
+
+    def setBodyCapturePolicy(self, policy: Optional[BodyCapturePolicy]) -> None:
+        """Set the policy describing which response bodies are prefetched.
+
+        Details see
+        :meth:`simplechrome.network_manager.NetworkManager.setBodyCapturePolicy`.
+        """
+        self._networkManager.setBodyCapturePolicy(policy)
+
+    def har_recorder(
+        self,
+        path: str,
+        capture_policy: Optional[BodyCapturePolicy] = None,
+        max_pending: int = 64,
+        concurrency: int = 4,
+    ) -> HARRecorder:
+        """Returns a new HARRecorder writing the network traffic of the page
+        to the HAR file at path, recording starts once it is started or
+        entered as an async context manager.
+
+        :param path: The path of the HAR file written to
+        :param capture_policy: Optional policy selecting the response bodies
+         included in the log
+        :param max_pending: The maximum number of entries waiting to be written
+        :param concurrency: The maximum number of entries built or waiting to
+         be queued at once
+        """
+        return HARRecorder(
+            self,
+            path,
+            capture_policy=capture_policy,
+            max_pending=max_pending,
+            concurrency=concurrency,
+            loop=self._loop,
+        )
+
+    def fetch_bodies(
+        self,
+        filter: Optional[BodyFilter] = None,
+        concurrency: int = 8,
+        sink: Optional[BodySink] = None,
+    ) -> Awaitable[BodyFetchResult]:
+        """Retrieves the bodies of the finished responses retained by the page
+        (e.g. to archive the page after it loaded), at most concurrency at once.
+
+        Each body is passed to sink(response, body) as soon as it is retrieved,
+        without a sink the bodies are kept in the returned BodyFetchResult.
+        The result also lists the responses whose body Chrome already evicted.
+
+        :param filter: A BodyCapturePolicy or a function returning T/F indicating
+         if the body of the response should be retrieved
+        :param concurrency: The maximum number of bodies retrieved at once
+        :param sink: Optional function, or coroutine function, receiving the
+         response and its body
+        """
+        return self._networkManager.fetch_bodies(
+            filter=filter, concurrency=concurrency, sink=sink
+        )
+
     async def setOfflineMode(self, enabled: bool) -> None:
         """Set offline mode enable/disable."""
         await self._networkManager.setOfflineMode(enabled)
@@ -842,6 +984,17 @@ class Page(EventEmitterS):
             raise PageError("No context.")
         return await context.queryObjects(prototypeHandle)
 
+    def handle_scope(self) -> HandleScope:
+        """Returns a new HandleScope for this page, the remote objects of the
+        handles created by the code inside the ``async with`` block are
+        released together with a single Runtime.releaseObjectGroup on exit::
+
+            async with page.handle_scope():
+                items = await page.querySelectorAll("li")
+                texts = [await page.evaluate("e => e.innerText", e) for e in items]
+        """
+        return HandleScope(self._frameManager)
+
     async def deleteCookie(self, *cookies: Dict) -> None:
         """Delete cookie."""
         pageURL = self.url
@@ -912,6 +1065,8 @@ class Page(EventEmitterS):
             for at least 500 ms.
           * ``networkidle0``: when there are no more than 2 network connections
             for at least 500 ms.
+          * ``settled`` or a :class:`~simplechrome.settle.SettleCondition`: when the
+            frame has settled, see :meth:`waitForSettled`.
 
         * ``all_frames`` (bool): should all frames or only the top frame be checked
            for the the value of ``waitUntil``, defaults to `True`
@@ -1263,6 +1418,47 @@ class Page(EventEmitterS):
             raise Exception("No main frame.")
         return frame.evaluate(pageFunction, *args, withCliAPI=withCliAPI)
 
+    def evaluate_many(
+        self, calls: Iterable[EvaluationCall], return_exceptions: bool = True
+    ) -> Awaitable[List[Any]]:
+        """Calls each page function with its arguments in the main frame using
+        a single Runtime.callFunctionOn, returning their results by value.
+
+        A call is a page function or a tuple of a page function and its
+        arguments, e.g.::
+
+            title, links = await page.evaluate_many([
+                "document.title",
+                ("sel => [...document.querySelectorAll(sel)].map(a => a.href)", ["a"]),
+            ])
+
+        The result of a call that threw is an EvaluationError, raised instead
+        when return_exceptions is false.
+
+        :param calls: The page functions and their arguments
+        :param return_exceptions: Should errors be returned instead of raised
+        """
+        frame = self.mainFrame
+        if frame is None:
+            raise PageError("no main frame.")
+        return frame.evaluate_many(calls, return_exceptions)
+
+    def evaluate_helper(self, name: str, source: str, *args: Any) -> Awaitable[Any]:
+        """Calls the page function source with the arguments in the main frame,
+        returning the result by value.
+
+        The function is installed under name in the frame's execution context
+        the first time, later calls only send the arguments until the context
+        is replaced (e.g. by a navigation).
+
+        :param name: The name the helper is installed under
+        :param source: The source of the page function
+        """
+        frame = self.mainFrame
+        if frame is None:
+            raise PageError("no main frame.")
+        return frame.evaluate_helper(name, source, *args)
+
     async def evaluate_expression(
         self, expression: str, withCliAPI: bool = False
     ) -> Any:
@@ -0,0 +1,439 @@
+"""Content addressed on-disk cache of responses for offline replay"""
+import base64
+import mmap
+import os
+from asyncio import Semaphore, Task, gather
+from hashlib import sha1, sha256
+from threading import Lock
+from uuid import uuid4
+from typing import Any, Dict, Iterable, List, Optional, Set, TYPE_CHECKING, Tuple, Union
+
+import aiofiles
+from ujson import dumps, loads
+
+from ._typings import CDPEvent, Loop, OptionalLoop, SlotsT
+from .connection import ClientType
+from .events import Events
+from .helper import EEListener, Helper
+from .interception import InterceptionAction, InterceptionRule
+
+if TYPE_CHECKING:
+    from .network_manager import NetworkManager  # noqa: F401
+    from .page import Page  # noqa: F401
+    from .request_response import Request  # noqa: F401
+
+__all__ = ["ReplayCache", "ReplayRecorder", "ReplayRequest"]
+
+INDEX_FILENAME: str = "index"
+PAYLOAD_DIRECTORY: str = "payloads"
+
+# the cached body has already been decoded and its length is set on replay
+_DROPPED_RESPONSE_HEADERS: Set[str] = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+}
+
+
+def cache_key(method: str, url: str, postData: Optional[Union[str, bytes]]) -> str:
+    """Returns the key of a request in the replay cache
+
+    :param method: The method of the request
+    :param url: The URL of the request
+    :param postData: The post data of the request
+    """
+    if isinstance(postData, str):
+        postData = postData.encode("utf-8")
+    bodyHash = sha256(postData).hexdigest() if postData else ""
+    return sha256(f"{method.upper()}\n{url}\n{bodyHash}".encode("utf-8")).hexdigest()
+
+
+class ReplayCache:
+    """An on-disk cache of responses keyed by the method, URL and
+    post data hash of their requests.
+
+    Bodies are stored once per content digest in ``payloads`` and the
+    responses in an append-only ``index`` file. The index is memory mapped,
+    only the offset of each entry is kept in memory and an entry is decoded
+    when looked up. When a key is recorded again the latest entry wins.
+
+    Usage::
+
+        cache = ReplayCache("cache")
+        async with cache.recorder(page):
+            await page.goto(url)
+        # later, without touching the network
+        await page.setInterceptionRules([cache.rule(offline=True)])
+        await page.goto(url)
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_directory",
+        "_entries",
+        "_indexPath",
+        "_lock",
+        "_mmap",
+        "_payloadDirectory",
+    ]
+
+    def __init__(self, directory: str) -> None:
+        """Initialize a new ReplayCache
+
+        :param directory: The directory of the cache, created if it does not exist
+        """
+        self._directory: str = directory
+        self._payloadDirectory: str = os.path.join(directory, PAYLOAD_DIRECTORY)
+        os.makedirs(self._payloadDirectory, exist_ok=True)
+        self._indexPath: str = os.path.join(directory, INDEX_FILENAME)
+        # key -> (offset, length) of the entry in the index file
+        self._entries: Dict[str, Tuple[int, int]] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock: Lock = Lock()
+        self._loadIndex()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Returns the entry for the key or None if it is not cached.
+
+        The entry contains the ``status``, ``statusText``, ``headers``
+        (a list of name, value pairs) and ``digest`` of the response
+
+        :param key: The key of the request, see :func:`cache_key`
+        """
+        location = self._entries.get(key)
+        if location is None:
+            return None
+        offset, length = location
+        with self._lock:
+            if self._mmap is None or offset + length > len(self._mmap):
+                self._remap()
+            line = self._mmap[offset : offset + length]
+        return loads(line.split(b"\t", 1)[1])
+
+    def payload_path(self, digest: str) -> str:
+        """Returns the path of the file holding the body with the content digest
+
+        :param digest: The content digest of the body
+        """
+        return os.path.join(self._payloadDirectory, digest[:2], digest)
+
+    def put(
+        self,
+        key: str,
+        status: int,
+        statusText: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+    ) -> None:
+        """Adds the response to the cache. Performs blocking IO
+
+        :param key: The key of the request, see :func:`cache_key`
+        :param status: The status code of the response
+        :param statusText: The status text of the response
+        :param headers: The response headers as a list of name, value pairs
+        :param body: The decoded response body
+        """
+        digest = sha1(body).hexdigest()
+        path = self.payload_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{uuid4().hex}.partial"
+            with open(partial, "wb") as payload:
+                payload.write(body)
+            os.replace(partial, path)
+        entry = dumps(
+            {
+                "status": status,
+                "statusText": statusText,
+                "headers": headers,
+                "digest": digest,
+            }
+        )
+        line = f"{key}\t{entry}".encode("utf-8")
+        with self._lock:
+            with open(self._indexPath, "ab") as index:
+                offset = index.tell()
+                index.write(line + b"\n")
+            self._entries[key] = (offset, len(line))
+
+    def recorder(
+        self,
+        target: Union["Page", "NetworkManager"],
+        concurrency: int = 4,
+        loop: OptionalLoop = None,
+    ) -> "ReplayRecorder":
+        """Returns a ReplayRecorder filling this cache with the responses
+        received by the target
+
+        :param target: The page or network manager to be recorded
+        :param concurrency: The maximum number of bodies retrieved at once
+        :param loop: Optional asyncio event loop to use
+        """
+        return ReplayRecorder(self, target, concurrency, loop)
+
+    def rule(
+        self,
+        url: str = "*",
+        resource_types: Optional[Iterable[str]] = None,
+        offline: bool = False,
+    ) -> InterceptionRule:
+        """Returns an interception rule fulfilling the matched requests
+        from this cache
+
+        :param url: URL glob of the requests to be replayed
+        :param resource_types: The resource types of the requests to be replayed
+        :param offline: Should requests that are not cached fail rather than
+         be sent to the network
+        """
+        return InterceptionRule(
+            ReplayRequest(self, offline), url=url, resource_types=resource_types
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    def _loadIndex(self) -> None:
+        if not os.path.exists(self._indexPath):
+            open(self._indexPath, "ab").close()
+        self._remap()
+        index = self._mmap
+        if index is None:
+            return
+        offset = 0
+        size = len(index)
+        while offset < size:
+            end = index.find(b"\n", offset)
+            if end == -1:
+                # drop an entry whose write was interrupted
+                self.close()
+                os.truncate(self._indexPath, offset)
+                self._remap()
+                break
+            tab = index.find(b"\t", offset, end)
+            if tab != -1:
+                key = index[offset:tab].decode("ascii")
+                self._entries[key] = (offset, end - offset)
+            offset = end + 1
+
+    def _remap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        with open(self._indexPath, "rb") as index:
+            if os.fstat(index.fileno()).st_size:
+                self._mmap = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __str__(self) -> str:
+        return f"ReplayCache(directory={self._directory}, entries={len(self)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class ReplayRequest(InterceptionAction):
+    """Fulfills the request from a ReplayCache. Requests that are not
+    cached, or whose cached body is missing, are continued or failed
+    when offline"""
+
+    __slots__: SlotsT = ["_cache", "_offline"]
+
+    def __init__(self, cache: ReplayCache, offline: bool = False) -> None:
+        """Initialize a new ReplayRequest action
+
+        :param cache: The cache the requests are fulfilled from
+        :param offline: Should requests that are not cached fail
+        """
+        self._cache: ReplayCache = cache
+        self._offline: bool = offline
+
+    async def apply(self, client: ClientType, event: CDPEvent) -> None:
+        interceptionId = event.get("requestId")
+        request = event.get("request", {})
+        key = cache_key(
+            request.get("method", "GET"),
+            request.get("url", ""),
+            request.get("postData"),
+        )
+        entry = self._cache.lookup(key)
+        body = None
+        if entry is not None:
+            body = await self._readPayload(entry["digest"])
+        if body is None:
+            if self._offline:
+                await client.send(
+                    "Fetch.failRequest",
+                    {
+                        "requestId": interceptionId,
+                        "errorReason": "InternetDisconnected",
+                    },
+                )
+            else:
+                await client.send(
+                    "Fetch.continueRequest", {"requestId": interceptionId}
+                )
+            return
+        headers = [{"name": name, "value": value} for name, value in entry["headers"]]
+        headers.append({"name": "Content-Length", "value": str(len(body))})
+        response = {
+            "requestId": interceptionId,
+            "responseCode": entry["status"],
+            "responseHeaders": headers,
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        if entry["statusText"]:
+            response["responsePhrase"] = entry["statusText"]
+        await client.send("Fetch.fulfillRequest", response)
+
+    async def _readPayload(self, digest: str) -> Optional[bytes]:
+        """Returns the cached body with the content digest or None if its
+        payload file is missing, unreadable or truncated, in which case the
+        request is treated as not cached"""
+        try:
+            async with aiofiles.open(self._cache.payload_path(digest), "rb") as payload:
+                body = await payload.read()
+        except OSError:
+            return None
+        if sha1(body).hexdigest() != digest:
+            return None
+        return body
+
+    def __str__(self) -> str:
+        return f"ReplayRequest(cache={self._cache}, offline={self._offline})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class ReplayRecorder:
+    """Fills a ReplayCache with the responses received by a page.
+
+    Each finished request (including the requests of a redirect chain) is
+    added to the cache once its body has been retrieved.
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_cache",
+        "_concurrency",
+        "_listeners",
+        "_loop",
+        "_networkManager",
+        "_tasks",
+    ]
+
+    def __init__(
+        self,
+        cache: ReplayCache,
+        target: Union["Page", "NetworkManager"],
+        concurrency: int = 4,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new ReplayRecorder
+
+        :param cache: The cache to be filled
+        :param target: The page or network manager to be recorded
+        :param concurrency: The maximum number of bodies retrieved at once
+        :param loop: Optional asyncio event loop to use
+        """
+        self._cache: ReplayCache = cache
+        self._networkManager: "NetworkManager" = getattr(
+            target, "network_manager", target
+        )
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._concurrency: Semaphore = Semaphore(concurrency, loop=self._loop)
+        self._tasks: Set[Task] = set()
+        self._listeners: List[EEListener] = []
+
+    @property
+    def cache(self) -> ReplayCache:
+        return self._cache
+
+    @property
+    def recording(self) -> bool:
+        return bool(self._listeners)
+
+    def start(self) -> None:
+        """Start recording"""
+        if self._listeners:
+            return
+        self._listeners.append(
+            Helper.addEventListener(
+                self._networkManager,
+                Events.NetworkManager.RequestFinished,
+                self._onRequestFinished,
+            )
+        )
+
+    async def stop(self) -> None:
+        """Stop recording, waiting for every finished request to be cached"""
+        Helper.removeEventListeners(self._listeners)
+        if self._tasks:
+            await gather(*self._tasks, loop=self._loop, return_exceptions=True)
+
+    def _onRequestFinished(self, request: "Request") -> None:
+        if request.url.startswith("data:") or request.response is None:
+            return
+        task = self._loop.create_task(self._record(request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _record(self, request: "Request") -> None:
+        response = request.response
+        body = b""
+        # only the final request of a redirect chain has a body
+        if request not in request.redirectChain:
+            async with self._concurrency:
+                try:
+                    body = await response._bufread()
+                except Exception:
+                    return
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+        postData = request.postData
+        if postData is None and request.hasPostData:
+            try:
+                postData = await request.get_post_data()
+            except Exception:
+                return
+        headers: List[Tuple[str, str]] = []
+        for name, value in (response.headers or {}).items():
+            if name.lower() in _DROPPED_RESPONSE_HEADERS:
+                continue
+            # Chrome joins repeated headers with a newline
+            for part in str(value).split("\n"):
+                headers.append((name, part))
+        await self._loop.run_in_executor(
+            None,
+            self._cache.put,
+            cache_key(request.method, request.url, postData),
+            response.status,
+            response.statusText,
+            headers,
+            body,
+        )
+
+    async def __aenter__(self) -> "ReplayRecorder":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def __str__(self) -> str:
+        return f"ReplayRecorder(cache={self._cache}, recording={self.recording})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
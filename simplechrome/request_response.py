@@ -1,22 +1,160 @@
 import base64
+import logging
 from asyncio import AbstractEventLoop, Event, Future
-from typing import Awaitable, Dict, List, Optional, Union
-
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
+from weakref import finalize
+
+import aiofiles
 from ujson import loads
 
 from ._typings import CDPEvent, HTTPHeaders, OptionalLoop, SlotsT
+from .body_capture import CapturedBody
 from .connection import ClientType
 from .frame_manager import Frame
 from .helper import Helper
+from .navigation_timing import NavigationTiming
+from .network_records import (
+    CompactRecord,
+    RequestEventRecord,
+    RequestRecord,
+    ResponseEventRecord,
+    ResponseRecord,
+)
 from .security_details import SecurityDetails
 
-__all__ = ["Response", "Request"]
+if TYPE_CHECKING:
+    from .interception_dispatcher import InterceptionDispatcher  # noqa: F401
+
+__all__ = ["BodyStream", "Response", "Request"]
+
+#: The dictionary of a CDP event or the compact record of its kept fields
+EventInfo = Union[Dict, CompactRecord]
+
+#: The default number of bytes read per chunk when streaming a response body
+DEFAULT_CHUNK_SIZE: int = 1 << 16
+
+logger = logging.getLogger(__name__)
+
+
+class BodyStream:
+    """Async iterator over the chunks of a response body returned by
+    :meth:`Response.stream`.
+
+    Closing the stream (which ``async with`` does on exit) releases the
+    response: a paused response whose body was not taken yet is continued,
+    otherwise it is failed once the body has been read. A stream is not
+    closed for you, one that is garbage collected without being closed or
+    exhausted is logged as leaked and its paused response stays paused.
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_chunks",
+        "_closed",
+        "_finalizer",
+        "_onUnstarted",
+        "_started",
+    ]
+
+    def __init__(
+        self,
+        chunks: AsyncGenerator[bytes, None],
+        onUnstarted: Optional[Callable[[], Awaitable[Any]]] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        """Initialize a new BodyStream
+
+        :param chunks: The async generator producing the chunks
+        :param onUnstarted: Called when the stream is closed before being
+         iterated
+        :param url: Optional URL of the response, used when logging a leak
+        """
+        self._chunks: AsyncGenerator[bytes, None] = chunks
+        self._onUnstarted: Optional[Callable[[], Awaitable[Any]]] = onUnstarted
+        self._started: bool = False
+        self._closed: bool = False
+        self._finalizer: finalize = finalize(self, _bodyStreamLeaked, url)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __aiter__(self) -> "BodyStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._closed:
+            raise StopAsyncIteration
+        self._started = True
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            # the generator is exhausted or failed, its finally clauses ran
+            self._markClosed()
+            raise
+
+    async def aclose(self) -> None:
+        """Stops reading the body, releasing the response"""
+        if self._closed:
+            return
+        self._markClosed()
+        if self._started:
+            await self._chunks.aclose()
+        elif self._onUnstarted is not None:
+            await self._onUnstarted()
+
+    def _markClosed(self) -> None:
+        self._closed = True
+        self._finalizer.detach()
+
+    async def __aenter__(self) -> "BodyStream":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+def _bodyStreamLeaked(url: Optional[str]) -> None:
+    # runs during garbage collection, possibly in another thread or at
+    # interpreter shutdown, so only the leak is reported
+    logger.warning("BodyStream of %s was garbage collected without being closed", url)
 
 
 def headers_array(headers: HTTPHeaders) -> List[Dict[str, str]]:
     return [{"name": name, "value": value} for name, value in headers.items()]
 
 
+def resolve_interception(
+    client: ClientType,
+    dispatcher: Optional["InterceptionDispatcher"],
+    interceptionId: Optional[str],
+    method: str,
+    params: Dict[str, Any],
+) -> Awaitable[Any]:
+    """Sends the command resolving a paused request through the dispatcher
+    of the network manager, if there is one
+
+    :param client: The client the request was paused on
+    :param dispatcher: The interception dispatcher of the network manager
+    :param interceptionId: The Fetch requestId of the paused request
+    :param method: The command (e.g. Fetch.continueRequest)
+    :param params: The parameters of the command
+    """
+    if dispatcher is not None:
+        return dispatcher.send(interceptionId, method, params)
+    return client.send(method, params)
+
+
 errorReasons: Dict[str, str] = {
     "aborted": "Aborted",
     "accessdenied": "AccessDenied",
@@ -41,6 +179,7 @@ class Request:
         "_allowInterception",
         "_blockedReason",
         "_client",
+        "_dispatcher",
         "_failureText",
         "_frame",
         "_fromMemoryCache",
@@ -62,15 +201,22 @@ class Request:
         interceptionId: Optional[str] = None,
         userRequestInterceptionEnabled: bool = False,
         redirectChain: Optional[List["Request"]] = None,
+        compact: bool = False,
+        dispatcher: Optional["InterceptionDispatcher"] = None,
     ) -> None:
         self._client: ClientType = client
+        self._dispatcher: Optional["InterceptionDispatcher"] = dispatcher
         self._frame: Optional[Frame] = frame
         self._interceptionId: Optional[str] = interceptionId
         self._allowInterception: bool = userRequestInterceptionEnabled
-        self._requestInfo: CDPEvent = cdpEvent
         self._redirectChain: List[Request] = redirectChain or []
         self._response: Optional[Response] = None
-        self._preq: Dict = self._requestInfo.get("request")
+        if compact:
+            self._requestInfo: EventInfo = RequestEventRecord(cdpEvent)
+            self._preq: EventInfo = RequestRecord(cdpEvent.get("request"))
+        else:
+            self._requestInfo = cdpEvent
+            self._preq = cdpEvent.get("request")
         self._type: str = self._requestInfo.get("type")
         self._failureText: str = ""
         self._fromMemoryCache: bool = False
@@ -119,8 +265,8 @@ class Request:
         return self._requestInfo.get("loaderId")
 
     @property
-    def timeStamp(self) -> int:
-        return self._requestInfo.get("timeStamp")
+    def timeStamp(self) -> float:
+        return self._requestInfo.get("timestamp")
 
     @property
     def wallTime(self) -> float:
@@ -178,6 +324,12 @@ class Request:
         """
         return self._response
 
+    @property
+    def interceptionHandled(self) -> bool:
+        """Has the intercepted request been continued, fulfilled or aborted,
+        including by an interception rule"""
+        return self._interceptionHandled
+
     @property
     def redirectChain(self) -> List["Request"]:
         return self._redirectChain
@@ -201,8 +353,19 @@ class Request:
             return None
         return {"errorText": self.failureText}
 
+    @property
+    def compact(self) -> bool:
+        """Does the request only keep selected fields of its CDP event"""
+        return isinstance(self._requestInfo, CompactRecord)
+
     @property
     def as_dict(self) -> Dict:
+        """The Network.requestWillBeSent event of the request. For compact
+        requests a new dictionary containing only the kept fields"""
+        if isinstance(self._requestInfo, CompactRecord):
+            info = self._requestInfo.as_dict()
+            info["request"] = self._preq.as_dict()
+            return info
         return self._requestInfo
 
     async def get_post_data(self) -> Optional[str]:
@@ -234,6 +397,8 @@ class Request:
         * ``method`` (str): If set, change the request method (e.g. ``GET``).
         * ``postData`` (str): If set, change the post data or request.
         * ``headers`` (dict): If set, change the request HTTP header.
+
+        Errors of the Fetch.continueRequest command are raised.
         """
         if self.url.startswith("data:"):
             return
@@ -242,21 +407,20 @@ class Request:
         if self._interceptionHandled:
             raise Exception("Request is already handled.")
         overrides: Dict[str, Union[str, List[Dict[str, str]]]] = {
-            "interceptionId": self._interceptionId
+            "requestId": self._interceptionId
         }
         if isinstance(url, str):
             overrides["url"] = url
         if isinstance(method, str):
             overrides["method"] = method
         if postData is not None:
-            overrides["postData"] = str(postData)
+            overrides["postData"] = base64.b64encode(
+                str(postData).encode("utf-8")
+            ).decode("ascii")
         if isinstance(headers, dict):
             overrides["headers"] = headers_array(headers)
         self._interceptionHandled = True
-        try:
-            await self._client.send("Fetch.continueRequest", overrides)
-        except Exception:
-            pass
+        await self._resolveInterception("Fetch.continueRequest", overrides)
 
     async def respond(
         self,
@@ -278,6 +442,8 @@ class Request:
         * ``contentType`` (str): If set, euqals to setting ``Content-Type``
           response header.
         * ``body`` (str|bytes): Optional response body.
+
+        Errors of the Fetch.fulfillRequest command are raised.
         """
         if self.url.startswith("data:"):
             return
@@ -294,21 +460,17 @@ class Request:
         if body is not None:
             if isinstance(body, str):
                 body = body.encode("utf-8")
-            response["body"] = base64.b64encode(body)
-        response_headers: Dict[str, str] = headers or {}
+            response["body"] = base64.b64encode(body).decode("ascii")
+        response_headers: Dict[str, str] = dict(headers or {})
         if contentType is not None:
-            response_headers["responseHeaders"] = contentType
-        if body is not None and not (
-            "content-length" in response_headers
-            and "Content-Length" in response_headers
+            response_headers["Content-Type"] = contentType
+        if body is not None and not any(
+            name.lower() == "content-length" for name in response_headers
         ):
-            response_headers["Content-Length"] = str(len(response["body"]))
+            response_headers["Content-Length"] = str(len(body))
 
         response["responseHeaders"] = headers_array(response_headers)
-        try:
-            await self._client.send("Fetch.fulfillRequest", response)
-        except Exception:
-            pass
+        await self._resolveInterception("Fetch.fulfillRequest", response)
 
     async def abort(self, errorCode: str = "failed") -> None:
         """Abort request.
@@ -322,6 +484,8 @@ class Request:
         ``addressunreachable``, ``connectionaborted``, ``connectionclosed``,
         ``connectionfailed``, ``connnectionrefused``, ``connectionreset``,
         ``internetdisconnected``, ``namenotresolved``, ``timedout``, ``failed``
+
+        Errors of the Fetch.failRequest command are raised.
         """
         if self.url.startswith("data:"):
             return
@@ -333,13 +497,17 @@ class Request:
         if self._interceptionHandled:
             raise Exception("Request is already handled.")
         self._interceptionHandled = True
-        try:
-            await self._client.send(
-                "Fetch.failRequest",
-                {"requestId": self._interceptionId, "errorReason": errorReason},
-            )
-        except Exception:
-            pass
+        await self._resolveInterception(
+            "Fetch.failRequest",
+            {"requestId": self._interceptionId, "errorReason": errorReason},
+        )
+
+    def _resolveInterception(
+        self, method: str, params: Dict[str, Any]
+    ) -> Awaitable[Any]:
+        return resolve_interception(
+            self._client, self._dispatcher, self._interceptionId, method, params
+        )
 
     def __str__(self) -> str:
         return f"Request(url={self.url}, method={self.method}, headers={self.headers})"
@@ -352,16 +520,21 @@ class Response:
     __slots__: SlotsT = [
         "__weakref__",
         "_bodyLoadedPromise",
+        "_capturedBody",
         "_client",
+        "_compact",
         "_contentPromise",
+        "_dispatcher",
         "_encodedDataLength",
+        "_finishedTimestamp",
+        "_interceptionHandled",
+        "_interceptionId",
         "_loop",
-        "_pres",
+        "_navigationTiming",
         "_pres",
         "_protocol",
         "_request",
         "_responseInfo",
-        "_responseInfo",
         "_securityDetails",
     ]
 
@@ -371,18 +544,83 @@ class Response:
         request: Request,
         cdpEvent: CDPEvent,
         loop: OptionalLoop = None,
+        compact: bool = False,
     ) -> None:
         self._client: ClientType = client
         self._request: Request = request
-        self._responseInfo: Dict = cdpEvent
+        self._compact: bool = compact
         self._loop: AbstractEventLoop = Helper.ensure_loop(loop)
         self._contentPromise: Optional[Future] = None
         self._bodyLoadedPromise: Event = Event(loop=self._loop)
-        self._pres: Dict = self._responseInfo.get("response")
-        self._protocol: str = self._pres.get("protocol")
+        self._navigationTiming: Optional["NavigationTiming"] = None
+        self._interceptionId: Optional[str] = None
+        self._interceptionHandled: bool = False
+        self._dispatcher: Optional["InterceptionDispatcher"] = None
+        self._capturedBody: Optional[CapturedBody] = None
+        self._finishedTimestamp: Optional[float] = None
+        self._updateFromResponseReceived(cdpEvent)
+
+    @classmethod
+    def fromRequestPaused(
+        cls,
+        client: ClientType,
+        request: Request,
+        event: CDPEvent,
+        loop: OptionalLoop = None,
+        compact: bool = False,
+        dispatcher: Optional["InterceptionDispatcher"] = None,
+    ) -> "Response":
+        """Creates a new Response for a request paused by Fetch at the
+        response stage. Its details are replaced by those of the
+        Network.responseReceived event once the response is continued.
+
+        :param client: The client the request was paused on
+        :param request: The paused request
+        :param event: The Fetch.requestPaused event
+        :param loop: Optional asyncio event loop to use
+        :param compact: Should only selected fields of the events be kept
+        :param dispatcher: The dispatcher the commands resolving the paused
+         request are sent through
+        """
+        headers = {}
+        for header in event.get("responseHeaders", []):
+            headers[header["name"]] = header["value"]
+        response = cls(
+            client,
+            request,
+            {
+                "requestId": request.requestId,
+                "loaderId": request.loaderId,
+                "frameId": event.get("frameId"),
+                "resourceType": event.get("resourceType"),
+                "response": {
+                    "url": event.get("request", {}).get("url", request.url),
+                    "status": event.get("responseStatusCode"),
+                    "statusText": event.get("responseStatusText", ""),
+                    "headers": headers,
+                },
+            },
+            loop=loop,
+            compact=compact,
+        )
+        response._interceptionId = event.get("requestId")
+        response._dispatcher = dispatcher
+        return response
+
+    def _updateFromResponseReceived(self, cdpEvent: CDPEvent) -> None:
         self._securityDetails: Optional[SecurityDetails] = None
-        if self._pres.get("securityDetails") is not None:
-            self._securityDetails = SecurityDetails(self._pres.get("securityDetails"))
+        if self._compact:
+            # compact responses do not keep the security details
+            self._responseInfo: EventInfo = ResponseEventRecord(cdpEvent)
+            self._pres: EventInfo = ResponseRecord(cdpEvent.get("response"))
+        else:
+            self._responseInfo = cdpEvent
+            self._pres = cdpEvent.get("response")
+            if self._pres.get("securityDetails") is not None:
+                self._securityDetails = SecurityDetails(
+                    self._pres.get("securityDetails")
+                )
+        self._protocol: str = self._pres.get("protocol")
         self._encodedDataLength: float = self._pres.get("encodedDataLength", 0.0)
 
     @property
@@ -420,6 +658,11 @@ class Response:
         """Return dictionary of HTTP headers of this response."""
         return self._pres.get("headers")
 
+    @property
+    def statusText(self) -> str:
+        """Status text of the response."""
+        return self._pres.get("statusText", "")
+
     @property
     def headersText(self) -> Optional[str]:
         return self._pres.get("headersText")
@@ -483,6 +726,28 @@ class Response:
     def encodedDataLength(self) -> float:
         return self._encodedDataLength
 
+    @property
+    def timing(self) -> Optional[Dict]:
+        """The Network.ResourceTiming of the response, if available"""
+        return self._pres.get("timing")
+
+    @property
+    def finishedTimestamp(self) -> Optional[float]:
+        """Time the loading of the response finished at"""
+        return self._finishedTimestamp
+
+    @property
+    def navigation_timing(self) -> Optional["NavigationTiming"]:
+        """The timing record of the navigation this response was
+        the navigation response for, otherwise None"""
+        return self._navigationTiming
+
+    @property
+    def captured_body(self) -> Optional[CapturedBody]:
+        """The body captured by the network manager's body capture policy,
+        if the policy matched this response"""
+        return self._capturedBody
+
     @property
     def securityDetails(self) -> Optional[SecurityDetails]:
         """Return security details associated with this response.
@@ -496,11 +761,29 @@ class Response:
     def securityState(self) -> str:
         return self._pres.get("securityState")
 
+    @property
+    def compact(self) -> bool:
+        """Does the response only keep selected fields of its CDP event"""
+        return self._compact
+
     @property
     def as_dict(self) -> Dict:
+        """The Network.responseReceived event of the response. For compact
+        responses a new dictionary containing only the kept fields"""
+        if self._compact:
+            info = self._responseInfo.as_dict()
+            info["response"] = self._pres.as_dict()
+            return info
         return self._responseInfo
 
     async def _bufread(self) -> Union[bytes, str]:
+        if self._capturedBody is not None:
+            body = await self._capturedBody.read()
+            if body is not None:
+                return body
+        return await self._fetchBody()
+
+    async def _fetchBody(self) -> Union[bytes, str]:
         await self._bodyLoadedPromise.wait()
         response = await self._client.send(
             "Network.getResponseBody", {"requestId": self._request.requestId}
@@ -512,6 +795,9 @@ class Response:
 
     def buffer(self) -> Awaitable[bytes]:
         """Return awaitable which resolves to bytes with response body."""
+        if self._capturedBody is not None:
+            # the captured body owns the memory (or file) holding the body
+            return self._loop.create_task(self._bufread())
         if self._contentPromise is None:
             self._contentPromise = self._loop.create_task(self._bufread())
         return self._contentPromise
@@ -529,6 +815,100 @@ class Response:
         content = await self.text()
         return loads(content)
 
+    def stream(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> BodyStream:
+        """Returns an async iterator over the response body in chunks of at
+        most chunk_size bytes.
+
+        When called for a response paused by response interception (from a
+        ResponsePaused listener) the body is read from the browser as a stream
+        using Fetch.takeResponseBodyAsStream and is never held in memory as a
+        whole. The request can not be continued after its body was taken, so
+        once the body has been read (or the stream is closed early) it is
+        failed with the reason Aborted and the page does not receive it. A
+        stream closed before being iterated continues the request instead.
+        Otherwise the body is retrieved using :meth:`buffer` and split into
+        chunks.
+
+        A stream that is not read to the end must be closed, use it with
+        ``async with`` to release the response as soon as the block exits::
+
+            async with response.stream() as chunks:
+                async for chunk in chunks:
+                    ...
+
+        :param chunk_size: The maximum number of bytes per chunk
+        """
+        if self._interceptionId is not None and not self._interceptionHandled:
+            self._interceptionHandled = True
+            return BodyStream(
+                self._readBodyStream(chunk_size), self._continuePaused, self.url
+            )
+        return BodyStream(self._chunkedBody(chunk_size), url=self.url)
+
+    def _continuePaused(self) -> Awaitable[Any]:
+        return resolve_interception(
+            self._client,
+            self._dispatcher,
+            self._interceptionId,
+            "Fetch.continueRequest",
+            {"requestId": self._interceptionId},
+        )
+
+    def save(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Awaitable[int]:
+        """Streams the response body to the file at path, see :meth:`stream`.
+        Returns an awaitable that resolves to the number of bytes written.
+
+        :param path: The path to the file the body is written to
+        :param chunk_size: The maximum number of bytes read at once
+        """
+        return self._loop.create_task(self._save(path, self.stream(chunk_size)))
+
+    async def _save(self, path: str, chunks: BodyStream) -> int:
+        written = 0
+        async with chunks:
+            async with aiofiles.open(path, "wb") as out:
+                async for chunk in chunks:
+                    await out.write(chunk)
+                    written += len(chunk)
+        return written
+
+    async def _readBodyStream(self, chunk_size: int) -> AsyncGenerator[bytes, None]:
+        interceptionId = {"requestId": self._interceptionId}
+        try:
+            result = await self._client.send(
+                "Fetch.takeResponseBodyAsStream", interceptionId
+            )
+            handle_args = {"handle": result.get("stream")}
+            read_args = {"handle": result.get("stream"), "size": chunk_size}
+            try:
+                eof = False
+                while not eof:
+                    response = await self._client.send("IO.read", read_args)
+                    eof = response.get("eof", True)
+                    if response.get("base64Encoded", False):
+                        data = base64.b64decode(response.get("data", ""))
+                    else:
+                        data = response.get("data", "").encode("utf-8")
+                    if data:
+                        yield data
+            finally:
+                await self._client.send("IO.close", handle_args)
+        finally:
+            await resolve_interception(
+                self._client,
+                self._dispatcher,
+                self._interceptionId,
+                "Fetch.failRequest",
+                {"requestId": self._interceptionId, "errorReason": "Aborted"},
+            )
+
+    async def _chunkedBody(self, chunk_size: int) -> AsyncGenerator[bytes, None]:
+        body = await self.buffer()
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
     def __str__(self) -> str:
         repr_args = []
         if self.url is not None:
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from ._typings import Loop, OptionalLoop, OptionalNumber, SlotsT
+from .helper import Helper
+
+__all__ = ["RequestTable"]
+
+SweepPredicate = Callable[[str, Any], bool]
+
+
+class RequestTable:
+    """A mapping of requestId to the bookkeeping of a request that can not
+    grow without bound.
+
+    Entries stored more than ``ttl`` seconds ago are evicted and once the
+    table holds ``max_size`` entries storing another evicts the least recently
+    stored one. Expired entries are evicted lazily when an entry is stored
+    and eagerly by :meth:`sweep`.
+    """
+
+    __slots__: SlotsT = ["_entries", "_evicted", "_loop", "_max_size", "_ttl"]
+
+    def __init__(
+        self,
+        ttl: OptionalNumber = None,
+        max_size: Optional[int] = None,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new RequestTable
+
+        :param ttl: Seconds after which an entry is evicted, None to keep
+         entries until the table is full
+        :param max_size: The maximum number of entries, None for no limit
+        :param loop: Optional asyncio event loop whose clock is used
+        """
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._ttl: OptionalNumber = ttl
+        self._max_size: Optional[int] = max_size
+        # requestId -> (value, the loop time it was stored at), oldest first
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._evicted: int = 0
+
+    @property
+    def ttl(self) -> OptionalNumber:
+        return self._ttl
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_size
+
+    @property
+    def evicted(self) -> int:
+        """The number of entries evicted by the ttl, size limit or a sweep"""
+        return self._evicted
+
+    def setLimits(
+        self, ttl: OptionalNumber = None, max_size: Optional[int] = None
+    ) -> None:
+        """Changes the limits of the table, evicting the entries over them
+
+        :param ttl: Seconds after which an entry is evicted, None for no limit
+        :param max_size: The maximum number of entries, None for no limit
+        """
+        self._ttl = ttl
+        self._max_size = max_size
+        self._evictExpired(self._loop.time())
+        self._evictOverflow(0)
+
+    def get(self, requestId: Optional[str], default: Any = None) -> Any:
+        entry = self._entries.get(requestId)
+        if entry is None:
+            return default
+        return entry[0]
+
+    def pop(self, requestId: Optional[str], default: Any = None) -> Any:
+        entry = self._entries.pop(requestId, None)
+        if entry is None:
+            return default
+        return entry[0]
+
+    def sweep(self, predicate: Optional[SweepPredicate] = None) -> int:
+        """Evicts the expired entries and the entries for which
+        predicate(requestId, value) is truthy. Returns the number of
+        evicted entries
+
+        :param predicate: Optional function selecting additional entries to evict
+        """
+        before = self._evicted
+        self._evictExpired(self._loop.time())
+        if predicate is not None:
+            swept = [
+                requestId
+                for requestId, (value, _) in self._entries.items()
+                if predicate(requestId, value)
+            ]
+            for requestId in swept:
+                del self._entries[requestId]
+            self._evicted += len(swept)
+        return self._evicted - before
+
+    def values(self) -> List[Any]:
+        return [value for value, _ in self._entries.values()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(requestId, value) for requestId, (value, _) in self._entries.items()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, OptionalNumber]:
+        """Returns the size, limits and number of evicted entries of the table"""
+        return {
+            "size": len(self._entries),
+            "evicted": self._evicted,
+            "ttl": self._ttl,
+            "max_size": self._max_size,
+        }
+
+    def _evictExpired(self, now: float) -> None:
+        if self._ttl is None:
+            return
+        deadline = now - self._ttl
+        entries = self._entries
+        while entries:
+            requestId, (_, storedAt) = next(iter(entries.items()))
+            if storedAt > deadline:
+                break
+            del entries[requestId]
+            self._evicted += 1
+
+    def _evictOverflow(self, room: int) -> None:
+        if self._max_size is None:
+            return
+        entries = self._entries
+        while entries and len(entries) + room > self._max_size:
+            entries.popitem(last=False)
+            self._evicted += 1
+
+    def __setitem__(self, requestId: str, value: Any) -> None:
+        now = self._loop.time()
+        entries = self._entries
+        entries.pop(requestId, None)
+        self._evictExpired(now)
+        self._evictOverflow(1)
+        entries[requestId] = (value, now)
+
+    def __getitem__(self, requestId: str) -> Any:
+        return self._entries[requestId][0]
+
+    def __delitem__(self, requestId: str) -> None:
+        del self._entries[requestId]
+
+    def __contains__(self, requestId: Optional[str]) -> bool:
+        return requestId in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return (
+            f"RequestTable(size={len(self._entries)}, ttl={self._ttl}, "
+            f"max_size={self._max_size}, evicted={self._evicted})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,393 @@
+from asyncio import sleep
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    TYPE_CHECKING,
+    Tuple,
+)
+
+from ._typings import Loop, Number, OptionalLoop, OptionalNumber, SlotsT
+from .errors import ProtocolError
+from .events import Events
+from .helper import EEListener, Helper
+from .interception import globs_to_regex
+from .network_idle_monitor import DEFAULT_IGNORED_TYPES
+
+if TYPE_CHECKING:
+    from .frame_manager import Frame  # noqa: F401
+    from .network_manager import NetworkManager  # noqa: F401
+    from .request_response import Request  # noqa: F401
+
+__all__ = ["SettleCondition", "SettleWatcher"]
+
+#: The messages of the errors evaluating in a frame that is between documents
+BETWEEN_DOCUMENTS_ERRORS: Tuple[str, ...] = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+)
+
+
+class SettleCondition:
+    """Describes when a frame is considered to be settled.
+
+    A frame is settled once every enabled check has held for its threshold:
+
+      - network: no more than ``max_inflight`` requests made by the frame or
+        its child frames have been in flight for ``network_idle`` seconds
+      - dom: no DOM mutation has happened for ``dom_idle`` seconds
+      - timers: there are no pending ``setTimeout`` callbacks with a delay of
+        at most ``max_timer_delay`` seconds
+      - animation frames: there are no pending ``requestAnimationFrame`` callbacks
+      - predicate: the JS function ``predicate`` returns (or resolves to)
+        a truthy value
+
+    Waiting for a condition that checks timers or animation frames adds a
+    probe to every new document of the page, tracking them from the start of
+    the document. A document that was loaded before is tracked from the first
+    time it is checked. A predicate that throws fails the wait.
+
+    Instances can be supplied as (or in the list of) the ``waitUntil``
+    navigation option, the string ``settled`` is equivalent to
+    ``SettleCondition()``.
+    """
+
+    __slots__: SlotsT = [
+        "_animation_frames",
+        "_dom_idle",
+        "_ignore_after",
+        "_ignored_types",
+        "_ignored_urls",
+        "_max_inflight",
+        "_max_timer_delay",
+        "_network_idle",
+        "_poll_interval",
+        "_predicate",
+        "_predicate_args",
+        "_timers",
+    ]
+
+    def __init__(
+        self,
+        network_idle: OptionalNumber = 0.5,
+        max_inflight: int = 0,
+        ignored_types: Optional[Iterable[str]] = DEFAULT_IGNORED_TYPES,
+        ignored_urls: Optional[Iterable[str]] = None,
+        ignore_after: OptionalNumber = None,
+        dom_idle: OptionalNumber = 0.5,
+        timers: bool = True,
+        max_timer_delay: Number = 1,
+        animation_frames: bool = True,
+        predicate: Optional[str] = None,
+        predicate_args: Iterable[Any] = (),
+        poll_interval: Number = 0.1,
+    ) -> None:
+        """Initialize a new SettleCondition
+
+        :param network_idle: Seconds the network must be quiet for,
+         None disables the network check
+        :param max_inflight: Maximum number of requests allowed in flight
+         while the network is considered quiet
+        :param ignored_types: Resource types whose requests are ignored
+        :param ignored_urls: URL globs of requests to be ignored (e.g.
+         long-polling endpoints), ``*`` matches zero or more characters
+        :param ignore_after: Seconds after which a request that is still in
+         flight is no longer counted, None to always count it
+        :param dom_idle: Seconds the DOM must not have been mutated for,
+         None disables the DOM check
+        :param timers: Should pending timers prevent settling
+        :param max_timer_delay: Timers with a longer delay (in seconds) are ignored
+        :param animation_frames: Should pending animation frames prevent settling
+        :param predicate: Optional JS function, possibly async, that must
+         return a truthy value
+        :param predicate_args: Arguments the predicate is called with
+        :param poll_interval: Seconds between checks of the frame
+        """
+        self._network_idle: OptionalNumber = network_idle
+        self._max_inflight: int = max_inflight
+        self._ignored_types: FrozenSet[str] = frozenset(ignored_types or ())
+        self._ignored_urls: Optional[Pattern] = globs_to_regex(ignored_urls or ())
+        self._ignore_after: OptionalNumber = ignore_after
+        self._dom_idle: OptionalNumber = dom_idle
+        self._timers: bool = timers
+        self._max_timer_delay: Number = max_timer_delay
+        self._animation_frames: bool = animation_frames
+        self._predicate: Optional[str] = predicate
+        self._predicate_args: List[Any] = list(predicate_args)
+        self._poll_interval: Number = poll_interval
+
+    @property
+    def tracks_callbacks(self) -> bool:
+        """Does this condition check the pending timers or animation frames"""
+        return self._timers or self._animation_frames
+
+    @property
+    def checks_page(self) -> bool:
+        """Does this condition need to check the state of the frame's document"""
+        return (
+            self._dom_idle is not None
+            or self._timers
+            or self._animation_frames
+            or self._predicate is not None
+        )
+
+    def ignores(self, request: "Request") -> bool:
+        """Returns T/F indicating if the request is ignored by the network check
+
+        :param request: The request to be checked
+        """
+        if request.resourceType in self._ignored_types:
+            return True
+        return self._ignored_urls is not None and bool(
+            self._ignored_urls.match(request.url)
+        )
+
+    def watcher(
+        self,
+        frame: "Frame",
+        networkManager: Optional["NetworkManager"] = None,
+        loop: OptionalLoop = None,
+    ) -> "SettleWatcher":
+        """Returns a new SettleWatcher for the frame using this condition
+
+        :param frame: The frame to be watched
+        :param networkManager: The network manager of the frame's page
+        :param loop: Optional asyncio event loop to use
+        """
+        return SettleWatcher(self, frame, networkManager, loop)
+
+    def __str__(self) -> str:
+        return (
+            f"SettleCondition(network_idle={self._network_idle}, "
+            f"max_inflight={self._max_inflight}, dom_idle={self._dom_idle}, "
+            f"timers={self._timers}, animation_frames={self._animation_frames}, "
+            f"predicate={self._predicate is not None})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class SettleWatcher:
+    """Waits for a frame to satisfy a SettleCondition.
+
+    Network activity is tracked from the moment the watcher is created.
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_condition",
+        "_eventListeners",
+        "_frame",
+        "_inflight",
+        "_loop",
+        "_quietSince",
+    ]
+
+    def __init__(
+        self,
+        condition: SettleCondition,
+        frame: "Frame",
+        networkManager: Optional["NetworkManager"] = None,
+        loop: OptionalLoop = None,
+    ) -> None:
+        self._condition: SettleCondition = condition
+        self._frame: "Frame" = frame
+        self._loop: Loop = Helper.ensure_loop(loop)
+        # requestId -> the loop time the request was sent at
+        self._inflight: Dict[str, float] = {}
+        self._quietSince: float = self._loop.time()
+        self._eventListeners: List[EEListener] = []
+        if networkManager is not None and condition._network_idle is not None:
+            self._eventListeners = [
+                Helper.addEventListener(
+                    networkManager, Events.NetworkManager.Request, self._onRequest
+                ),
+                Helper.addEventListener(
+                    networkManager,
+                    Events.NetworkManager.RequestFinished,
+                    self._onRequestDone,
+                ),
+                Helper.addEventListener(
+                    networkManager,
+                    Events.NetworkManager.RequestFailed,
+                    self._onRequestDone,
+                ),
+            ]
+
+    async def wait(self) -> None:
+        """Resolves once the frame has settled"""
+        condition = self._condition
+        while True:
+            remaining = self._networkRemaining()
+            if remaining <= 0 and condition.checks_page:
+                remaining = await self._pageRemaining()
+            if remaining <= 0:
+                return
+            await sleep(min(remaining, condition._poll_interval), loop=self._loop)
+
+    def dispose(self) -> None:
+        Helper.removeEventListeners(self._eventListeners)
+        self._inflight.clear()
+
+    def _networkRemaining(self) -> Number:
+        idle = self._condition._network_idle
+        if idle is None:
+            return 0
+        now = self._loop.time()
+        quietSince = self._quietSince
+        inflight = len(self._inflight)
+        ignore_after = self._condition._ignore_after
+        if ignore_after is not None:
+            for started in self._inflight.values():
+                if now - started >= ignore_after:
+                    inflight -= 1
+                    # the network went quiet once the request stopped counting
+                    quietSince = max(quietSince, started + ignore_after)
+        if inflight > self._condition._max_inflight:
+            return self._condition._poll_interval
+        return idle - (now - quietSince)
+
+    async def _pageRemaining(self) -> Number:
+        condition = self._condition
+        try:
+            context = await self._frame._mainWorld.executionContext()
+            predicate = None
+            if condition._predicate is not None:
+                # installed once per document rather than compiled by the page,
+                # which pages whose CSP forbids eval would refuse
+                predicate = await context.install_helper(
+                    SETTLE_PREDICATE_HELPER, condition._predicate
+                )
+            state = await context.evaluate_helper(
+                SETTLE_PROBE_HELPER,
+                SETTLE_PROBE_JS,
+                condition._max_timer_delay * 1000,
+                predicate,
+                *condition._predicate_args,
+            )
+        except ProtocolError as e:
+            message = e.args[0] if e.args else ""
+            if not any(reason in message for reason in BETWEEN_DOCUMENTS_ERRORS):
+                raise
+            # the frame is between documents, try again once it has one
+            return condition._poll_interval
+        remaining: Number = 0
+        if condition._dom_idle is not None:
+            remaining = condition._dom_idle - state["sinceMutation"] / 1000
+        if (
+            (condition._timers and state["timers"])
+            or (condition._animation_frames and state["frames"])
+            or not state["predicate"]
+        ):
+            remaining = max(remaining, condition._poll_interval)
+        return remaining
+
+    def _inFrameTree(self, request: "Request") -> bool:
+        frame = request.frame
+        while frame is not None:
+            if frame is self._frame:
+                return True
+            frame = frame.parentFrame
+        return False
+
+    def _onRequest(self, request: "Request") -> None:
+        if not self._inFrameTree(request) or self._condition.ignores(request):
+            return
+        self._inflight[request.requestId] = self._loop.time()
+
+    def _onRequestDone(self, request: "Request") -> None:
+        if self._inflight.pop(request.requestId, None) is None:
+            return
+        if len(self._inflight) <= self._condition._max_inflight:
+            self._quietSince = self._loop.time()
+
+    def __str__(self) -> str:
+        return f"SettleWatcher(condition={self._condition}, frame={self._frame})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+#: The key of the window property holding the state of the settle probe
+SETTLE_STATE_KEY: str = "__simplechrome_settle__"
+
+#: Installs the settle probe in the document, tracking DOM mutations and the
+#: pending timers (with their delay) and animation frames from then on
+SETTLE_INSTALL_JS: str = """function installSettleProbe() {
+  const key = '%s';
+  if (window[key]) return window[key];
+  const state = {
+    lastMutation: performance.now(),
+    timers: new Map(),
+    frames: new Set()
+  };
+  Object.defineProperty(window, key, { value: state, enumerable: false });
+  new MutationObserver(() => { state.lastMutation = performance.now(); }).observe(
+    document,
+    { childList: true, subtree: true, attributes: true, characterData: true }
+  );
+  const setTimeout_ = window.setTimeout;
+  const clearTimeout_ = window.clearTimeout;
+  const requestAnimationFrame_ = window.requestAnimationFrame;
+  const cancelAnimationFrame_ = window.cancelAnimationFrame;
+  window.setTimeout = function setTimeout(callback, delay, ...rest) {
+    if (typeof callback !== 'function')
+      return setTimeout_.call(window, callback, delay, ...rest);
+    const id = setTimeout_.call(window, function () {
+      state.timers.delete(id);
+      return callback.apply(this, arguments);
+    }, delay, ...rest);
+    state.timers.set(id, delay || 0);
+    return id;
+  };
+  window.clearTimeout = function clearTimeout(id) {
+    state.timers.delete(id);
+    return clearTimeout_.call(window, id);
+  };
+  window.requestAnimationFrame = function requestAnimationFrame(callback) {
+    const id = requestAnimationFrame_.call(window, function (ts) {
+      state.frames.delete(id);
+      return callback(ts);
+    });
+    state.frames.add(id);
+    return id;
+  };
+  window.cancelAnimationFrame = function cancelAnimationFrame(id) {
+    state.frames.delete(id);
+    return cancelAnimationFrame_.call(window, id);
+  };
+  return state;
+}""" % SETTLE_STATE_KEY
+
+#: The script installing the settle probe in every new document
+SETTLE_INSTALL_SCRIPT: str = f"({SETTLE_INSTALL_JS})();"
+
+#: The names the probe and the predicate of a condition are installed under
+SETTLE_PROBE_HELPER: str = "settleProbe"
+SETTLE_PREDICATE_HELPER: str = "settlePredicate"
+
+#: Reports the state of the document, awaiting the predicate if one is supplied
+SETTLE_PROBE_JS: str = """async function settleProbe(maxDelay, predicate, ...args) {
+  // documents loaded before the probe was added to new documents install it now
+  const state = window['%s'] || (%s)();
+  let timers = 0;
+  for (const delay of state.timers.values()) {
+    if (delay <= maxDelay) timers++;
+  }
+  let passed = true;
+  if (predicate) passed = !!(await predicate(...args));
+  return {
+    sinceMutation: performance.now() - state.lastMutation,
+    timers,
+    frames: state.frames.size,
+    predicate: passed
+  };
+}""" % (
+    SETTLE_STATE_KEY,
+    SETTLE_INSTALL_JS,
+)
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 __all__ = ["WaitTask"]
 
 ACCEPTABLE_POLLING_STRINGS: Set[str] = {"raf", "mutation"}
+#: The name waitForPredicatePageFunction is installed under in each context
+WAIT_FOR_PREDICATE_HELPER: str = "waitForPredicatePageFunction"
 
 
 class WaitTask:
@@ -19,10 +21,12 @@ class WaitTask:
         "__weakref__",
         "_args",
         "_domWorld",
+        "_helperName",
         "_js_timeout",
         "_loop",
         "_polling",
         "_predicateBody",
+        "_predicateSource",
         "_promise",
         "_runCount",
         "_terminated",
@@ -41,7 +45,20 @@ class WaitTask:
         timeout: Number,
         js_timeout: Number,
         *args: Any,
+        helperName: Optional[str] = None,
     ) -> None:
+        """Initialize a new WaitTask
+
+        :param domWorld: The DOMWorld the predicate is polled in
+        :param predicateBody: The predicate function or expression
+        :param title: What is waited for, used in the timeout error
+        :param polling: raf, mutation or the interval in milliseconds
+        :param timeout: Seconds to wait for the predicate
+        :param js_timeout: Milliseconds the predicate is polled for in the page
+        :param args: The arguments the predicate is called with
+        :param helperName: Optional name the predicate function is installed
+         under in each execution context, so it is only sent once per context
+        """
         if Helper.is_string(polling):
             if polling not in ACCEPTABLE_POLLING_STRINGS:
                 raise ValueError(f"Unknown polling: {polling}")
@@ -57,9 +74,11 @@ class WaitTask:
         self._polling: NumberOrStr = polling
         self._timeout: Number = timeout
         self._js_timeout: Number = js_timeout
+        self._predicateSource: str = predicateBody
         self._predicateBody: str = f"return ({predicateBody})(...args);" if Helper.is_jsfunc(
             predicateBody
         ) else f"return {predicateBody}"
+        self._helperName: Optional[str] = helperName
 
         self._args: Any = args
         self._runCount: int = 0
@@ -94,9 +113,15 @@ class WaitTask:
             if context is None:
                 error = Exception("No execution context.")
             else:
-                success = await context.evaluateHandle(
+                predicate: Any = self._predicateBody
+                if self._helperName is not None:
+                    predicate = await context.install_helper(
+                        self._helperName, self._predicateSource
+                    )
+                success = await context.call_helper(
+                    WAIT_FOR_PREDICATE_HELPER,
                     waitForPredicatePageFunction,
-                    self._predicateBody,
+                    predicate,
                     self._polling,
                     self._js_timeout,
                     *self._args,
@@ -169,7 +194,9 @@ class WaitTask:
 
 
 waitForPredicatePageFunction: str = """async function waitForPredicatePageFunction(predicateBody, polling, timeout, ...args) {
-  const predicate = new Function('...args', predicateBody);
+  const predicate = typeof predicateBody === 'function'
+    ? predicateBody
+    : new Function('...args', predicateBody);
   let timedOut = false;
   if (timeout)
     setTimeout(() => timedOut = true, timeout);
@@ -0,0 +1,425 @@
+"""WARC capture of the network traffic of a page"""
+import gzip
+import os
+from asyncio import Semaphore, Task, gather
+from base64 import b32encode
+from datetime import datetime
+from hashlib import sha1
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING, Tuple, Union
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+from ._typings import Loop, OptionalLoop, SlotsT
+from .batch_writer import BatchWriter
+from .events import Events
+from .helper import EEListener, Helper
+
+if TYPE_CHECKING:
+    from .network_manager import NetworkManager  # noqa: F401
+    from .page import Page  # noqa: F401
+    from .request_response import Request, Response  # noqa: F401
+
+__all__ = ["WARCRecorder", "WARCWriter"]
+
+#: The default maximum size of a WARC file before a new one is started (1GB)
+DEFAULT_MAX_WARC_SIZE: int = 1 << 30
+
+WARC_VERSION: str = "WARC/1.0"
+REVISIT_PROFILE: str = (
+    "http://netpreserve.org/warc/1.0/revisit/identical-payload-digest"
+)
+
+# the body returned by Network.getResponseBody has already been decoded
+# so these headers no longer describe it
+_DROPPED_RESPONSE_HEADERS: Set[str] = {"content-encoding", "transfer-encoding"}
+
+WARCHeaders = List[Tuple[str, str]]
+
+
+def _warc_date(timestamp: Optional[float] = None) -> str:
+    if timestamp is None:
+        moment = datetime.utcnow()
+    else:
+        moment = datetime.utcfromtimestamp(timestamp)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _record_id() -> str:
+    return f"<urn:uuid:{uuid4()}>"
+
+
+def _digest(data: bytes) -> str:
+    return "sha1:" + b32encode(sha1(data).digest()).decode("ascii")
+
+
+def _header_lines(headers: Optional[Dict[str, str]]) -> List[str]:
+    """Chrome joins repeated headers with a newline, they are split back
+    into separate header lines"""
+    lines = []
+    if headers:
+        for name, value in headers.items():
+            for part in str(value).split("\n"):
+                lines.append(f"{name}: {part}")
+    return lines
+
+
+def build_record(warcType: str, headers: WARCHeaders, block: bytes) -> bytes:
+    """Returns the uncompressed bytes of a WARC record
+
+    :param warcType: The value of the WARC-Type header
+    :param headers: The remaining WARC headers of the record
+    :param block: The content block of the record
+    """
+    lines = [WARC_VERSION, f"WARC-Type: {warcType}"]
+    for name, value in headers:
+        lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(block)}")
+    head = "\r\n".join(lines).encode("utf-8")
+    return head + b"\r\n\r\n" + block + b"\r\n\r\n"
+
+
+class WARCWriter:
+    """Writes individually gzipped WARC records to a series of files in
+    a directory, starting a new file once the current file has reached
+    max_size bytes. Each file starts with a warcinfo record.
+
+    Writing is blocking, the WARCRecorder runs it in an executor.
+    """
+
+    __slots__: SlotsT = [
+        "_directory",
+        "_file",
+        "_filename",
+        "_filenames",
+        "_max_size",
+        "_prefix",
+        "_serial",
+        "_size",
+    ]
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "simplechrome",
+        max_size: int = DEFAULT_MAX_WARC_SIZE,
+    ) -> None:
+        """Initialize a new WARCWriter
+
+        :param directory: The directory the WARC files are written to
+        :param prefix: The prefix of the WARC file names
+        :param max_size: The size in bytes after which a new file is started
+        """
+        self._directory: str = directory
+        self._prefix: str = prefix
+        self._max_size: int = max_size
+        self._file: Optional[Any] = None
+        self._filename: Optional[str] = None
+        self._filenames: List[str] = []
+        self._serial: int = 0
+        self._size: int = 0
+
+    @property
+    def filename(self) -> Optional[str]:
+        """The path of the file currently being written to"""
+        return self._filename
+
+    @property
+    def filenames(self) -> List[str]:
+        """The paths of every file written to"""
+        return self._filenames
+
+    def write(self, groups: List[List[bytes]]) -> None:
+        """Compresses and writes each of the records, the records of a group
+        (e.g. a response and its request) are always written to the same file
+
+        :param groups: The groups of uncompressed WARC records
+        """
+        for records in groups:
+            if self._file is None or self._size >= self._max_size:
+                self._rotate()
+            for record in records:
+                self._writeGzipped(record)
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _writeGzipped(self, record: bytes) -> None:
+        data = gzip.compress(record)
+        self._file.write(data)
+        self._size += len(data)
+
+    def _rotate(self) -> None:
+        self.close()
+        os.makedirs(self._directory, exist_ok=True)
+        self._serial += 1
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+        name = f"{self._prefix}-{timestamp}-{self._serial:05d}.warc.gz"
+        self._filename = os.path.join(self._directory, name)
+        self._filenames.append(self._filename)
+        self._file = open(self._filename, "wb")
+        self._size = 0
+        info = "software: simplechrome\r\nformat: WARC File Format 1.0\r\n"
+        self._writeGzipped(
+            build_record(
+                "warcinfo",
+                [
+                    ("WARC-Record-ID", _record_id()),
+                    ("WARC-Date", _warc_date()),
+                    ("WARC-Filename", name),
+                    ("Content-Type", "application/warc-fields"),
+                ],
+                info.encode("utf-8"),
+            )
+        )
+
+    def __str__(self) -> str:
+        return f"WARCWriter(directory={self._directory}, filename={self._filename})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class WARCRecorder:
+    """Records the requests and responses of a page as WARC records.
+
+    Each finished request (including the requests of a redirect chain) is
+    turned into a response and request record pair. Bodies are retrieved as
+    soon as loading finishes by at most ``concurrency`` concurrent
+    ``Network.getResponseBody`` calls, each holding its slot until its record
+    pair is queued, and at most ``max_pending`` record pairs wait to be
+    written by the background writer, bounding the memory used to
+    ``concurrency + max_pending`` record pairs. Responses whose payload
+    digest was already recorded are written as revisit records. Once writing
+    fails nothing more is recorded and :meth:`stop` raises the error.
+
+    Usage::
+
+        async with WARCRecorder(page, "warcs"):
+            await page.goto(url)
+    """
+
+    __slots__: SlotsT = [
+        "__weakref__",
+        "_concurrency",
+        "_dedupe",
+        "_digests",
+        "_listeners",
+        "_loop",
+        "_networkManager",
+        "_records",
+        "_tasks",
+        "_writer",
+    ]
+
+    def __init__(
+        self,
+        target: Union["Page", "NetworkManager"],
+        directory: str,
+        prefix: str = "simplechrome",
+        max_size: int = DEFAULT_MAX_WARC_SIZE,
+        concurrency: int = 4,
+        max_pending: int = 64,
+        dedupe: bool = True,
+        loop: OptionalLoop = None,
+    ) -> None:
+        """Initialize a new WARCRecorder
+
+        :param target: The page or network manager to be recorded
+        :param directory: The directory the WARC files are written to
+        :param prefix: The prefix of the WARC file names
+        :param max_size: The size in bytes after which a new WARC file is started
+        :param concurrency: The maximum number of bodies retrieved or waiting
+         to be queued at once
+        :param max_pending: The maximum number of record pairs waiting to be written
+        :param dedupe: Should revisit records be written for duplicate payloads
+        :param loop: Optional asyncio event loop to use
+        """
+        self._networkManager: "NetworkManager" = getattr(
+            target, "network_manager", target
+        )
+        self._loop: Loop = Helper.ensure_loop(loop)
+        self._writer: WARCWriter = WARCWriter(directory, prefix, max_size)
+        self._concurrency: Semaphore = Semaphore(concurrency, loop=self._loop)
+        self._records: BatchWriter = BatchWriter(
+            self._writer.write, max_pending, self._loop
+        )
+        self._dedupe: bool = dedupe
+        # payload digest -> (target URI, WARC-Date) of the first record with it
+        self._digests: Dict[str, Tuple[str, str]] = {}
+        self._tasks: Set[Task] = set()
+        self._listeners: List[EEListener] = []
+
+    @property
+    def writer(self) -> WARCWriter:
+        return self._writer
+
+    @property
+    def recording(self) -> bool:
+        return self._records.running
+
+    def start(self) -> None:
+        """Start recording"""
+        if self._records.running:
+            return
+        self._records.start()
+        self._listeners.append(
+            Helper.addEventListener(
+                self._networkManager,
+                Events.NetworkManager.RequestFinished,
+                self._onRequestFinished,
+            )
+        )
+
+    async def stop(self) -> None:
+        """Stop recording, waiting for every finished request to be written.
+        Raises the error writing the WARC file failed with, if any"""
+        if not self._records.running:
+            return
+        Helper.removeEventListeners(self._listeners)
+        if self._tasks:
+            await gather(*self._tasks, loop=self._loop, return_exceptions=True)
+        try:
+            await self._records.close()
+        finally:
+            await self._loop.run_in_executor(None, self._writer.close)
+
+    def _onRequestFinished(self, request: "Request") -> None:
+        if request.url.startswith("data:") or request.response is None:
+            return
+        task = self._loop.create_task(self._capture(request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture(self, request: "Request") -> None:
+        response: "Response" = request.response
+        # the slot is held until the records are queued so that at most
+        # concurrency bodies are held while waiting for the writer
+        async with self._concurrency:
+            if self._records.error is not None:
+                # writing failed, nothing more is recorded
+                return
+            body = b""
+            # the requests of a redirect chain share the requestId of the final
+            # request so only the final request has a body to retrieve
+            if request not in request.redirectChain:
+                body = await self._responseBody(response)
+            postData = request.postData
+            if postData is None and request.hasPostData:
+                try:
+                    postData = await request.get_post_data()
+                except Exception:
+                    postData = None
+            await self._records.put(
+                self._buildRecords(request, response, body, postData)
+            )
+
+    async def _responseBody(self, response: "Response") -> bytes:
+        try:
+            # do not use buffer() which keeps the body alive with the response
+            if response._contentPromise is not None:
+                body = await response._contentPromise
+            else:
+                body = await response._bufread()
+        except Exception:
+            return b""
+        if isinstance(body, str):
+            return body.encode("utf-8")
+        return body
+
+    def _buildRecords(
+        self,
+        request: "Request",
+        response: "Response",
+        body: bytes,
+        postData: Optional[str],
+    ) -> List[bytes]:
+        uri = response.url or request.url
+        date = _warc_date(request.wallTime)
+        responseId = _record_id()
+
+        statusText = response.statusText
+        head = [f"HTTP/1.1 {response.status} {statusText}".rstrip()]
+        for line in _header_lines(response.headers):
+            name = line.split(":", 1)[0].lower()
+            if name in _DROPPED_RESPONSE_HEADERS or name == "content-length":
+                continue
+            head.append(line)
+        head.append(f"Content-Length: {len(body)}")
+        httpHead = ("\r\n".join(head) + "\r\n\r\n").encode("utf-8")
+
+        warcHeaders: WARCHeaders = [
+            ("WARC-Record-ID", responseId),
+            ("WARC-Date", date),
+            ("WARC-Target-URI", uri),
+        ]
+        ip = response.remoteIPAddress
+        if ip:
+            warcHeaders.append(("WARC-IP-Address", ip))
+        payloadDigest = _digest(body)
+        original = self._digests.get(payloadDigest) if body and self._dedupe else None
+        if original is not None:
+            warcHeaders.extend(
+                [
+                    ("WARC-Profile", REVISIT_PROFILE),
+                    ("WARC-Refers-To-Target-URI", original[0]),
+                    ("WARC-Refers-To-Date", original[1]),
+                    ("WARC-Payload-Digest", payloadDigest),
+                    ("Content-Type", "application/http; msgtype=response"),
+                ]
+            )
+            responseRecord = build_record("revisit", warcHeaders, httpHead)
+        else:
+            if body:
+                self._digests[payloadDigest] = (uri, date)
+            block = httpHead + body
+            warcHeaders.extend(
+                [
+                    ("WARC-Payload-Digest", payloadDigest),
+                    ("WARC-Block-Digest", _digest(block)),
+                    ("Content-Type", "application/http; msgtype=response"),
+                ]
+            )
+            responseRecord = build_record("response", warcHeaders, block)
+
+        url = urlsplit(request.url)
+        path = url.path or "/"
+        if url.query:
+            path = f"{path}?{url.query}"
+        requestHeaders = response.requestHeaders or request.headers or {}
+        head = [f"{request.method} {path} HTTP/1.1"]
+        if not any(name.lower() == "host" for name in requestHeaders):
+            head.append(f"Host: {url.netloc}")
+        head.extend(_header_lines(requestHeaders))
+        block = ("\r\n".join(head) + "\r\n\r\n").encode("utf-8")
+        if postData:
+            block += postData.encode("utf-8")
+        requestRecord = build_record(
+            "request",
+            [
+                ("WARC-Record-ID", _record_id()),
+                ("WARC-Date", date),
+                ("WARC-Target-URI", request.url),
+                ("WARC-Concurrent-To", responseId),
+                ("WARC-Block-Digest", _digest(block)),
+                ("Content-Type", "application/http; msgtype=request"),
+            ],
+            block,
+        )
+        return [responseRecord, requestRecord]
+
+    async def __aenter__(self) -> "WARCRecorder":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def __str__(self) -> str:
+        return f"WARCRecorder(recording={self.recording}, writer={self._writer})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
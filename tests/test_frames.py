@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import pytest
 from grappa import should
@@ -288,3 +289,59 @@ class TestFrameManagement(BaseChromeTest):
         frame1.parentFrame | should.be.equal.to(None)
         frame2.parentFrame | should.be.equal.to(frame1)
         frame3.parentFrame | should.be.equal.to(frame1)
+
+    @pytest.mark.asyncio
+    async def test_frame_subtree_lifecycle(self):
+        await self.reset_and_goto_test("nested-frames.html", waitUntil="load")
+        mainFrame = self.page.mainFrame
+        mainFrame._lifecycleComplete(["load"]) | should.be.true
+        for frame in self.page.frames:
+            frame._subtreePending["load"] | should.be.equal.to(0)
+        await TestUtil.attachFrame(
+            self.page, "frame1", self.full_test_url("empty.html")
+        )
+        mainFrame._lifecycleComplete(["load"]) | should.be.true
+        await TestUtil.detachFrame(self.page, "frame1")
+        mainFrame._lifecycleComplete(["load"]) | should.be.true
+
+    @pytest.mark.asyncio
+    async def test_frame_manager_stats_detached_frames(self):
+        await self.reset_and_goto_empty()
+        before = self.page.frame_manager.stats()
+        await TestUtil.attachFrame(
+            self.page, "frame1", self.full_test_url("empty.html")
+        )
+        await self.page.frames[1].evaluate("1 + 1")
+        during = self.page.frame_manager.stats()
+        during["frames"] | should.be.equal.to(before["frames"] + 1)
+        during["contexts"] | should.be.higher.than(before["contexts"])
+        await TestUtil.detachFrame(self.page, "frame1")
+        after = self.page.frame_manager.stats()
+        after["frames"] | should.be.equal.to(before["frames"])
+        after["contexts"] | should.be.equal.to(before["contexts"])
+
+    @pytest.mark.asyncio
+    async def test_frame_scoped_network_idle(self):
+        await self.reset_and_goto_empty()
+        await TestUtil.attachFrame(
+            self.page, "frame1", self.full_test_url("empty.html")
+        )
+        mainFrame = self.page.mainFrame
+        child = self.page.frames[1]
+        # keep a request of the child frame in flight for 6 seconds
+        await child.evaluate(
+            "url => { fetch(url).catch(() => null); }",
+            self.tserver_endpoint_url("never-loads"),
+        )
+        start = time.monotonic()
+        stats = await mainFrame.network_idle_waiter(
+            scope="self", idle_time=0.25, timeout=10
+        )
+        stats["reached"] | should.be.equal.to("idle")
+        (time.monotonic() - start) | should.be.lower.than(3)
+        # the request is still in flight, the subtree never goes idle
+        stats = await mainFrame.network_idle_waiter(
+            scope="subtree", idle_time=0.25, timeout=1
+        )
+        stats["reached"] | should.be.equal.to("globalWait")
+        stats["maxInflight"] | should.be.equal.to(1)
@@ -5,8 +5,8 @@ import pytest
 from async_timeout import timeout
 from grappa import should
 
-from simplechrome.errors import NetworkError
-from simplechrome.launcher import Launcher, launch
+from simplechrome.errors import LauncherError, NetworkError
+from simplechrome.launcher import Launcher, launch, network_args
 
 
 class TestLauncher:
@@ -75,3 +75,42 @@ class TestLauncher:
     async def test_invalid_executable_path(self):
         with pytest.raises(FileNotFoundError):
             await launch(executablePath="not-a-path")
+
+    def test_network_args(self):
+        args = network_args(
+            dict(
+                hostResolverRules={
+                    "ads.example.com": "~NOTFOUND",
+                    "*.example.com": "127.0.0.1:8888",
+                    "localhost": None,
+                },
+                proxyServer={"http": "localhost:8080", "https": "localhost:8443"},
+                proxyBypassList=["<local>", "*.internal"],
+            )
+        )
+        args | should.be.equal.to(
+            [
+                "--host-resolver-rules=MAP ads.example.com ~NOTFOUND, "
+                "MAP *.example.com 127.0.0.1:8888, EXCLUDE localhost",
+                "--proxy-server=http=localhost:8080;https=localhost:8443",
+                "--proxy-bypass-list=<local>;*.internal",
+            ]
+        )
+        network_args({}) | should.be.empty
+
+    def test_network_args_validated(self):
+        invalid = [
+            dict(hostResolverRules={"example.com": "127.0.0.1:99999"}),
+            dict(hostResolverRules={"example .com": "127.0.0.1"}),
+            dict(hostResolverRules=["MAP * 127.0.0.1"]),
+            dict(proxyServer="ftp://localhost:21"),
+            dict(proxyServer={"ws": "localhost:8080"}),
+            dict(proxyBypassList=["*.internal"]),
+            dict(proxyServer="localhost:8080", proxyBypassList=["a;b"]),
+            dict(
+                proxyServer="localhost:8080", args=["--proxy-server=localhost:9090"]
+            ),
+        ]
+        for opts in invalid:
+            with pytest.raises(LauncherError):
+                network_args(opts)
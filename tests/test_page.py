@@ -1,12 +1,27 @@
 import asyncio
+import gzip
+import json
 import math
+import os
 import time
+from pathlib import Path
 
 import pytest
 from grappa import should
 
-from simplechrome.errors import NavigationError, EvaluationError
+from simplechrome.body_capture import BodyCapturePolicy
+from simplechrome.cookie_jar import CookieJar
+from simplechrome.errors import NavigationError, EvaluationError, WaitTimeoutError
 from simplechrome.events import Events
+from simplechrome.interception import (
+    AbortRequest,
+    FulfillRequest,
+    InterceptionAction,
+    InterceptionRule,
+)
+from simplechrome.replay_cache import ReplayCache, cache_key
+from simplechrome.settle import SettleCondition
+from simplechrome.warc import WARCRecorder
 from .base_test import BaseChromeTest
 from .utils import TestUtil
 
@@ -40,6 +55,85 @@ class TestPage(BaseChromeTest):
         result = await self.page.evaluate("() => Promise.resolve(8 * 7)")
         result | should.be.equal.to(56)
 
+    @pytest.mark.asyncio
+    async def test_evaluate_many(self):
+        await self.goto_empty(waitUntil="load")
+        body = await self.page.querySelector("body")
+        results = await self.page.evaluate_many(
+            [
+                "() => 7 * 3",
+                ("(a, b) => Promise.resolve(a + b)", [1, 2]),
+                "() => { throw new Error('boom') }",
+                ("el => el.tagName", [body]),
+                "document.location.href",
+            ]
+        )
+        results[0] | should.be.equal.to(21)
+        results[1] | should.be.equal.to(3)
+        results[2] | should.be.an.instance.of(EvaluationError)
+        str(results[2]) | should.contain("boom")
+        results[3] | should.be.equal.to("BODY")
+        results[4] | should.be.equal.to(self.full_test_url("empty.html"))
+        with pytest.raises(EvaluationError):
+            await self.page.evaluate_many(
+                ["() => 1", "() => { throw new Error('boom') }"],
+                return_exceptions=False,
+            )
+        # a function that does not compile only fails its own call
+        results = await self.page.evaluate_many(["() => 1", "() => {"])
+        results[0] | should.be.equal.to(1)
+        results[1] | should.be.an.instance.of(EvaluationError)
+        # a result that can not be returned by value only fails its own call
+        # and no page function is run twice
+        results = await self.page.evaluate_many(
+            [
+                "() => (window.__runs = (window.__runs || 0) + 1)",
+                "() => { const a = {}; a.a = a; return a; }",
+            ]
+        )
+        results[0] | should.be.equal.to(1)
+        results[1] | should.be.an.instance.of(EvaluationError)
+        await self.page.evaluate("() => window.__runs") | should.be.equal.to(1)
+
+    @pytest.mark.asyncio
+    async def test_evaluate_helper(self):
+        await self.goto_empty(waitUntil="load")
+        helper = "function add(a, b) { return a + b; }"
+        await self.page.evaluate_helper("add", helper, 1, 2) | should.be.equal.to(3)
+        await self.page.evaluate_helper("add", helper, 3, 4) | should.be.equal.to(7)
+        context = await self.page.mainFrame.executionContext()
+        installed = await context.install_helper("add", helper)
+        await context.install_helper("add", helper) | should.be(installed)
+        await self.goto_empty(waitUntil="load")
+        await self.page.evaluate_helper("add", helper, 5, 6) | should.be.equal.to(11)
+        # a different source under the same name replaces the helper
+        multiply = "function multiply(a, b) { return a * b; }"
+        await self.page.evaluate_helper("add", multiply, 5, 6) | should.be.equal.to(30)
+        await self.page.evaluate_helper("add", helper, 5, 6) | should.be.equal.to(11)
+
+    @pytest.mark.asyncio
+    async def test_handle_scope(self):
+        await self.goto_empty(waitUntil="load")
+        ready = asyncio.Event()
+
+        async def concurrently():
+            await ready.wait()
+            return await self.page.evaluateHandle("() => ({outside: true})")
+
+        # created outside of the scope, its handles do not belong to it
+        task = asyncio.ensure_future(concurrently())
+        async with self.page.handle_scope() as scope:
+            inside = await self.page.evaluateHandle("() => ({answer: 42})")
+            await inside.jsonValue() | should.be.equal.to({"answer": 42})
+            ready.set()
+            outside = await task
+            scope.released | should.be.false
+        scope.released | should.be.true
+        with pytest.raises(Exception):
+            await inside.jsonValue()
+        await outside.jsonValue() | should.be.equal.to({"outside": True})
+        await outside.dispose()
+
     @pytest.mark.asyncio
     async def test_after_framenavigation(self, ee_helper):
         frameEvaluation = asyncio.get_event_loop().create_future()
@@ -94,6 +188,13 @@ class TestPage(BaseChromeTest):
         result = await self.page.evaluate("() => -Infinity")
         result | should.be.equal.to(-math.inf)
 
+    @pytest.mark.asyncio
+    async def test_return_cyclic_object(self):
+        await self.goto_empty(waitUntil="load")
+        result = await self.page.evaluate("() => { const a = {}; a.a = a; return a; }")
+        result | should.be.none
+        await self.page.evaluate("() => 1 + 1") | should.be.equal.to(2)
+
     @pytest.mark.asyncio
     async def test_accept_none(self):
         await self.goto_empty(waitUntil="load")
@@ -455,3 +556,548 @@ console.log(Promise.resolve('should not wait until resolved!'));
             NavigationError, match="Navigation Timeout Exceeded: 3 seconds exceeded"
         ):
             await self.goto_never_loads(waitUntil="load", timeout=3)
+
+    @pytest.mark.asyncio
+    async def test_browser_context_crawl(self):
+        urls = [self.full_test_url("empty.html"), self.full_test_url("grid.html")]
+
+        async def title_of(page, response):
+            return await page.evaluate("() => location.href")
+
+        context = self.page.target.browserContext
+        results = []
+        async for result in context.crawl(urls, concurrency=2, on_page=title_of):
+            results.append(result)
+        len(results) | should.be.equal.to(2)
+        for result in results:
+            result.ok | should.be.true
+            result.response.ok | should.be.true
+            result.value | should.be.equal.to(result.url)
+
+    @pytest.mark.asyncio
+    async def test_navigation_timing(self):
+        timings = []
+        self.page.once(Events.Page.NavigationTiming, timings.append)
+        response = await self.goto_test("empty.html")
+        timing = response.navigation_timing
+        timing | should.not_be.none
+        timings | should.have.length.of(1)
+        timings[0] | should.be(timing)
+        timing.url | should.be.equal.to(self.full_test_url("empty.html"))
+        timing.redirectCount | should.be.equal.to(0)
+        timing.lifecycle | should.have.key("load")
+        timing.elapsed("load") | should.be.higher.than(0)
+        timing.elapsed("response") | should.be.lower.than(timing.elapsed("load"))
+
+    @pytest.mark.asyncio
+    async def test_goto_wait_until_settled(self):
+        condition = SettleCondition(
+            network_idle=0.2, dom_idle=0.2, predicate="() => !!document.body"
+        )
+        response = await self.goto_test("grid.html", waitUntil=condition)
+        response.ok | should.be.true
+        since_mutation = await self.page.evaluate(
+            "() => performance.now() - window.__simplechrome_settle__.lastMutation"
+        )
+        since_mutation | should.be.higher.than(200)
+        await self.page.waitForSettled(SettleCondition(network_idle=None), timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_settled_tracks_early_timers(self):
+        condition = SettleCondition(network_idle=None, dom_idle=None)
+        url = (
+            "data:text/html,<script>"
+            "setTimeout(() => { window.__fired = true; }, 300)</script>"
+        )
+        await self.page.goto(url, waitUntil=condition)
+        await self.page.evaluate("() => window.__fired") | should.be.true
+        with pytest.raises(EvaluationError):
+            await self.page.waitForSettled(
+                SettleCondition(
+                    network_idle=None, predicate="() => { throw new Error('x') }"
+                ),
+                timeout=5,
+            )
+
+    @pytest.mark.asyncio
+    async def test_settled_awaits_async_predicate(self):
+        await self.goto_empty()
+        # a pending promise is truthy, only its resolved value counts
+        with pytest.raises(WaitTimeoutError):
+            await self.page.waitForSettled(
+                SettleCondition(
+                    network_idle=None, predicate="async () => false", poll_interval=0.05
+                ),
+                timeout=1,
+            )
+        await self.page.waitForSettled(
+            SettleCondition(
+                network_idle=None,
+                predicate="async expected => (await Promise.resolve(1)) === expected",
+                predicate_args=[1],
+            ),
+            timeout=5,
+        )
+
+    @pytest.mark.asyncio
+    async def test_response_save_streams_paused_body(self, tmp_path):
+        await self.goto_empty()
+        await self.page.setResponseInterception(True)
+        target = str(tmp_path / "style.css")
+        saves = []
+
+        def on_paused(response):
+            if response.url.endswith("style.css"):
+                saves.append(response.save(target, chunk_size=16))
+
+        self.page.on(Events.Page.ResponsePaused, on_paused)
+        try:
+            await self.page.evaluate(
+                "url => fetch(url).catch(() => null)", self.full_test_url("style.css")
+            )
+        finally:
+            self.page.remove_listener(Events.Page.ResponsePaused, on_paused)
+            await self.page.setResponseInterception(False)
+        saves | should.have.length.of(1)
+        written = await saves[0]
+        with open(Path(__file__).parent / "static" / "style.css", "rb") as served:
+            expected = served.read()
+        written | should.be.equal.to(len(expected))
+        with open(target, "rb") as saved:
+            saved.read() | should.be.equal.to(expected)
+
+    @pytest.mark.asyncio
+    async def test_response_stream_closed_unread_continues(self):
+        await self.goto_empty()
+        await self.page.setResponseInterception(True)
+        closes = []
+
+        def on_paused(response):
+            if response.url.endswith("style.css"):
+                closes.append(asyncio.ensure_future(response.stream().aclose()))
+
+        self.page.on(Events.Page.ResponsePaused, on_paused)
+        try:
+            text = await self.page.evaluate(
+                "url => fetch(url).then(r => r.text())", self.full_test_url("style.css")
+            )
+        finally:
+            self.page.remove_listener(Events.Page.ResponsePaused, on_paused)
+            await self.page.setResponseInterception(False)
+        closes | should.have.length.of(1)
+        with open(Path(__file__).parent / "static" / "style.css") as served:
+            text | should.be.equal.to(served.read())
+
+    @pytest.mark.asyncio
+    async def test_interception_rules(self, tmp_path):
+        await self.goto_empty()
+        await self.page.setInterceptionRules(
+            [
+                InterceptionRule(AbortRequest(), url="*/style.css"),
+                InterceptionRule(
+                    FulfillRequest(body="fulfilled", contentType="text/plain"),
+                    url="*/fulfill-me",
+                    methods=["GET"],
+                ),
+                # a numbered backreference is not broken by the other rules
+                InterceptionRule(
+                    FulfillRequest(body="echoed", contentType="text/plain"),
+                    regex=r"/(echo)-\1$",
+                ),
+                InterceptionRule(
+                    FulfillRequest(path=str(tmp_path / "missing.txt")),
+                    url="*/missing-file",
+                ),
+            ]
+        )
+        try:
+            results = await self.page.evaluate(
+                """urls => Promise.all(urls.map(url => fetch(url).then(
+                    response => response.text(), () => null
+                )))""",
+                [
+                    self.full_test_url("style.css"),
+                    self.full_test_url("fulfill-me"),
+                    self.full_test_url("empty.html"),
+                    self.full_test_url("echo-echo"),
+                    self.full_test_url("missing-file"),
+                ],
+            )
+        finally:
+            await self.page.setInterceptionRules(None)
+        results[0] | should.be.none
+        results[1] | should.be.equal.to("fulfilled")
+        results[2] | should.be.a(str)
+        results[3] | should.be.equal.to("echoed")
+        # an unreadable file fails the request instead of leaving it paused
+        results[4] | should.be.none
+
+    @pytest.mark.asyncio
+    async def test_failing_interception_action_continues_request(self):
+        class RaisingAction(InterceptionAction):
+            async def apply(self, client, event):
+                raise RuntimeError("the action failed")
+
+        await self.goto_empty()
+        before = self.page.network_manager.stats()["interception"]
+        await self.page.setInterceptionRules(
+            [InterceptionRule(RaisingAction(), url="*/style.css")]
+        )
+        try:
+            text = await self.page.evaluate(
+                "url => fetch(url).then(r => r.text())", self.full_test_url("style.css")
+            )
+        finally:
+            await self.page.setInterceptionRules(None)
+        with open(Path(__file__).parent / "static" / "style.css") as served:
+            text | should.be.equal.to(served.read())
+        stats = self.page.network_manager.stats()["interception"]
+        stats["errors"]["RaisingAction"] | should.be.equal.to(
+            before["errors"].get("RaisingAction", 0) + 1
+        )
+        stats["paused"] | should.be.equal.to(0)
+
+    @pytest.mark.asyncio
+    async def test_replay_cache(self, tmp_path):
+        cache = ReplayCache(str(tmp_path))
+        async with cache.recorder(self.page):
+            recorded = await self.goto_test("grid.html")
+        len(cache) | should.be.above(0)
+        await self.page.setInterceptionRules([cache.rule(offline=True)])
+        try:
+            replayed = await self.goto_test("grid.html")
+            replayed.status | should.be.equal.to(recorded.status)
+            (await replayed.text()) | should.be.equal.to(await recorded.text())
+            with pytest.raises(NavigationError):
+                await self.goto_test("empty.html")
+            # a deleted payload is a cache miss rather than a hung request
+            key = cache_key("GET", self.full_test_url("grid.html"), None)
+            os.remove(cache.payload_path(cache.lookup(key)["digest"]))
+            with pytest.raises(NavigationError):
+                await self.goto_test("grid.html")
+        finally:
+            await self.page.setInterceptionRules(None)
+            cache.close()
+
+    @pytest.mark.asyncio
+    async def test_network_manager_request_tables(self):
+        await self.goto_test("grid.html", waitUntil="networkidle0")
+        networkManager = self.page.network_manager
+        networkManager.inflight() | should.have.length.of(0)
+        stats = networkManager.requestTableStats()
+        stats | should.have.keys("requests", "requestWillBeSent", "interceptionIds")
+        stats["requests"]["size"] | should.be.equal.to(0)
+        stats["requestWillBeSent"]["ttl"] | should.be.above(0)
+
+    @pytest.mark.asyncio
+    async def test_network_manager_request_table_eviction(self):
+        await self.goto_test("empty.html")
+        networkManager = self.page.network_manager
+        client = networkManager._client
+        frameId = self.page.mainFrame.id
+        url = self.full_test_url("synthetic")
+
+        # requests the browser never reports finished (https://crbug.com/750469)
+        def will_be_sent(requestId):
+            client.emit(
+                "Network.requestWillBeSent",
+                {
+                    "requestId": requestId,
+                    "loaderId": "previous-document",
+                    "frameId": frameId,
+                    "documentURL": url,
+                    "request": {"url": url, "method": "GET", "headers": {}},
+                    "timestamp": 0,
+                    "type": "Fetch",
+                },
+            )
+
+        def response_received(requestId):
+            client.emit(
+                "Network.responseReceived",
+                {
+                    "requestId": requestId,
+                    "loaderId": "previous-document",
+                    "frameId": frameId,
+                    "timestamp": 0,
+                    "type": "Fetch",
+                    "response": {"url": url, "status": 200, "headers": {}},
+                },
+            )
+
+        def tracked():
+            return {request.requestId for request in networkManager.inflight()}
+
+        evicted = networkManager.requestTableStats()["requests"]["evicted"]
+        try:
+            networkManager.setRequestTableLimits(maxRequests=2)
+            for requestId in ("size-1", "size-2", "size-3"):
+                will_be_sent(requestId)
+            tracked() | should.be.equal.to({"size-2", "size-3"})
+
+            networkManager.setRequestTableLimits(requestTTL=0.1)
+            await asyncio.sleep(0.2)
+            will_be_sent("ttl")
+            tracked() | should.be.equal.to({"ttl"})
+
+            networkManager.setRequestTableLimits()
+            will_be_sent("responded")
+            response_received("responded")
+            await self.goto_test("grid.html")
+            # only the request still waiting for its response survives the
+            # navigation of its frame
+            (tracked() & {"ttl", "responded"}) | should.be.equal.to({"ttl"})
+        finally:
+            networkManager.setRequestTableLimits()
+            client.emit(
+                "Network.loadingFailed",
+                {"requestId": "ttl", "timestamp": 0, "errorText": "net::ERR_ABORTED"},
+            )
+        stats = networkManager.requestTableStats()["requests"]
+        stats["evicted"] | should.be.at.least(evicted + 4)
+
+    @pytest.mark.asyncio
+    async def test_network_manager_stats(self):
+        networkManager = self.page.network_manager
+        networkManager.resetStats()
+        await self.goto_test("grid.html", waitUntil="networkidle0")
+        stats = networkManager.stats()
+        requests = stats["requests"]
+        requests["started"] | should.be.above(0)
+        requests["finished"] | should.be.equal.to(requests["started"])
+        requests["inflight"] | should.be.equal.to(0)
+        requests["inflightHighWater"] | should.be.above(0)
+        stats["bytes"]["total"] | should.be.above(0)
+        stats["bytes"]["byResourceType"] | should.have.key("Document")
+        stats["bytes"]["byOrigin"] | should.have.length.of(1)
+        stats["ttfb"]["count"] | should.be.above(0)
+        stats["ttfb"]["p50"] | should.be.at.most(stats["ttfb"]["p99"])
+
+    @pytest.mark.asyncio
+    async def test_interception_dispatcher_stats(self):
+        before = self.page.network_manager.stats()["interception"]
+        await self.page.setRequestInterception(True)
+        self.page.on(
+            Events.Page.Request,
+            lambda request: asyncio.ensure_future(request.continue_()),
+        )
+        try:
+            await self.goto_test("grid.html")
+        finally:
+            self.page.remove_all_listeners(Events.Page.Request)
+            await self.page.setRequestInterception(False)
+        stats = self.page.network_manager.stats()["interception"]
+        stats["completed"] | should.be.above(before["completed"])
+        stats["errors"] | should.be.equal.to(before["errors"])
+        stats["paused"] | should.be.equal.to(0)
+        stats["pauseLatency"]["count"] | should.be.above(
+            before["pauseLatency"]["count"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_block_resource_types_and_url_patterns(self):
+        networkManager = self.page.network_manager
+        networkManager.resetStats()
+        failed = []
+        self.page.on(Events.Page.RequestFailed, failed.append)
+        await self.page.block_resource_types({"Image"})
+        await self.page.block_url_patterns(["*.css"])
+        try:
+            await self.goto_test("grid.html", waitUntil="networkidle0")
+            await self.goto_test("frame.html", waitUntil="networkidle0")
+        finally:
+            self.page.remove_listener(Events.Page.RequestFailed, failed.append)
+            await self.page.block_resource_types(None)
+            await self.page.block_url_patterns(None)
+        blocked = networkManager.stats()["blocked"]
+        blocked["byResourceType"]["Image"] | should.be.above(0)
+        blocked["byURLPattern"] | should.be.equal.to(1)
+        urls = [request.url for request in failed]
+        urls | should.contain(self.full_test_url("style.css"))
+        any(url.endswith(".png") for url in urls) | should.be.true
+
+    @pytest.mark.asyncio
+    async def test_network_idle_ignores_url_patterns(self):
+        await self.goto_test("empty.html")
+        # a fetch every 50ms would keep the network busy if it were considered
+        interval = await self.page.evaluate(
+            "() => setInterval(() => fetch('/empty.html?poll=' + Math.random()), 50)"
+        )
+        try:
+            stats = await self.page.network_idle_promise(
+                num_inflight=0,
+                idle_time=0.25,
+                global_wait=10,
+                safety_window=None,
+                ignored_urls=["*?poll=*"],
+            )
+        finally:
+            await self.page.evaluate("id => clearInterval(id)", interval)
+        stats["reached"] | should.be.equal.to("idle")
+        stats["ignored"] | should.be.above(0)
+        stats["elapsed"] | should.be.lower.than(5)
+
+    @pytest.mark.asyncio
+    async def test_fetch_bodies(self):
+        await self.goto_test("grid.html", waitUntil="load")
+        retained = self.page.network_manager.finished()
+        retained | should.not_be.empty
+        urls = []
+
+        async def sink(response, body):
+            urls.append(response.url)
+            body | should.be.a(bytes)
+
+        result = await self.page.fetch_bodies(
+            lambda response: response.request.resourceType == "Document",
+            concurrency=4,
+            sink=sink,
+        )
+        result.fetched | should.be.equal.to(len(urls))
+        urls | should.contain(self.full_test_url("grid.html"))
+        result.bodies | should.be.empty
+        result = await self.page.fetch_bodies(concurrency=2)
+        (result.fetched + len(result.evicted)) | should.be.above(len(urls) - 1)
+        result.failed | should.be.empty
+
+    @pytest.mark.asyncio
+    async def test_compact_records(self):
+        self.page.setCompactRecords(True)
+        try:
+            response = await self.goto_test("grid.html")
+        finally:
+            self.page.setCompactRecords(False)
+        request = response.request
+        request.compact | should.be.true
+        response.compact | should.be.true
+        request.url | should.be.equal.to(self.full_test_url("grid.html"))
+        request.method | should.be.equal.to("GET")
+        request.resourceType | should.be.equal.to("Document")
+        response.status | should.be.equal.to(200)
+        response.headers | should.be.a(dict)
+        request.as_dict | should.not_have.key("initiator")
+        request.as_dict["request"]["url"] | should.be.equal.to(request.url)
+        response.as_dict["response"]["status"] | should.be.equal.to(200)
+
+    @pytest.mark.asyncio
+    async def test_body_capture_policy_spills_to_disk(self, tmp_path):
+        self.page.setBodyCapturePolicy(
+            BodyCapturePolicy(
+                mime_types=["text/*"],
+                spill_threshold=0,
+                spill_directory=str(tmp_path),
+            )
+        )
+        try:
+            response = await self.goto_test("grid.html")
+        finally:
+            self.page.setBodyCapturePolicy(None)
+        captured = response.captured_body
+        captured | should.not_be.none
+        body = await captured.read()
+        captured.spilled | should.be.true
+        captured.size | should.be.equal.to(len(body))
+        (await response.text()) | should.be.equal.to(body.decode("utf-8"))
+        captured.release()
+        list(tmp_path.iterdir()) | should.have.length.of(0)
+
+    @pytest.mark.asyncio
+    async def test_har_recorder(self, tmp_path):
+        path = str(tmp_path / "capture.har")
+        policy = BodyCapturePolicy(resource_types=["Document"])
+        async with self.page.har_recorder(path, capture_policy=policy) as recorder:
+            await self.goto_test("grid.html", waitUntil="load")
+        recorder.entryCount | should.be.above(0)
+        with open(path, "r") as har_in:
+            log = json.load(har_in)["log"]
+        log["version"] | should.be.equal.to("1.2")
+        log["pages"] | should.have.length.of(1)
+        url = self.full_test_url("grid.html")
+        entry = next(e for e in log["entries"] if e["request"]["url"] == url)
+        entry["response"]["status"] | should.be.equal.to(200)
+        entry["response"]["content"]["encoding"] | should.be.equal.to("base64")
+        entry["pageref"] | should.be.equal.to(log["pages"][0]["id"])
+        entry["timings"] | should.have.keys("blocked", "dns", "send", "wait", "receive")
+        self.page.network_manager.body_capture | should.be.none
+
+    @pytest.mark.asyncio
+    async def test_har_recorder_write_error(self, tmp_path):
+        # the HAR file can not be opened inside a missing directory
+        path = str(tmp_path / "missing" / "capture.har")
+        recorder = self.page.har_recorder(path, max_pending=1, concurrency=1)
+        with pytest.raises(OSError):
+            async with recorder:
+                await self.goto_test("grid.html", waitUntil="load")
+        recorder.recording | should.be.false
+
+    @pytest.mark.asyncio
+    async def test_cookie_jar(self, tmp_path):
+        path = str(tmp_path / "cookies.jsonl")
+        await self.goto_test("grid.html")
+        await self.page.setCookie({"name": "jar", "value": "1"})
+        jar = CookieJar(path)
+        changed = await jar.update_from(self.page)
+        changed | should.be.above(0)
+        await jar.update_from(self.page) | should.be.equal.to(0)
+        await self.page.network_manager.clearBrowserCookies()
+        await jar.load_into(self.page) | should.be.equal.to(len(jar))
+        cookies = await self.page.cookies()
+        [cookie["name"] for cookie in cookies] | should.contain("jar")
+        len(CookieJar(path)) | should.be.equal.to(len(jar))
+        await self.page.network_manager.clearBrowserCookies()
+
+    @pytest.mark.asyncio
+    async def test_cookie_jar_compaction_and_recovery(self, tmp_path):
+        path = tmp_path / "cookies.jsonl"
+
+        def cookie(name, value):
+            return {"name": name, "value": value, "domain": "example.com", "path": "/"}
+
+        jar = CookieJar(str(path))
+        for value in range(100):
+            await jar.update([cookie("a", str(value))])
+        # superseded lines were dropped by rewriting the file
+        len(path.read_text().splitlines()) | should.be.below(100)
+        CookieJar(str(path)).cookies() | should.be.equal.to([cookie("a", "99")])
+        # concurrent updates, including compactions, are written in order
+        await asyncio.gather(*[jar.update([cookie("a", f"c{v}")]) for v in range(100)])
+        CookieJar(str(path)).cookies() | should.be.equal.to([cookie("a", "c99")])
+
+        # a partially written final line is ignored and not truncated on load
+        with open(path, "ab") as jar_out:
+            jar_out.write(b'{"set":{"name":"b","val')
+        size = path.stat().st_size
+        recovered = CookieJar(str(path))
+        recovered.cookies() | should.be.equal.to([cookie("a", "c99")])
+        path.stat().st_size | should.be.equal.to(size)
+        await recovered.update([cookie("b", "1")])
+        reloaded = CookieJar(str(path))
+        len(reloaded) | should.be.equal.to(2)
+        path.read_bytes().endswith(b"\n") | should.be.true
+
+    @pytest.mark.asyncio
+    async def test_warc_recorder(self, tmp_path):
+        async with WARCRecorder(self.page, str(tmp_path)) as recorder:
+            await self.goto_test("grid.html")
+            await self.goto_test("grid.html")
+        recorder.writer.filenames | should.have.length.of(1)
+        with gzip.open(recorder.writer.filenames[0], "rb") as warc:
+            records = warc.read()
+        records | should.contain(b"WARC-Type: warcinfo")
+        records | should.contain(b"WARC-Type: response")
+        records | should.contain(b"WARC-Type: request")
+        records | should.contain(b"WARC-Type: revisit")
+        records | should.contain(self.full_test_url("grid.html").encode("utf-8"))
+
+    @pytest.mark.asyncio
+    async def test_warc_recorder_write_error(self, tmp_path):
+        # the WARC files can not be created below a regular file
+        directory = tmp_path / "not-a-directory"
+        directory.write_bytes(b"")
+        recorder = WARCRecorder(
+            self.page, str(directory), concurrency=1, max_pending=1
+        )
+        with pytest.raises(OSError):
+            async with recorder:
+                await self.goto_test("grid.html")
+        recorder.recording | should.be.false